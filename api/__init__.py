@@ -1,37 +1,159 @@
-from typing import Annotated, TYPE_CHECKING
+from typing import Annotated, Optional, TYPE_CHECKING
+from contextlib import asynccontextmanager
 from logging import getLogger
-from datetime import datetime
+from os import environ
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, Depends, Header, Body
+from fastapi import FastAPI, Depends, Header, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.exceptions import HTTPException
+from pydantic import ValidationError
 
 from paypyl.resources import Event
+from paypyl.events import Dispatcher, TypedEvent
+from paypyl.dedup import DedupStore, MemoryDedupStore, SQLiteDedupStore, webhook_keys
+
+from .worker import WebhookJob, WebhookQueue
 
 if TYPE_CHECKING:
     from paypyl.client import Client as PayPyl
 
 
+WEBHOOK_ID_KEY = "PAYPAL_WEBHOOK_ID"
+WEBHOOK_WORKERS_KEY = "PAYPYL_WEBHOOK_WORKERS"
+WEBHOOK_QUEUE_KEY = "PAYPYL_WEBHOOK_QUEUE"
+WEBHOOK_ATTEMPTS_KEY = "PAYPYL_WEBHOOK_ATTEMPTS"
+WEBHOOK_DEDUP_KEY = "PAYPYL_WEBHOOK_DEDUP"
+WEBHOOK_VERIFY_KEY = "PAYPYL_WEBHOOK_VERIFY"
+POOL_SIZE_KEY = "PAYPYL_POOL_SIZE"
+
 logger = getLogger()
-app = FastAPI(on_startup=[load_dotenv])
+webhooks: Optional[WebhookQueue] = None
+dedup: DedupStore = MemoryDedupStore()
+dispatcher = Dispatcher()
+
+
+@dispatcher.on("*")
+def log_event(event: TypedEvent):
+    print(event.summary, repr(event))
+
+
+def get_paypyl(request: Request) -> "PayPyl":
+    return request.app.state.paypyl
 
 
-def get_paypyl():
+def create_paypyl() -> "PayPyl":
     from paypyl import Client
 
-    return Client()
+    paypyl = Client(renew=0.8, pool_size=int(environ.get(POOL_SIZE_KEY, 10)))
+    try:
+        paypyl.warm(connections=2)
+    except Exception:
+        # keep serving, /ready reports what is missing
+        logger.exception("Failed to warm up the PayPal client.")
+    return paypyl
+
+
+def job_keys(job: WebhookJob):
+    return webhook_keys(job.event.id, job.signature["transmission_id"])
+
+
+def process_webhook(paypyl: "PayPyl", job: WebhookJob):
+    webhook_id = environ.get(WEBHOOK_ID_KEY, "1SV15366HH1953807")
+    # "local" checks the raw body against the cached certificate,
+    # "remote" asks verify-webhook-signature for every delivery
+    local = environ.get(WEBHOOK_VERIFY_KEY, "local") != "remote"
+    try:
+        event = paypyl.verify_event(
+            webhook_id, job.signature, job.event, body=job.body if local else None
+        )
+    except AssertionError:
+        print("Invalid signature")
+        return
+
+    # only verified deliveries are remembered, and only the first one is processed
+    keys = job_keys(job)
+    if not dedup.add(*keys):
+        return
+
+    try:
+        dispatcher.dispatch(event)
+    except BaseException:
+        # forget the delivery so a retry processes it again, PayPal's
+        # redelivery after an error response or the queue's requeue
+        dedup.discard(*keys)
+        raise
+
+
+def start_dedup():
+    global dedup
+
+    if path := environ.get(WEBHOOK_DEDUP_KEY):
+        dedup = SQLiteDedupStore(path)
+
+
+def start_webhooks(paypyl: "PayPyl"):
+    global webhooks
+
+    workers = int(environ.get(WEBHOOK_WORKERS_KEY, 0))
+    if workers < 1:
+        return
+
+    webhooks = WebhookQueue(
+        lambda job: process_webhook(paypyl, job),
+        workers=workers,
+        maxsize=int(environ.get(WEBHOOK_QUEUE_KEY, 1000)),
+        max_attempts=int(environ.get(WEBHOOK_ATTEMPTS_KEY, 3)),
+    )
+    webhooks.start()
+
+
+def stop_webhooks():
+    if webhooks is not None:
+        webhooks.stop(timeout=10)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    load_dotenv()
+    start_dedup()
+
+    app.state.paypyl = paypyl = await run_in_threadpool(create_paypyl)
+    start_webhooks(paypyl)
+
+    yield
+
+    stop_webhooks()
+    paypyl.close()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+@app.get("/ready")
+def readiness(paypyl: Annotated["PayPyl", Depends(get_paypyl)]):
+    status = paypyl.readiness()
+    if not all(status.values()):
+        raise HTTPException(503, status)
+    return status
 
 
 @app.post("/webhook")
-def handle_webhook_event_notification(
+async def handle_webhook_event_notification(
+    request: Request,
     paypyl: Annotated["PayPyl", Depends(get_paypyl)],
     paypal_auth_algo: Annotated[str, Header()],
     paypal_cert_url: Annotated[str, Header()],
     paypal_transmission_id: Annotated[str, Header()],
     paypal_transmission_sig: Annotated[str, Header()],
-    paypal_transmission_time: Annotated[datetime, Header()],
-    event: Annotated[Event, Body()],
+    paypal_transmission_time: Annotated[str, Header()],
 ):
+    body = await request.body()
+    try:
+        event = Event.model_validate_json(body)
+    except ValidationError as e:
+        raise HTTPException(422, e.errors(include_url=False))
+
     signature = {
         "auth_algo": paypal_auth_algo,
         "cert_url": paypal_cert_url,
@@ -39,11 +161,17 @@ def handle_webhook_event_notification(
         "transmission_sig": paypal_transmission_sig,
         "transmission_time": paypal_transmission_time,
     }
+    job = WebhookJob(body=body, signature=signature, event=event)
 
-    webhook_id = "1SV15366HH1953807"
-    try:
-        event = paypyl.verify_event(webhook_id, signature, event)
-        print(event.summary, repr(event))
-    except AssertionError:
-        print("Invalid signature")
-        # raise HTTPException(400, "Invalid signature")
+    if dedup.seen(*job_keys(job)):
+        return Response()
+
+    if webhooks is None:
+        await run_in_threadpool(process_webhook, paypyl, job)
+        return Response()
+
+    # acknowledge right away, PayPal retries later if we are saturated
+    if not webhooks.submit(job):
+        raise HTTPException(503, "Webhook queue is full", headers={"Retry-After": "5"})
+
+    return Response()
@@ -0,0 +1,107 @@
+from typing import Any, Callable, Optional
+from dataclasses import dataclass
+from logging import getLogger
+from queue import Queue, Full
+from threading import Thread
+from time import monotonic
+
+from paypyl.resources import Event
+
+
+logger = getLogger(__name__)
+
+
+@dataclass
+class WebhookJob:
+    body: bytes
+    signature: dict[str, Any]
+    event: Event
+    attempts: int = 0
+
+
+class WebhookQueue:
+    queue: "Queue[Optional[WebhookJob]]"
+    threads: list[Thread]
+
+    def __init__(
+        self,
+        handle: Callable[[WebhookJob], None],
+        *,
+        workers: int = 4,
+        maxsize: int = 1000,
+        max_attempts: int = 3,
+        dead_letter: Callable[[WebhookJob], None] | None = None,
+    ):
+        # the delivery is already acknowledged, a failed job goes back to
+        # the end of the queue up to `max_attempts` times, then to `dead_letter`
+        self.handle = handle
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.dead_letter = dead_letter or self._log_dead
+        self.queue = Queue(maxsize)
+        self.threads = []
+        self.stopping = False
+
+    def start(self):
+        for i in range(self.workers):
+            thread = Thread(target=self._work, name=f"webhook-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(self, job: WebhookJob) -> bool:
+        try:
+            self.queue.put_nowait(job)
+        except Full:
+            return False
+        return True
+
+    def stop(self, timeout: float | None = None):
+        # workers drain what is already queued before they see the sentinel;
+        # a full queue may not drain in time, `timeout` bounds the whole stop
+        deadline = None if timeout is None else monotonic() + timeout
+        self.stopping = True
+
+        def left():
+            return None if deadline is None else max(deadline - monotonic(), 0)
+
+        try:
+            for _ in self.threads:
+                self.queue.put(None, timeout=left())
+        except Full:
+            logger.warning("Stopped with %d webhooks still queued.", self.queue.qsize())
+
+        for thread in self.threads:
+            thread.join(left())
+        self.threads.clear()
+        self.stopping = False
+
+    @staticmethod
+    def _log_dead(job: WebhookJob):
+        logger.error(
+            "Gave up on webhook event %s after %d attempts: %s",
+            job.event.id,
+            job.attempts,
+            job.body.decode(errors="replace"),
+        )
+
+    def _retry(self, job: WebhookJob):
+        # requeued jobs land behind the stop sentinels, keep them out then
+        if not self.stopping and job.attempts < self.max_attempts:
+            try:
+                self.queue.put_nowait(job)
+                return
+            except Full:
+                pass
+        self.dead_letter(job)
+
+    def _work(self):
+        while (job := self.queue.get()) is not None:
+            try:
+                job.attempts += 1
+                self.handle(job)
+            except Exception:
+                logger.exception("Failed to process webhook event %s", job.event.id)
+                self._retry(job)
+            finally:
+                self.queue.task_done()
+        self.queue.task_done()
@@ -0,0 +1,105 @@
+"""PATCH body encoding with a fresh TypeAdapter against the shared UPDATES
+one, the only measurable gain of the prebuilt adapters. The plans page
+decode through ResourceList + per-item revalidation (the previous
+Client._list path) against the page models is kept as a regression check:
+time and peak allocation stay within run-to-run noise, the page models
+simplify _list but save no CPU or memory.
+
+Run from the repository root: python -m benchmarks.bench_pages"""
+
+from typing import List
+from json import dumps
+from timeit import repeat
+from tracemalloc import start, stop, reset_peak, get_traced_memory
+
+from pydantic import TypeAdapter
+
+from paypyl.adapters import page_model, UPDATES
+from paypyl.update import Update
+from paypyl.resources import Plan, ResourceList
+
+
+def plan(i: int):
+    return {
+        "id": f"P-{i:08d}",
+        "product_id": "PROD-XXCD1234QWER65782",
+        "name": f"Plan {i}",
+        "status": "ACTIVE",
+        "description": "Monthly subscription plan",
+        "create_time": "2023-01-01T00:00:00Z",
+        "update_time": "2023-06-01T00:00:00Z",
+        "billing_cycles": [
+            {
+                "tenure_type": "REGULAR",
+                "sequence": 1,
+                "total_cycles": 0,
+                "frequency": {"interval_unit": "MONTH", "interval_count": 1},
+                "pricing_scheme": {
+                    "version": 1,
+                    "fixed_price": {"currency_code": "USD", "value": "10.00"},
+                },
+            }
+        ],
+        "payment_preferences": {"auto_bill_outstanding": True},
+        "links": [
+            {
+                "href": f"https://api.paypal.com/v1/billing/plans/P-{i}",
+                "rel": "self",
+                "method": "GET",
+            }
+        ],
+    }
+
+
+def twice(content: bytes):
+    result = ResourceList[Plan].model_validate_json(content)
+    setattr(result, "plans", list(map(Plan.model_validate, getattr(result, "plans"))))
+    return result
+
+
+def once(content: bytes):
+    return page_model("plans", Plan).model_validate_json(content)
+
+
+def measure(decode, content: bytes, number: int):
+    seconds = min(repeat(lambda: decode(content), number=number, repeat=5)) / number
+
+    start()
+    reset_peak()
+    decode(content)
+    _, peak = get_traced_memory()
+    stop()
+
+    return seconds, peak
+
+
+def main():
+    print(
+        f"{'items':>6} {'twice us':>10} {'once us':>10} {'ratio':>8} {'twice KiB':>10} {'once KiB':>10}"
+    )
+    for size in (20, 100, 500):
+        content = dumps(
+            {"plans": [plan(i) for i in range(size)], "total_pages": 1}
+        ).encode()
+        number = max(5000 // size, 10)
+
+        t_twice, m_twice = measure(twice, content, number)
+        t_once, m_once = measure(once, content, number)
+
+        print(
+            f"{size:>6} {t_twice * 1e6:>10.1f} {t_once * 1e6:>10.1f} {t_twice / t_once:>7.2f}x"
+            f" {m_twice / 1024:>10.1f} {m_once / 1024:>10.1f}"
+        )
+
+    ops = [Update.replace("/description", "Monthly subscription plan")] * 3
+    fresh = lambda: TypeAdapter(List[Update]).dump_json(ops, exclude_none=True)
+    shared = lambda: UPDATES.dump_json(ops, exclude_none=True)
+    t_fresh = min(repeat(fresh, number=200, repeat=5)) / 200
+    t_shared = min(repeat(shared, number=200, repeat=5)) / 200
+    print(
+        f"\nupdate body: fresh adapter {t_fresh * 1e6:.1f} us, shared {t_shared * 1e6:.1f} us"
+    )
+
+
+if __name__ == "__main__":
+    main()
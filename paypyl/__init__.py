@@ -1,3 +1,4 @@
 from .client import Client
+from .aio import AsyncClient
 from .update import Update
 from .constants import *
\ No newline at end of file
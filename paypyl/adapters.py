@@ -0,0 +1,35 @@
+from typing import Type, List
+from functools import lru_cache
+
+from pydantic import TypeAdapter, create_model
+
+from .update import Update
+from .resources import *
+from .definitions import *
+
+
+__all__ = ["page_model", "PAGES", "UPDATES"]
+
+
+@lru_cache(maxsize=None)
+def page_model(name: str, convert: Type[R]) -> Type[ResourceList[R]]:
+    # declaring the items as a real field lets pydantic-core decode
+    # the whole page into typed items in a single pass
+    return create_model(
+        f"{convert.__name__}Page",
+        __base__=ResourceList[convert],
+        **{name: (List[convert], [])},
+    )
+
+
+PAGES = {
+    name: page_model(name, convert)
+    for name, convert in [
+        ("products", Product),
+        ("plans", Plan),
+        ("webhooks", Webhook),
+        ("subscriptions", Subscription),
+    ]
+}
+
+UPDATES = TypeAdapter(List[Update])
@@ -0,0 +1,926 @@
+from typing import (
+    Any,
+    AsyncGenerator,
+    Generator,
+    Iterable,
+    Mapping,
+    Type,
+    List,
+    Optional,
+)
+from datetime import datetime
+from asyncio import Lock, Semaphore, Task, create_task, sleep, to_thread, wait_for
+from asyncio import FIRST_COMPLETED, wait
+from time import monotonic
+from contextvars import Context
+from uuid import uuid4
+from collections import deque
+from itertools import islice
+from logging import getLogger
+
+from httpx import AsyncClient as HTTPClient, Auth as HTTPAuth, Limits, Request, Response
+from httpx import AsyncBaseTransport, Timeout, TransportError
+
+from .update import Update
+from .adapters import UPDATES
+from .auth import AuthToken, RENEW_RETRY
+from .store import TokenStore, FileTokenStore, token_key
+from .cache import DetailsCache
+from .flight import AsyncSingleFlight
+from .retry import Retry
+from .throttle import Throttle
+from .hedge import Hedge
+from .breaker import CircuitBreaker
+from .bulk import BulkItems, async_bulk_map, with_reasons
+from .deadline import *
+from .client import BaseClient
+from .webhooks import CertificateCache, InvalidSignature, verify_signature
+from .constants import *
+from .types import *
+from .resources import *
+from .definitions import *
+from .responses import *
+
+
+__all__ = ["AsyncAuth", "AsyncClient"]
+
+
+logger = getLogger(__name__)
+
+
+class AsyncAuth(HTTPAuth):
+    token: Optional[AuthToken] = None
+    client: "AsyncClient"
+    lock: Lock
+    renew: float | None = None
+    renewer: Optional[Task] = None
+    store: Optional[TokenStore] = None
+
+    def __init__(
+        self,
+        client: "AsyncClient",
+        *,
+        renew: float | None = None,
+        store: Optional[TokenStore] = None,
+    ):
+        assert renew is None or 0 < renew < 1, "renew must be a fraction of expires_in."
+        self.client = client
+        self.token = None
+        self.renew = renew
+        self.store = store
+        self.lock = Lock()
+        self.renewer = None
+
+    async def _fetch_token(self, timestamp: datetime) -> AuthToken:
+        result = await self.client.request_access_token()
+        renew_at = None
+        if self.renew is not None:
+            renew_at = timestamp + result.expires_in * self.renew
+
+        return AuthToken(
+            type=result.token_type,
+            value=result.access_token,
+            expire_at=timestamp + result.expires_in,
+            renew_at=renew_at,
+        )
+
+    def _set_token(self, timestamp: datetime, token: AuthToken) -> AuthToken:
+        if self.renew is not None and token.renew_at is None:
+            remaining = token.expire_at - timestamp
+            token.renew_at = timestamp + remaining * self.renew
+
+        self.token = token
+        self._schedule(token.renew_at)
+        return token
+
+    async def _update_token(
+        self, timestamp: datetime, *, renewing: bool = False
+    ) -> AuthToken:
+        if self.store is None:
+            return self._set_token(timestamp, await self._fetch_token(timestamp))
+
+        client = self.client
+        key = token_key(client.url, client.client_id, client.client_secret)
+
+        # the store lock may block on another process, keep it off the event loop
+        lock = self.store.lock(key)
+        await to_thread(lock.__enter__)
+        try:
+            token = self.store.load(key)
+            if token is None or (token.stale if renewing else token.expired)(timestamp):
+                token = await self._fetch_token(timestamp)
+                self.store.save(key, token)
+        finally:
+            lock.__exit__(None, None, None)
+
+        return self._set_token(timestamp, token)
+
+    async def _refresh(self, timestamp: datetime) -> AuthToken:
+        try:
+            await wait_for(self.lock.acquire(), check_deadline())
+        except TimeoutError as e:
+            raise DeadlineExceeded(
+                "Deadline exceeded waiting for an access token."
+            ) from e
+
+        try:
+            token = self.token
+            if token is None or token.expired(timestamp):
+                token = await self._update_token(timestamp)
+            return token
+        finally:
+            self.lock.release()
+
+    def _schedule(self, at: datetime | None):
+        if at is None:
+            return
+
+        if self.renewer is not None:
+            self.renewer.cancel()
+
+        delay = max((at - datetime.now()).total_seconds(), 0)
+        # renewal runs outside the caller's context and its deadline
+        self.renewer = create_task(self._renew_later(delay), context=Context())
+
+    async def _renew_later(self, delay: float):
+        await sleep(delay)
+        self.renewer = None
+        await self.renew_token()
+
+    async def update_token(self, timestamp: datetime) -> str:
+        return (await self._refresh(timestamp)).value
+
+    async def renew_token(self):
+        timestamp = datetime.now()
+        async with self.lock:
+            token = self.token
+            if token is not None and not token.stale(timestamp):
+                return
+
+            try:
+                await self._update_token(timestamp, renewing=True)
+            except Exception:
+                logger.exception("Failed to renew access token.")
+                if token is not None and not token.expired(timestamp):
+                    retry_at = min(timestamp + RENEW_RETRY, token.expire_at)
+                    self._schedule(retry_at)
+
+    def close(self):
+        if self.renewer is not None:
+            self.renewer.cancel()
+            self.renewer = None
+
+    async def async_auth_flow(
+        self, request: Request
+    ) -> AsyncGenerator[Request, Response]:
+        access_token = self.client.access_token
+        token_type = "Bearer"
+
+        if access_token is None:
+            timestamp = datetime.now()
+            token = self.token
+            if token is None or token.expired(timestamp):
+                token = await self._refresh(timestamp)
+            access_token, token_type = token.value, token.type
+
+        request.headers["Authorization"] = f"{token_type} {access_token}"
+        yield request
+
+    def sync_auth_flow(self, request: Request) -> Generator[Request, Response, None]:
+        raise RuntimeError("AsyncAuth can only be used with an async transport.")
+
+
+class AsyncClient(BaseClient):
+    session: HTTPClient
+    auth: AsyncAuth
+    certificates: CertificateCache
+
+    def __init__(
+        self,
+        *,
+        client_id: str | None = None,
+        client_secret: str | None = None,
+        sandbox: bool | None = None,
+        renew: float | None = None,
+        token_store: TokenStore | None = None,
+        mode: DecodeMode = "model",
+        cache: DetailsCache | None = None,
+        limits: Limits | None = None,
+        transport: AsyncBaseTransport | None = None,
+        coalesce: bool = False,
+        retry: Retry | None = None,
+        throttle: Throttle | None = None,
+        timeout: TimeoutValue = DEFAULT_TIMEOUT,
+        hedge: Hedge | None = None,
+        breaker: CircuitBreaker | None = None,
+    ):
+        super().__init__(
+            client_id=client_id,
+            client_secret=client_secret,
+            sandbox=sandbox,
+            mode=mode,
+            cache=cache,
+            retry=retry,
+            throttle=throttle,
+            timeout=timeout,
+            hedge=hedge,
+            breaker=breaker,
+        )
+
+        if token_store is None:
+            token_store = FileTokenStore()
+
+        self.auth = AsyncAuth(self, renew=renew, store=token_store)
+        self.certificates = CertificateCache()
+        self.flight = AsyncSingleFlight() if coalesce else None
+        self.session = HTTPClient(
+            auth=self.auth,
+            headers={"Content-Type": "application/json"},
+            limits=limits or Limits(max_connections=100, max_keepalive_connections=20),
+            transport=transport,
+        )
+
+    async def request_access_token(
+        self, client_id: str | None = None, client_secret: str | None = None
+    ):
+        url = self / "v1/oauth2/token"
+        auth = self._credentials(client_id, client_secret)
+        data = {"grant_type": "client_credentials"}
+
+        response = await self._request(
+            "POST",
+            url,
+            auth=auth,
+            data=data,
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            idempotent=True,
+        )
+
+        return TokenResult.model_validate_json(response.content)
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        /,
+        *,
+        retry: Retry | None = None,
+        idempotent: bool | None = None,
+        priority: Priority | None = None,
+        timeout: TimeoutValue | None = None,
+        **kwargs,
+    ) -> Response:
+        attempts = self._attempts(
+            method, kwargs.get("headers"), retry=retry, idempotent=idempotent
+        )
+        while True:
+            connect, read = self._timeout(timeout)
+            try:
+                response = await self._send(
+                    method,
+                    url,
+                    priority,
+                    timeout=Timeout(read, connect=connect),
+                    **kwargs,
+                )
+            except TransportError as e:
+                delay = attempts.retry_in()
+                if delay is None:
+                    if expired():
+                        raise DeadlineExceeded("Deadline exceeded.") from e
+                    raise
+            else:
+                delay = attempts.retry_in(response.status_code, response.headers)
+                if delay is None:
+                    response.raise_for_status()
+                    return response
+            await sleep(delay)
+
+    async def _send(
+        self, method: str, url: str, priority: Priority | None, /, **kwargs
+    ):
+        if self.hedge is not None and method == "GET":
+            delay = self.hedge.delay_for(url)
+            if delay is not None:
+                return await self._hedged(delay, url, priority, **kwargs)
+
+        return await self._attempt(method, url, priority, **kwargs)
+
+    async def _attempt(
+        self, method: str, url: str, priority: Priority | None, /, **kwargs
+    ) -> Response:
+        if self.breaker is not None:
+            self.breaker.before(url)
+
+        status = permit = None
+        unreachable = False
+        try:
+            if self.throttle is not None:
+                permit = await self.throttle.acquire_async(url, priority)
+            start = monotonic()
+            response = await self.session.request(method, url, **kwargs)
+            status = response.status_code
+            return response
+        except TransportError:
+            unreachable = True
+            raise
+        finally:
+            if permit is not None:
+                permit.release(status)
+            # only responses and network errors say something about the
+            # service, not a cancelled hedge, a deadline or a failed token
+            if self.breaker is not None and (status is not None or unreachable):
+                self.breaker.after(url, status)
+            elif self.breaker is not None:
+                self.breaker.cancel(url)
+            if self.hedge is not None and status is not None and status < 500:
+                self.hedge.record(url, monotonic() - start)
+
+    async def _hedged(
+        self, delay: float, url: str, priority: Priority | None, /, **kwargs
+    ):
+        tasks = [create_task(self._attempt("GET", url, priority, **kwargs))]
+        done, pending = await wait(tasks, timeout=delay)
+        if not done:
+            tasks.append(create_task(self._attempt("GET", url, priority, **kwargs)))
+            pending = set(tasks)
+
+        # the first good response wins, errors only count if both fail
+        winner = None
+        try:
+            while pending:
+                done, pending = await wait(pending, return_when=FIRST_COMPLETED)
+                winner = done.pop()
+                if winner.exception() is None and winner.result().status_code < 500:
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+
+        if winner is None:
+            winner = tasks[0]
+        if len(tasks) > 1:
+            self.hedge.count(winner is tasks[1])
+        return winner.result()
+
+    async def _create(
+        self,
+        endpoint: str,
+        /,
+        resource: R,
+        *,
+        prefer: PreferType | None = None,
+        request_id: str | None = None,
+        extra_headers: Mapping[str, str] | None = None,
+    ) -> R:
+        url = self / endpoint
+        headers, data = self._create_request(
+            resource, prefer=prefer, request_id=request_id, extra_headers=extra_headers
+        )
+
+        response = await self._request("POST", url, content=data, headers=headers)
+
+        return resource.__class__.model_validate_json(response.content)
+
+    async def _delete(self, endpoint: str, resource_id: str, /) -> None:
+        url = self._resource(endpoint, resource_id)
+        await self._request("DELETE", url)
+        self._invalidate(endpoint, resource_id)
+
+    async def _post_action(
+        self, endpoint: str, resource_id: str, action: str, /, **kwargs
+    ):
+        url = self._action(endpoint, resource_id, action)
+        headers = {"PayPal-Request-Id": str(uuid4()), **kwargs.pop("headers", {})}
+        await self._request("POST", url, headers=headers, **kwargs)
+        self._invalidate(endpoint, resource_id)
+
+    async def _list(
+        self,
+        endpoint: str,
+        *,
+        page_size: int | None = None,
+        page: int | None = None,
+        total_required: bool | None = None,
+        convert: Type[R] = Resource,
+        mode: DecodeMode | None = None,
+        priority: Priority | None = None,
+        **kwargs,
+    ):
+        url = self / endpoint
+        params = self._list_params(
+            page_size=page_size, page=page, total_required=total_required, **kwargs
+        )
+        params = {k: v for k, v in params.items() if v is not None}
+
+        async def fetch():
+            response = await self._request("GET", url, params=params, priority=priority)
+            return self._decode_list(endpoint, response.content, convert, mode)
+
+        if self.flight is None:
+            return await fetch()
+        return await self.flight.do(self._flight_key(url, params, convert, mode), fetch)
+
+    async def _pages(
+        self,
+        endpoint: str,
+        *,
+        page_size: int = 10,
+        start_page: int = 1,
+        convert: Type[R] = Resource,
+        prefetch: int = 4,
+        max_in_flight: int = 4,
+        mode: DecodeMode | None = None,
+    ) -> AsyncGenerator[tuple[int, ResourceList[R]], None]:
+        result = await self._list(
+            endpoint,
+            page_size=page_size,
+            page=start_page,
+            total_required=True,
+            convert=convert,
+            mode=mode,
+            priority="bulk",
+        )
+        yield start_page, result
+
+        pages = iter(range(start_page + 1, (result.total_pages or start_page) + 1))
+        semaphore = Semaphore(max(max_in_flight, 1))
+        window: deque[tuple[int, Task]] = deque()
+
+        async def fetch(page: int):
+            async with semaphore:
+                return await self._list(
+                    endpoint,
+                    page_size=page_size,
+                    page=page,
+                    convert=convert,
+                    mode=mode,
+                    priority="bulk",
+                )
+
+        def submit(page: int):
+            window.append((page, create_task(fetch(page))))
+
+        try:
+            for page in islice(pages, max(prefetch, 1)):
+                submit(page)
+
+            while window:
+                page, task = window.popleft()
+                result = await task
+                for next_page in islice(pages, 1):
+                    submit(next_page)
+                yield page, result
+        finally:
+            for _, task in window:
+                task.cancel()
+
+    async def _iter(self, endpoint: str, **kwargs) -> AsyncGenerator[R, None]:
+        name = endpoint.split("/")[-1]
+        async for _, result in self._pages(endpoint, **kwargs):
+            for item in getattr(result, name):
+                yield item
+
+    async def _details(
+        self,
+        endpoint: str,
+        /,
+        resource_id: str,
+        *,
+        convert: Type[R] = Resource,
+        mode: DecodeMode | None = None,
+        **kwargs,
+    ) -> R:
+        url = self._resource(endpoint, resource_id)
+        params = kwargs.get("params")
+
+        async def fetch():
+            content = self._cached(endpoint, url, params)
+            if content is None:
+                generation = self._generation(url)
+                content = (await self._request("GET", url, **kwargs)).content
+                self._store(endpoint, url, params, content, generation)
+
+            return self._decode(content, convert, mode)
+
+        if self.flight is None:
+            return await fetch()
+        return await self.flight.do(self._flight_key(url, params, convert, mode), fetch)
+
+    async def _bulk_action(
+        self,
+        endpoint: str,
+        action: str,
+        items: BulkItems,
+        /,
+        *,
+        reason: str | None = None,
+        max_concurrency: int = 8,
+        dry_run: bool = False,
+        max_error_rate: float | None = None,
+    ) -> AsyncGenerator[tuple[str, Exception | None], None]:
+        async def run(item: tuple[str, str | None]):
+            resource_id, note = item
+            if not dry_run:
+                await self._post_action(
+                    endpoint,
+                    resource_id,
+                    action,
+                    json={"reason": note} if note else None,
+                )
+
+        async for (resource_id, _), result in async_bulk_map(
+            run,
+            with_reasons(items, reason),
+            max_concurrency=max_concurrency,
+            max_error_rate=max_error_rate,
+        ):
+            yield resource_id, result
+
+    async def _update(self, endpoint: str, /, resource_id: str, ops: List[Update]):
+        if not ops:
+            # nothing changed, skip the round trip
+            return
+
+        data = UPDATES.dump_json(ops, exclude_none=True)
+        await self._request(
+            "PATCH", self._resource(endpoint, resource_id), content=data
+        )
+        self._invalidate(endpoint, resource_id)
+
+    async def create_product(
+        self,
+        data: Product,
+        *,
+        prefer: PreferType | None = None,
+        request_id: str | None = None,
+    ):
+        return await self._create(
+            "v1/catalogs/products", resource=data, prefer=prefer, request_id=request_id
+        )
+
+    async def list_products(
+        self,
+        *,
+        page_size: int | None = None,
+        page: int | None = None,
+        total_required: bool | None = None,
+        mode: DecodeMode | None = None,
+    ) -> ResourceList[Product]:
+        return await self._list(
+            "v1/catalogs/products",
+            page_size=page_size,
+            page=page,
+            total_required=total_required,
+            convert=Product,
+            mode=mode,
+        )
+
+    async def iter_products(
+        self,
+        *,
+        page_size: int = 10,
+        start_page: int = 1,
+        prefetch: int = 4,
+        max_in_flight: int = 4,
+        mode: DecodeMode | None = None,
+    ):
+        async for item in self._iter(
+            "v1/catalogs/products",
+            page_size=page_size,
+            start_page=start_page,
+            convert=Product,
+            prefetch=prefetch,
+            max_in_flight=max_in_flight,
+            mode=mode,
+        ):
+            yield item
+
+    async def product_details(
+        self, product_id: str, /, *, mode: DecodeMode | None = None
+    ):
+        return await self._details(
+            "v1/catalogs/products", product_id, convert=Product, mode=mode
+        )
+
+    async def product_details_many(
+        self,
+        product_ids: Iterable[str],
+        /,
+        *,
+        max_concurrency: int = 8,
+        mode: DecodeMode | None = None,
+    ) -> AsyncGenerator[tuple[str, Product | Exception], None]:
+        async for item in async_bulk_map(
+            lambda id: self.product_details(id, mode=mode),
+            product_ids,
+            max_concurrency=max_concurrency,
+        ):
+            yield item
+
+    async def update_product(self, product_id: str, /, ops: list[Update]):
+        await self._update("v1/catalogs/products", product_id, ops)
+
+    async def create_plan(
+        self,
+        data: Plan,
+        *,
+        prefer: PreferType | None = None,
+        request_id: str | None = None,
+    ):
+        return await self._create(
+            "v1/billing/plans", resource=data, prefer=prefer, request_id=request_id
+        )
+
+    async def list_plans(
+        self,
+        *,
+        page_size: int | None = None,
+        page: int | None = None,
+        total_required: bool | None = None,
+        mode: DecodeMode | None = None,
+    ) -> ResourceList[Plan]:
+        return await self._list(
+            "v1/billing/plans",
+            page_size=page_size,
+            page=page,
+            total_required=total_required,
+            convert=Plan,
+            mode=mode,
+        )
+
+    async def iter_plans(
+        self,
+        *,
+        page_size: int = 10,
+        start_page: int = 1,
+        prefetch: int = 4,
+        max_in_flight: int = 4,
+        mode: DecodeMode | None = None,
+    ):
+        async for item in self._iter(
+            "v1/billing/plans",
+            page_size=page_size,
+            start_page=start_page,
+            convert=Plan,
+            prefetch=prefetch,
+            max_in_flight=max_in_flight,
+            mode=mode,
+        ):
+            yield item
+
+    async def plan_details(self, plan_id: str, /, *, mode: DecodeMode | None = None):
+        return await self._details("v1/billing/plans", plan_id, convert=Plan, mode=mode)
+
+    async def plan_details_many(
+        self,
+        plan_ids: Iterable[str],
+        /,
+        *,
+        max_concurrency: int = 8,
+        mode: DecodeMode | None = None,
+    ) -> AsyncGenerator[tuple[str, Plan | Exception], None]:
+        async for item in async_bulk_map(
+            lambda id: self.plan_details(id, mode=mode),
+            plan_ids,
+            max_concurrency=max_concurrency,
+        ):
+            yield item
+
+    async def update_plan(self, product_id: str, /, ops: list[Update]):
+        await self._update("v1/billing/plans", product_id, ops)
+
+    async def activate_plan(self, plan_id: str, /):
+        await self._post_action("v1/billing/plans", plan_id, "activate")
+
+    async def deactivate_plan(self, plan_id: str, /):
+        await self._post_action("v1/billing/plans", plan_id, "deactivate")
+
+    async def activate_plans(
+        self,
+        plan_ids: Iterable[str],
+        /,
+        *,
+        max_concurrency: int = 8,
+        dry_run: bool = False,
+        max_error_rate: float | None = None,
+    ) -> AsyncGenerator[tuple[str, Exception | None], None]:
+        async for item in self._bulk_action(
+            "v1/billing/plans",
+            "activate",
+            plan_ids,
+            max_concurrency=max_concurrency,
+            dry_run=dry_run,
+            max_error_rate=max_error_rate,
+        ):
+            yield item
+
+    async def deactivate_plans(
+        self,
+        plan_ids: Iterable[str],
+        /,
+        *,
+        max_concurrency: int = 8,
+        dry_run: bool = False,
+        max_error_rate: float | None = None,
+    ) -> AsyncGenerator[tuple[str, Exception | None], None]:
+        async for item in self._bulk_action(
+            "v1/billing/plans",
+            "deactivate",
+            plan_ids,
+            max_concurrency=max_concurrency,
+            dry_run=dry_run,
+            max_error_rate=max_error_rate,
+        ):
+            yield item
+
+    async def create_subscription(
+        self,
+        data: Subscription,
+        *,
+        prefer: PreferType | None = None,
+        request_id: str | None = None,
+    ):
+        return await self._create(
+            "v1/billing/subscriptions",
+            resource=data,
+            prefer=prefer,
+            request_id=request_id,
+        )
+
+    async def subscription_details(
+        self,
+        subscription_id: str,
+        /,
+        fields: Optional[List[Literal["plan", "last_failed_payment"]]] = None,
+        *,
+        mode: DecodeMode | None = None,
+    ):
+        params = None
+        if fields is not None:
+            params = {"fields": ",".join(fields)}
+
+        return await self._details(
+            "v1/billing/subscriptions",
+            subscription_id,
+            convert=Subscription,
+            mode=mode,
+            params=params,
+        )
+
+    async def subscription_details_many(
+        self,
+        subscription_ids: Iterable[str],
+        /,
+        fields: Optional[List[Literal["plan", "last_failed_payment"]]] = None,
+        *,
+        max_concurrency: int = 8,
+        mode: DecodeMode | None = None,
+    ) -> AsyncGenerator[tuple[str, Subscription | Exception], None]:
+        async for item in async_bulk_map(
+            lambda id: self.subscription_details(id, fields, mode=mode),
+            subscription_ids,
+            max_concurrency=max_concurrency,
+        ):
+            yield item
+
+    async def activate_subscription(
+        self, subscription_id: str, /, reason: str | None = None
+    ):
+        await self._post_action(
+            "v1/billing/subscriptions",
+            subscription_id,
+            "activate",
+            json={"reason": reason} if reason else None,
+        )
+
+    async def suspend_subscription(
+        self, subscription_id: str, /, reason: str | None = None
+    ):
+        await self._post_action(
+            "v1/billing/subscriptions",
+            subscription_id,
+            "suspend",
+            json={"reason": reason} if reason else None,
+        )
+
+    async def cancel_subscription(
+        self, subscription_id: str, /, reason: str | None = None
+    ):
+        await self._post_action(
+            "v1/billing/subscriptions",
+            subscription_id,
+            "cancel",
+            json={"reason": reason} if reason else None,
+        )
+
+    async def suspend_subscriptions(
+        self,
+        subscriptions: BulkItems,
+        /,
+        reason: str | None = None,
+        *,
+        max_concurrency: int = 8,
+        dry_run: bool = False,
+        max_error_rate: float | None = None,
+    ) -> AsyncGenerator[tuple[str, Exception | None], None]:
+        async for item in self._bulk_action(
+            "v1/billing/subscriptions",
+            "suspend",
+            subscriptions,
+            reason=reason,
+            max_concurrency=max_concurrency,
+            dry_run=dry_run,
+            max_error_rate=max_error_rate,
+        ):
+            yield item
+
+    async def cancel_subscriptions(
+        self,
+        subscriptions: BulkItems,
+        /,
+        reason: str | None = None,
+        *,
+        max_concurrency: int = 8,
+        dry_run: bool = False,
+        max_error_rate: float | None = None,
+    ) -> AsyncGenerator[tuple[str, Exception | None], None]:
+        async for item in self._bulk_action(
+            "v1/billing/subscriptions",
+            "cancel",
+            subscriptions,
+            reason=reason,
+            max_concurrency=max_concurrency,
+            dry_run=dry_run,
+            max_error_rate=max_error_rate,
+        ):
+            yield item
+
+    async def list_webhooks(
+        self,
+        *,
+        anchor_type: Optional[Literal["APPLICATION", "ACCOUNT"]] = None,
+        mode: DecodeMode | None = None,
+    ) -> list[Webhook]:
+        result = await self._list(
+            "v1/notifications/webhooks",
+            convert=Webhook,
+            mode=mode,
+            anchor_type=anchor_type,
+        )
+        return result.webhooks
+
+    async def create_webhook(self, data: Webhook):
+        return await self._create("v1/notifications/webhooks", resource=data)
+
+    async def delete_webhook(self, webhook_id: str, /):
+        await self._delete("v1/notifications/webhooks", webhook_id)
+
+    async def verify_event(
+        self,
+        /,
+        webhook_id: str,
+        signature: WebhookSignature | Mapping[str, Any],
+        event: Event | Mapping[str, Any],
+        *,
+        dry_run: bool = False,
+        body: bytes | None = None,
+    ) -> Event:
+        signature, event = self._verify_models(signature, event)
+
+        if dry_run:
+            return event
+
+        if body is not None:
+            url = signature.cert_url
+            certificate = self.certificates.lookup(url)
+            if certificate is None:
+                self.certificates.check_url(url)
+                response = await self._request("GET", url, auth=None)
+                certificate = self.certificates.put(url, response.content)
+
+            verify_signature(body, webhook_id, signature, certificate)
+            return event
+
+        payload = self._verify_payload(webhook_id, signature, event)
+        url = self / "v1/notifications/verify-webhook-signature"
+        # verification has no side effects, it is safe to repeat
+        response = await self._request("POST", url, json=payload, idempotent=True)
+
+        result = WebhookSignatureResponse.model_validate_json(response.content)
+        status = result.verification_status
+
+        if status != "SUCCESS":
+            raise InvalidSignature(status)
+
+        return event
+
+    async def aclose(self):
+        self.auth.close()
+        await self.session.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
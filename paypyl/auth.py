@@ -1,54 +1,167 @@
 from typing import TYPE_CHECKING, Literal, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 from dataclasses import dataclass
-from threading import Thread
+from threading import Lock, Timer
+from logging import getLogger
+from weakref import ref
 
 from requests.auth import AuthBase
 
+from .deadline import DeadlineExceeded, check_deadline
+
 if TYPE_CHECKING:
     from requests.models import PreparedRequest
 
     from .client import Client
+    from .store import TokenStore
 
 
 __all__ = ["Auth", "AuthToken"]
 
 
+logger = getLogger(__name__)
+
+RENEW_RETRY = timedelta(seconds=30)
+
+
 @dataclass
 class AuthToken:
     type: Literal["Bearer"]
     value: str
     expire_at: datetime
+    renew_at: datetime | None = None
 
     def expired(self, timestamp: datetime) -> bool:
         return timestamp > self.expire_at
 
+    def stale(self, timestamp: datetime) -> bool:
+        return timestamp > (self.renew_at or self.expire_at)
+
+
+def _renew(auth: "ref[Auth]"):
+    # the timer holds a weak reference so a pending renewal
+    # does not keep an abandoned client alive
+    if (auth := auth()) is not None:
+        auth.renew_token()
+
 
 class Auth(AuthBase):
     token: Optional[AuthToken] = None
     client: "Client"
-    thread: Optional[Thread] = None
-
-    def __init__(self, client: "Client"):
+    lock: Lock
+    renew: float | None = None
+    renewer: Optional[Timer] = None
+    store: Optional["TokenStore"] = None
+
+    def __init__(
+        self,
+        client: "Client",
+        *,
+        renew: float | None = None,
+        store: Optional["TokenStore"] = None,
+    ):
+        assert renew is None or 0 < renew < 1, "renew must be a fraction of expires_in."
         self.client = client
         self.token = None
-    
-    def _update_token(self, timestamp: datetime, **kwargs):
+        self.renew = renew
+        self.store = store
+        self.lock = Lock()
+        self.renewer = None
+
+    def _fetch_token(self, timestamp: datetime, **kwargs) -> AuthToken:
         result = self.client.request_access_token(**kwargs)
-        self.token = AuthToken(
+        renew_at = None
+        if self.renew is not None:
+            renew_at = timestamp + result.expires_in * self.renew
+
+        return AuthToken(
             type=result.token_type,
             value=result.access_token,
-            expire_at=timestamp + result.expires_in
+            expire_at=timestamp + result.expires_in,
+            renew_at=renew_at,
         )
 
-    def update_token(self, timestamp: datetime, **kwargs) -> str:
-        if self.thread is None:
-            self.thread = Thread(target=self._update_token, args=(timestamp,), kwargs=kwargs)
-            self.thread.start()
-
-        self.thread = self.thread.join()
+    def _set_token(self, timestamp: datetime, token: AuthToken) -> AuthToken:
+        if self.renew is not None and token.renew_at is None:
+            # adopted from a store written by a client without renewal
+            remaining = token.expire_at - timestamp
+            token.renew_at = timestamp + remaining * self.renew
+
+        self.token = token
+        self._schedule(token.renew_at)
+        return token
+
+    def _update_token(
+        self, timestamp: datetime, *, renewing: bool = False, **kwargs
+    ) -> AuthToken:
+        if self.store is None or kwargs:
+            return self._set_token(timestamp, self._fetch_token(timestamp, **kwargs))
+
+        from .store import token_key
+
+        client = self.client
+        key = token_key(client.url, client.client_id, client.client_secret)
+
+        # the store lock makes one process per host refresh
+        # while the others wait and reuse its token
+        with self.store.lock(key):
+            token = self.store.load(key)
+            if token is None or (token.stale if renewing else token.expired)(timestamp):
+                token = self._fetch_token(timestamp)
+                self.store.save(key, token)
+
+        return self._set_token(timestamp, token)
+
+    def _refresh(self, timestamp: datetime, **kwargs) -> AuthToken:
+        # only the first caller fetches a token, the rest wait on the lock
+        # and pick up the fresh one instead of firing their own request
+        left = check_deadline()
+        if not self.lock.acquire(timeout=-1 if left is None else left):
+            raise DeadlineExceeded("Deadline exceeded waiting for an access token.")
+
+        try:
+            token = self.token
+            if token is None or token.expired(timestamp):
+                token = self._update_token(timestamp, **kwargs)
+            return token
+        finally:
+            self.lock.release()
+
+    def _schedule(self, at: datetime | None):
+        if at is None:
+            return
+
+        if self.renewer is not None:
+            self.renewer.cancel()
+
+        delay = max((at - datetime.now()).total_seconds(), 0)
+        self.renewer = Timer(delay, _renew, args=(ref(self),))
+        self.renewer.daemon = True
+        self.renewer.start()
 
-        return self.token.value
+    def update_token(self, timestamp: datetime, **kwargs) -> str:
+        return self._refresh(timestamp, **kwargs).value
+
+    def renew_token(self):
+        timestamp = datetime.now()
+        with self.lock:
+            token = self.token
+            if token is not None and not token.stale(timestamp):
+                return
+
+            try:
+                self._update_token(timestamp, renewing=True)
+            except Exception:
+                logger.exception("Failed to renew access token.")
+                # keep serving the current token and try again before it expires
+                if token is not None and not token.expired(timestamp):
+                    retry_at = min(timestamp + RENEW_RETRY, token.expire_at)
+                    self._schedule(retry_at)
+
+    def close(self):
+        if self.renewer is not None:
+            self.renewer.cancel()
+            self.renewer = None
 
     def __call__(self, r: "PreparedRequest") -> "PreparedRequest":
         access_token = self.client.access_token
@@ -56,11 +169,10 @@ class Auth(AuthBase):
 
         if access_token is None:
             timestamp = datetime.now()
-            if self.token is None or self.token.expired(timestamp):
-                access_token = self.update_token(timestamp)
-            else:
-                access_token = self.token.value
-            token_type = self.token.type
+            token = self.token
+            if token is None or token.expired(timestamp):
+                token = self._refresh(timestamp)
+            access_token, token_type = token.value, token.type
 
         r.headers["Authorization"] = f"{token_type} {access_token}"
         return r
@@ -0,0 +1,138 @@
+from typing import Literal
+from collections import deque
+from threading import Lock
+from time import monotonic
+
+from .throttle import endpoint_group
+
+
+__all__ = ["CircuitOpen", "CircuitBreaker"]
+
+
+State = Literal["closed", "open", "half_open"]
+
+
+class CircuitOpen(ConnectionError):
+    pass
+
+
+class _Circuit:
+    __slots__ = ("state", "outcomes", "failures", "opened_at", "probes", "passed")
+
+    def __init__(self):
+        self.state: State = "closed"
+        self.outcomes: deque[tuple[float, bool]] = deque()
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.passed = 0
+
+
+class CircuitBreaker:
+    # per endpoint group: opens when `failure_rate` of the calls in the last
+    # `window` seconds failed (5xx or no response), fails fast for `open_for`
+    # seconds, then lets `probes` calls through and closes if they all pass
+    failure_rate: float
+    min_calls: int
+    window: float
+    open_for: float
+    probes: int
+
+    def __init__(
+        self,
+        *,
+        failure_rate: float = 0.5,
+        min_calls: int = 10,
+        window: float = 30.0,
+        open_for: float = 15.0,
+        probes: int = 2,
+    ):
+        assert 0 < failure_rate <= 1, "failure_rate must be in (0, 1]."
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.open_for = open_for
+        self.probes = probes
+        self._circuits: dict[str, _Circuit] = {}
+        self._lock = Lock()
+
+    def _circuit(self, group: str) -> _Circuit:
+        circuit = self._circuits.get(group)
+        if circuit is None:
+            circuit = self._circuits[group] = _Circuit()
+        return circuit
+
+    def before(self, url: str):
+        group = endpoint_group(url)
+        if group is None:
+            return
+
+        with self._lock:
+            circuit = self._circuit(group)
+            if circuit.state == "open":
+                if monotonic() - circuit.opened_at < self.open_for:
+                    raise CircuitOpen(f"Circuit for {group} is open.")
+                circuit.state, circuit.probes, circuit.passed = "half_open", 0, 0
+
+            if circuit.state == "half_open":
+                if circuit.probes >= self.probes:
+                    raise CircuitOpen(f"Circuit for {group} is half open.")
+                circuit.probes += 1
+
+    def after(self, url: str, status: int | None):
+        group = endpoint_group(url)
+        if group is None:
+            return
+
+        failed = status is None or status >= 500
+        now = monotonic()
+        with self._lock:
+            circuit = self._circuit(group)
+
+            if circuit.state == "half_open":
+                if failed:
+                    self._open(circuit, now)
+                else:
+                    circuit.passed += 1
+                    if circuit.passed >= self.probes:
+                        circuit.state = "closed"
+                return
+
+            if circuit.state == "open":
+                return
+
+            outcomes = circuit.outcomes
+            outcomes.append((now, failed))
+            circuit.failures += failed
+            while outcomes and outcomes[0][0] < now - self.window:
+                circuit.failures -= outcomes.popleft()[1]
+
+            calls = len(outcomes)
+            if (
+                calls >= self.min_calls
+                and circuit.failures >= self.failure_rate * calls
+            ):
+                self._open(circuit, now)
+
+    def cancel(self, url: str):
+        # the call was abandoned (a hedge loser), it says nothing about
+        # the service, only give back a half open probe slot
+        group = endpoint_group(url)
+        if group is None:
+            return
+
+        with self._lock:
+            circuit = self._circuits.get(group)
+            if circuit is not None and circuit.state == "half_open":
+                circuit.probes -= 1
+
+    def _open(self, circuit: _Circuit, now: float):
+        circuit.state = "open"
+        circuit.opened_at = now
+        circuit.outcomes.clear()
+        circuit.failures = 0
+
+    def state(self, group: str) -> State:
+        with self._lock:
+            circuit = self._circuits.get(group)
+            return "closed" if circuit is None else circuit.state
@@ -0,0 +1,159 @@
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Generator,
+    Iterable,
+    Mapping,
+    TypeVar,
+)
+from asyncio import FIRST_COMPLETED, Task, create_task, wait as async_wait
+from concurrent.futures import FIRST_COMPLETED as FUTURE_FIRST_COMPLETED
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from itertools import islice
+
+from .throttle import prioritized
+
+
+__all__ = ["BulkAborted", "BulkItems", "bulk_map", "async_bulk_map", "with_reasons"]
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# ids alone, (id, reason) pairs or an {id: reason} mapping
+BulkItems = Iterable[str | tuple[str, str | None]] | Mapping[str, str | None]
+
+
+class BulkAborted(RuntimeError):
+    done: int
+    failed: int
+
+    def __init__(self, done: int, failed: int):
+        super().__init__(f"Stopped after {failed} of {done} items failed.")
+        self.done = done
+        self.failed = failed
+
+
+class _Tally:
+    def __init__(self, max_error_rate: float | None, min_items: int):
+        self.max_error_rate = max_error_rate
+        self.min_items = min_items
+        self.done = 0
+        self.failed = 0
+
+    def add(self, result: Any):
+        self.done += 1
+        self.failed += isinstance(result, Exception)
+
+    @property
+    def tripped(self) -> bool:
+        return (
+            self.max_error_rate is not None
+            and self.done >= self.min_items
+            and self.failed > self.max_error_rate * self.done
+        )
+
+
+def with_reasons(
+    items: BulkItems, reason: str | None = None
+) -> Generator[tuple[str, str | None], None, None]:
+    if isinstance(items, Mapping):
+        items = items.items()
+    for item in items:
+        if isinstance(item, str):
+            yield item, reason
+        else:
+            id, note = item
+            yield id, note or reason
+
+
+def _bulk(fn: Callable[[T], R], item: T) -> R:
+    with prioritized("bulk"):
+        return fn(item)
+
+
+async def _async_bulk(fn: Callable[[T], Awaitable[R]], item: T) -> R:
+    with prioritized("bulk"):
+        return await fn(item)
+
+
+def bulk_map(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    /,
+    *,
+    max_concurrency: int = 8,
+    max_error_rate: float | None = None,
+    min_items: int = 20,
+) -> Generator[tuple[T, R | Exception], None, None]:
+    # items are pulled lazily so at most `max_concurrency` calls are
+    # pending, results come back as they complete with errors per item;
+    # past `max_error_rate` no new items start, the running ones are
+    # reported and BulkAborted is raised
+    assert max_concurrency >= 1, "max_concurrency must be at least 1."
+    items = iter(items)
+    tally = _Tally(max_error_rate, min_items)
+    pool = ThreadPoolExecutor(max_concurrency, thread_name_prefix="paypyl-bulk")
+    pending: dict[Future, T] = {}
+
+    def submit(count: int):
+        for item in islice(items, count):
+            future = pool.submit(copy_context().run, _bulk, fn, item)
+            pending[future] = item
+
+    try:
+        submit(max_concurrency)
+        while pending:
+            done, _ = wait(pending, return_when=FUTURE_FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                result = future.exception() or future.result()
+                tally.add(result)
+                yield item, result
+            if not tally.tripped:
+                submit(max_concurrency - len(pending))
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    if tally.tripped:
+        raise BulkAborted(tally.done, tally.failed)
+
+
+async def async_bulk_map(
+    fn: Callable[[T], Awaitable[R]],
+    items: Iterable[T],
+    /,
+    *,
+    max_concurrency: int = 8,
+    max_error_rate: float | None = None,
+    min_items: int = 20,
+) -> AsyncGenerator[tuple[T, R | Exception], None]:
+    assert max_concurrency >= 1, "max_concurrency must be at least 1."
+    items = iter(items)
+    tally = _Tally(max_error_rate, min_items)
+    pending: dict[Task, T] = {}
+
+    def submit(count: int):
+        for item in islice(items, count):
+            pending[create_task(_async_bulk(fn, item))] = item
+
+    try:
+        submit(max_concurrency)
+        while pending:
+            done, _ = await async_wait(pending, return_when=FIRST_COMPLETED)
+            for task in done:
+                item = pending.pop(task)
+                result = task.exception() or task.result()
+                tally.add(result)
+                yield item, result
+            if not tally.tripped:
+                submit(max_concurrency - len(pending))
+    finally:
+        for task in pending:
+            task.cancel()
+
+    if tally.tripped:
+        raise BulkAborted(tally.done, tally.failed)
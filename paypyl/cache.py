@@ -0,0 +1,179 @@
+from typing import Any, Mapping
+from collections import OrderedDict
+from threading import Lock, local
+from urllib.parse import urlencode
+from time import time
+import sqlite3
+
+
+__all__ = ["CacheBackend", "MemoryBackend", "SQLiteBackend", "DetailsCache"]
+
+
+class CacheBackend:
+    # values are grouped per resource so one delete drops every variant
+    # (e.g. subscription details with different `fields`)
+    def get(self, key: str, variant: str, /) -> bytes | None:
+        raise NotImplementedError
+
+    def set(self, key: str, variant: str, /, value: bytes, expire_at: float):
+        raise NotImplementedError
+
+    def delete(self, key: str, /):
+        raise NotImplementedError
+
+
+class MemoryBackend(CacheBackend):
+    maxsize: int
+
+    def __init__(self, *, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, dict[str, tuple[float, bytes]]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str, variant: str, /) -> bytes | None:
+        with self._lock:
+            variants = self._entries.get(key)
+            entry = variants and variants.get(variant)
+            if not entry:
+                return None
+
+            expire_at, value = entry
+            if time() > expire_at:
+                del variants[variant]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, variant: str, /, value: bytes, expire_at: float):
+        with self._lock:
+            self._entries.setdefault(key, {})[variant] = (expire_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str, /):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteBackend(CacheBackend):
+    path: str
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = local()
+
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS details ("
+                "key TEXT, variant TEXT, value BLOB, expire_at REAL, "
+                "PRIMARY KEY (key, variant))"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str, variant: str, /) -> bytes | None:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value FROM details WHERE key = ? AND variant = ? AND expire_at > ?",
+                (key, variant, time()),
+            )
+            .fetchone()
+        )
+        return row and row[0]
+
+    def set(self, key: str, variant: str, /, value: bytes, expire_at: float):
+        connection = self._connection()
+        connection.execute(
+            "INSERT OR REPLACE INTO details VALUES (?, ?, ?, ?)",
+            (key, variant, value, expire_at),
+        )
+        connection.execute("DELETE FROM details WHERE expire_at <= ?", (time(),))
+
+    def delete(self, key: str, /):
+        self._connection().execute("DELETE FROM details WHERE key = ?", (key,))
+
+
+class DetailsCache:
+    ttl: dict[str, float]
+    default_ttl: float
+    backend: CacheBackend
+    hits: int
+    misses: int
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = 1024,
+        ttl: float | Mapping[str, float] = 60,
+        backend: CacheBackend | None = None,
+    ):
+        # ttl in seconds, either one value or per collection ("plans", ...)
+        if isinstance(ttl, Mapping):
+            self.ttl, self.default_ttl = dict(ttl), 60
+        else:
+            self.ttl, self.default_ttl = {}, ttl
+
+        self.backend = backend or MemoryBackend(maxsize=maxsize)
+        self.hits = 0
+        self.misses = 0
+        # bumped by invalidate, a fill that started before it is dropped
+        self._generations: dict[str, int] = {}
+        self._lock = Lock()
+
+    @staticmethod
+    def _variant(params: Mapping[str, Any] | None) -> str:
+        if not params:
+            return ""
+        return urlencode(sorted((k, v) for k, v in params.items() if v is not None))
+
+    def get(self, endpoint: str, key: str, params: Mapping[str, Any] | None = None):
+        value = self.backend.get(key, self._variant(params))
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def generation(self, key: str) -> int:
+        # read before fetching, pass to set with the response
+        return self._generations.get(key, 0)
+
+    def set(
+        self,
+        endpoint: str,
+        key: str,
+        params: Mapping[str, Any] | None = None,
+        *,
+        value: bytes,
+        generation: int | None = None,
+    ):
+        ttl = self.ttl.get(endpoint.split("/")[-1], self.default_ttl)
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self.generation(key):
+                return
+            self.backend.set(key, self._variant(params), value, time() + ttl)
+
+    def invalidate(self, key: str):
+        with self._lock:
+            self._generations[key] = self.generation(key) + 1
+            self.backend.delete(key)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
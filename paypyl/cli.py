@@ -0,0 +1,87 @@
+from typing import Sequence
+from argparse import ArgumentParser
+
+from .client import Client
+from .export import export, export_subscriptions
+from .importer import import_catalog
+
+
+__all__ = ["main"]
+
+
+def _client(args) -> Client:
+    return Client(sandbox=True if args.sandbox else None)
+
+
+def _export(args):
+    client = _client(args)
+    options = dict(
+        format=args.format,
+        fields=args.fields.split(",") if args.fields else None,
+        checkpoint=args.checkpoint,
+        page_size=args.page_size,
+    )
+
+    if args.collection == "subscriptions":
+        with open(args.ids) as f:
+            ids = (line.strip() for line in f if line.strip())
+            count = export_subscriptions(client, ids, args.output, **options)
+    else:
+        count = export(client, args.collection, args.output, **options)
+
+    print(f"exported {count} {args.collection} to {args.output}")
+
+
+def _import(args):
+    client = _client(args)
+    result = import_catalog(
+        client,
+        args.collection,
+        args.input,
+        journal=args.journal,
+        namespace=args.namespace,
+        max_concurrency=args.concurrency,
+        max_error_rate=args.max_error_rate,
+    )
+
+    print(
+        f"created {result.created} {args.collection}, "
+        f"skipped {result.skipped}, failed {len(result.failed)}"
+    )
+    if result.failed:
+        print("failed lines:", ",".join(map(str, result.failed)))
+
+
+def parser() -> ArgumentParser:
+    parser = ArgumentParser(prog="paypyl")
+    parser.add_argument("--sandbox", action="store_true")
+    commands = parser.add_subparsers(required=True)
+
+    command = commands.add_parser("export", help="stream resources to NDJSON or CSV")
+    command.add_argument("collection", choices=["products", "plans", "subscriptions"])
+    command.add_argument("output", help="*.ndjson, *.csv, optionally with .gz")
+    command.add_argument("--format", choices=["ndjson", "csv"])
+    command.add_argument("--fields", help="comma separated CSV columns")
+    command.add_argument("--checkpoint", help="file to resume the export from")
+    command.add_argument("--page-size", type=int, default=20)
+    command.add_argument("--ids", help="file with one subscription id per line")
+    command.set_defaults(run=_export)
+
+    command = commands.add_parser("import", help="create resources from NDJSON")
+    command.add_argument("collection", choices=["products", "plans"])
+    command.add_argument("input", help="*.ndjson, one resource per line")
+    command.add_argument("--journal", help="file of created ids to resume from")
+    command.add_argument("--namespace", default="", help="seed for request ids")
+    command.add_argument("--concurrency", type=int, default=8)
+    command.add_argument("--max-error-rate", type=float)
+    command.set_defaults(run=_import)
+
+    return parser
+
+
+def main(argv: Sequence[str] | None = None):
+    command = parser()
+    args = command.parse_args(argv)
+    if args.collection == "subscriptions" and not args.ids:
+        command.error("--ids is required to export subscriptions.")
+    args.run(args)
@@ -1,13 +1,37 @@
-from typing import Any, Mapping, Generator, Type, List
+from typing import Any, Iterable, Mapping, Generator, Sequence, Type, List
 from os import environ
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlsplit
 from functools import lru_cache
-
-from pydantic import TypeAdapter
-from requests import Session, Request
+from datetime import datetime
+from collections import deque
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, Future
+from concurrent.futures import TimeoutError as FutureTimeout, as_completed, wait
+from time import monotonic, sleep
+from threading import Thread
+from contextvars import copy_context
+from uuid import uuid4
+
+from pydantic_core import from_json
+from requests import Session, Response
+from requests.exceptions import ConnectionError, Timeout
+from requests.adapters import HTTPAdapter
 
 from .update import Update
+from .adapters import page_model, UPDATES
 from .auth import Auth
+from .store import TokenStore, FileTokenStore
+from .views import View
+from .cache import DetailsCache
+from .flight import SingleFlight
+from .retry import Retry, RetryBudget, Attempts, current_retry
+from .throttle import Throttle
+from .hedge import Hedge
+from .breaker import CircuitBreaker
+from .bulk import BulkItems, bulk_map, with_reasons
+from .deadline import *
+from .columns import Columns
+from .webhooks import CertificateCache, InvalidSignature, verify_signature
 from .constants import *
 from .types import *
 from .resources import *
@@ -15,7 +39,13 @@ from .definitions import *
 from .responses import *
 
 
-__all__ = ["Client"]
+__all__ = ["BaseClient", "Client"]
+
+
+COLLECTIONS = {
+    "products": ("v1/catalogs/products", Product),
+    "plans": ("v1/billing/plans", Plan),
+}
 
 
 @lru_cache
@@ -23,13 +53,33 @@ def _endpoint(base: str, path: str):
     return urljoin(base, path)
 
 
-class Client:
-    session: Session
-    auth: Auth
+def _run(future: Future, fn, /, *args, **kwargs):
+    try:
+        future.set_result(fn(*args, **kwargs))
+    except BaseException as e:
+        future.set_exception(e)
+
+
+def _discard(future: Future):
+    # the losing hedged request still completes, give its connection back
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+class BaseClient:
     url: str = LIVE_URL
     client_id: str | None = None
     client_secret: str | None = None
     access_token: str | None = None
+    mode: DecodeMode = "model"
+    cache: DetailsCache | None = None
+    flight: Any = None
+    retry: Retry
+    retry_budget: RetryBudget
+    throttle: Throttle | None = None
+    timeout: TimeoutValue = DEFAULT_TIMEOUT
+    hedge: Hedge | None = None
+    breaker: CircuitBreaker | None = None
 
     def __init__(
         self,
@@ -37,11 +87,22 @@ class Client:
         client_id: str | None = None,
         client_secret: str | None = None,
         sandbox: bool | None = None,
+        mode: DecodeMode = "model",
+        cache: DetailsCache | None = None,
+        retry: Retry | None = None,
+        throttle: Throttle | None = None,
+        timeout: TimeoutValue = DEFAULT_TIMEOUT,
+        hedge: Hedge | None = None,
+        breaker: CircuitBreaker | None = None,
     ):
-        self.session = Session()
-        self.session.auth = Auth(self)
-        self.session.headers.update({"Content-Type": "application/json"})
-
+        self.mode = mode
+        self.cache = cache
+        self.retry = retry or Retry()
+        self.throttle = throttle
+        self.timeout = timeout
+        self.hedge = hedge
+        self.breaker = breaker
+        self.retry_budget = RetryBudget()
         self.client_id = client_id or environ.get(CLIENT_ID_KEY)
         self.client_secret = client_secret or environ.get(CLIENT_SECRET_KEY)
         self.access_token = None
@@ -56,36 +117,84 @@ class Client:
         assert isinstance(other, str) and other, "other must be a non-empty string."
         return _endpoint(self.url, other)
 
-    def request_access_token(
-        self, client_id: str | None = None, client_secret: str | None = None
-    ):
-        url = self / "v1/oauth2/token"
-
-        client_id = client_id or self.client_id
-        client_secret = client_secret or self.client_secret
-        auth = (client_id, client_secret)
+    def _resource(self, endpoint: str, resource_id: str, /):
+        return (self / endpoint) + "/" + resource_id
 
-        data = {"grant_type": "client_credentials"}
+    def _action(self, endpoint: str, resource_id: str, action: str, /):
+        return self._resource(endpoint, resource_id) + "/" + action
 
-        request = Request(url=url, method="POST", auth=auth, data=data)
-        request = request.prepare()
-        response = self.session.send(request)
-        response.raise_for_status()
+    def _cached(self, endpoint: str, url: str, params: Mapping[str, Any] | None):
+        if self.cache is None:
+            return None
+        return self.cache.get(endpoint, url, params)
 
-        return TokenResult.model_validate_json(response.content)
+    def _generation(self, url: str) -> int | None:
+        if self.cache is None:
+            return None
+        return self.cache.generation(url)
 
-    def _create(
+    def _store(
         self,
         endpoint: str,
-        /,
+        url: str,
+        params: Mapping[str, Any] | None,
+        content: bytes,
+        generation: int | None = None,
+    ):
+        # a details response read before an update landed is not stored
+        if self.cache is not None:
+            self.cache.set(endpoint, url, params, value=content, generation=generation)
+
+    def _flight_key(
+        self,
+        url: str,
+        params: Mapping[str, Any] | None,
+        convert: Type[R],
+        mode: DecodeMode | None,
+    ):
+        # callers asking for a different shape get their own request
+        items = tuple(
+            sorted((k, str(v)) for k, v in (params or {}).items() if v is not None)
+        )
+        return url, items, convert, mode or self.mode
+
+    def _invalidate(self, endpoint: str, resource_id: str, /):
+        if self.cache is not None:
+            self.cache.invalidate(self._resource(endpoint, resource_id))
+
+    def _attempts(
+        self,
+        method: str,
+        headers: Mapping[str, str] | None = None,
+        *,
+        retry: Retry | None = None,
+        idempotent: bool | None = None,
+    ) -> Attempts:
+        policy = retry or current_retry() or self.retry
+        if idempotent is None:
+            # a request id makes PayPal replay the first result instead of
+            # repeating the side effect
+            idempotent = method in policy.methods or "PayPal-Request-Id" in (
+                headers or {}
+            )
+        return Attempts(policy, self.retry_budget, idempotent=idempotent)
+
+    def _timeout(self, timeout: TimeoutValue | None = None) -> tuple[float, float]:
+        return clip_timeout(timeout or current_timeout() or self.timeout)
+
+    def _credentials(
+        self, client_id: str | None = None, client_secret: str | None = None
+    ):
+        return (client_id or self.client_id, client_secret or self.client_secret)
+
+    def _create_request(
+        self,
         resource: R,
         *,
         prefer: PreferType | None = None,
         request_id: str | None = None,
         extra_headers: Mapping[str, str] | None = None,
-    ) -> R:
-        url = self / endpoint
-
+    ):
         headers = {}
 
         if extra_headers is not None:
@@ -94,21 +203,353 @@ class Client:
         if prefer is not None:
             headers["Prefer"] = f"return={prefer}"
 
-        if request_id is not None:
-            headers["PayPal-Request-Id"] = request_id
+        # generated once per call so every retry carries the same id
+        headers["PayPal-Request-Id"] = request_id or str(uuid4())
 
         data = resource.model_dump_json(
             exclude=["create_time", "update_time"], exclude_none=True
         )
 
-        response = self.session.post(url=url, data=data, headers=headers)
-        response.raise_for_status()
+        return headers, data
+
+    def _list_params(
+        self,
+        *,
+        page_size: int | None = None,
+        page: int | None = None,
+        total_required: bool | None = None,
+        **kwargs,
+    ):
+        return {
+            "page_size": page_size,
+            "page": page,
+            "total_required": total_required,
+            **kwargs,
+        }
+
+    def _decode(self, content: bytes, convert: Type[R], mode: DecodeMode | None = None):
+        mode = mode or self.mode
+        if mode == "model":
+            return convert.model_validate_json(content)
+
+        data = from_json(content)
+        return data if mode == "raw" else View(convert, data)
+
+    def _decode_list(
+        self,
+        endpoint: str,
+        content: bytes,
+        convert: Type[R],
+        mode: DecodeMode | None = None,
+    ):
+        name = endpoint.split("/")[-1]
+        mode = mode or self.mode
+        if mode == "model":
+            return page_model(name, convert).model_validate_json(content)
+
+        # skip validation, items stay plain dicts or become lazy views
+        data = from_json(content)
+        if mode == "lazy":
+            data[name] = [View(convert, item) for item in data.get(name, ())]
+        return ResourceList[convert].model_construct(**data)
+
+    def _verify_models(
+        self,
+        signature: WebhookSignature | Mapping[str, Any],
+        event: Event | Mapping[str, Any],
+    ):
+        if not isinstance(signature, WebhookSignature):
+            signature = WebhookSignature.model_validate(signature)
+
+        if not isinstance(event, Event):
+            event = Event.model_validate(event)
+
+        return signature, event
+
+    def _verify_payload(
+        self, webhook_id: str, signature: WebhookSignature, event: Event
+    ):
+        return {
+            "webhook_id": webhook_id,
+            "webhook_event": event.model_dump(
+                mode="json",
+                include=[
+                    "id",
+                    "create_time",
+                    "resource_type",
+                    "event_type",
+                    "summary",
+                    "resource",
+                ],
+            ),
+            **signature.model_dump(mode="json", exclude_none=True),
+        }
+
+
+class Client(BaseClient):
+    session: Session
+    owns_session: bool
+    auth: Auth
+    certificates: CertificateCache
+    hedges: ThreadPoolExecutor | None = None
+
+    def __init__(
+        self,
+        *,
+        client_id: str | None = None,
+        client_secret: str | None = None,
+        sandbox: bool | None = None,
+        renew: float | None = None,
+        token_store: TokenStore | None = None,
+        mode: DecodeMode = "model",
+        cache: DetailsCache | None = None,
+        pool_size: int | None = None,
+        coalesce: bool = False,
+        retry: Retry | None = None,
+        throttle: Throttle | None = None,
+        timeout: TimeoutValue = DEFAULT_TIMEOUT,
+        hedge: Hedge | None = None,
+        breaker: CircuitBreaker | None = None,
+        session: Session | None = None,
+    ):
+        assert session is None or pool_size is None, "pool_size needs an own session."
+        super().__init__(
+            client_id=client_id,
+            client_secret=client_secret,
+            sandbox=sandbox,
+            mode=mode,
+            cache=cache,
+            retry=retry,
+            throttle=throttle,
+            timeout=timeout,
+            hedge=hedge,
+            breaker=breaker,
+        )
+
+        if token_store is None:
+            token_store = FileTokenStore()
+
+        self.auth = Auth(self, renew=renew, store=token_store)
+        self.certificates = CertificateCache(fetch=self._fetch_certificate)
+        self.flight = SingleFlight() if coalesce else None
+        self.hedges = ThreadPoolExecutor(32, thread_name_prefix="paypyl-hedge")
+
+        # a shared session serves other clients too,
+        # so auth goes with each request instead
+        self.owns_session = session is None
+        if session is None:
+            self.session = Session()
+            self.session.auth = self.auth
+            self.session.headers.update({"Content-Type": "application/json"})
+        else:
+            self.session = session
+            self.session.headers.setdefault("Content-Type", "application/json")
+
+        if pool_size is not None:
+            self.session.mount("https://", HTTPAdapter(pool_maxsize=pool_size))
+
+    def warm(self, *, connections: int = 1):
+        if self.access_token is None:
+            self.auth.update_token(datetime.now())
+
+        # streamed responses keep their connection checked out, so holding
+        # them all until every one is open gives `connections` sockets,
+        # the one left idle by the token request included
+        with ThreadPoolExecutor(connections) as pool:
+            futures = [
+                pool.submit(
+                    self.session.head,
+                    self.url,
+                    auth=lambda r: r,
+                    timeout=self._timeout(),
+                    stream=True,
+                )
+                for _ in range(connections)
+            ]
+        for future in futures:
+            if future.exception() is None:
+                future.result().close()
+        for future in futures:
+            future.result()
+
+    def _open_connections(self) -> int:
+        # requests keys its pools by TLS settings too, look them up by host
+        manager = getattr(self.session.get_adapter(self.url), "poolmanager", None)
+        if manager is None:
+            return 0
+
+        host = urlsplit(self.url).hostname
+        return sum(
+            manager.pools[key].num_connections
+            for key in manager.pools.keys()
+            if key.key_host == host
+        )
+
+    def readiness(self) -> dict[str, bool]:
+        token = self.auth.token
+        return {
+            "token": self.access_token is not None
+            or (token is not None and not token.stale(datetime.now())),
+            "pool": self._open_connections() > 0,
+        }
+
+    def request_access_token(
+        self, client_id: str | None = None, client_secret: str | None = None
+    ):
+        url = self / "v1/oauth2/token"
+
+        auth = self._credentials(client_id, client_secret)
+
+        data = {"grant_type": "client_credentials"}
+
+        response = self._request(
+            "POST",
+            url,
+            auth=auth,
+            data=data,
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+            idempotent=True,
+        )
+
+        return TokenResult.model_validate_json(response.content)
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        /,
+        *,
+        retry: Retry | None = None,
+        idempotent: bool | None = None,
+        priority: Priority | None = None,
+        timeout: TimeoutValue | None = None,
+        **kwargs,
+    ) -> Response:
+        attempts = self._attempts(
+            method, kwargs.get("headers"), retry=retry, idempotent=idempotent
+        )
+        while True:
+            try:
+                response = self._send(
+                    method, url, priority, timeout=self._timeout(timeout), **kwargs
+                )
+            except (ConnectionError, Timeout) as e:
+                delay = attempts.retry_in()
+                if delay is None:
+                    if expired():
+                        raise DeadlineExceeded("Deadline exceeded.") from e
+                    raise
+            else:
+                delay = attempts.retry_in(response.status_code, response.headers)
+                if delay is None:
+                    response.raise_for_status()
+                    return response
+            sleep(delay)
+
+    def _send(self, method: str, url: str, priority: Priority | None, /, **kwargs):
+        if self.hedge is not None and method == "GET":
+            delay = self.hedge.delay_for(url)
+            if delay is not None:
+                return self._hedged(delay, url, priority, **kwargs)
+
+        return self._attempt(method, url, priority, **kwargs)
+
+    def _attempt(
+        self, method: str, url: str, priority: Priority | None, /, **kwargs
+    ) -> Response:
+        if self.breaker is not None:
+            self.breaker.before(url)
+
+        status = permit = None
+        unreachable = False
+        try:
+            if self.throttle is not None:
+                permit = self.throttle.acquire(url, priority)
+            if not self.owns_session:
+                kwargs.setdefault("auth", self.auth)
+            start = monotonic()
+            response = self.session.request(method, url, **kwargs)
+            status = response.status_code
+            return response
+        except (ConnectionError, Timeout):
+            unreachable = True
+            raise
+        finally:
+            if permit is not None:
+                permit.release(status)
+            # only responses and network errors say something about the
+            # service, not a deadline or a failed token request
+            if self.breaker is not None and (status is not None or unreachable):
+                self.breaker.after(url, status)
+            elif self.breaker is not None:
+                self.breaker.cancel(url)
+            if self.hedge is not None and status is not None and status < 500:
+                self.hedge.record(url, monotonic() - start)
+
+    def _hedged(self, delay: float, url: str, priority: Priority | None, /, **kwargs):
+        # the primary gets a thread of its own, the pool only runs hedges,
+        # so they never queue behind primaries and GETs are not capped by it
+        primary = Future()
+        Thread(
+            target=copy_context().run,
+            args=(_run, primary, self._attempt, "GET", url, priority),
+            kwargs=kwargs,
+            name="paypyl-hedged",
+            daemon=True,
+        ).start()
+
+        futures = [primary]
+        if not wait(futures, timeout=delay).done:
+            futures.append(
+                self.hedges.submit(
+                    copy_context().run, self._attempt, "GET", url, priority, **kwargs
+                )
+            )
+
+        # the first good response wins, errors only count if both fail
+        winner = None
+        for future in as_completed(futures):
+            winner = future
+            if future.exception() is None and future.result().status_code < 500:
+                break
+
+        for future in futures:
+            if future is not winner:
+                future.add_done_callback(_discard)
+
+        if len(futures) > 1:
+            self.hedge.count(winner is futures[1])
+        return winner.result()
+
+    def _create(
+        self,
+        endpoint: str,
+        /,
+        resource: R,
+        *,
+        prefer: PreferType | None = None,
+        request_id: str | None = None,
+        extra_headers: Mapping[str, str] | None = None,
+    ) -> R:
+        url = self / endpoint
+        headers, data = self._create_request(
+            resource, prefer=prefer, request_id=request_id, extra_headers=extra_headers
+        )
+
+        response = self._request("POST", url, data=data, headers=headers)
 
         return resource.__class__.model_validate_json(response.content)
 
     def _delete(self, endpoint: str, resource_id: str, /) -> None:
         url = self._resource(endpoint, resource_id)
-        self.session.delete(url=url).raise_for_status()
+        self._request("DELETE", url)
+        self._invalidate(endpoint, resource_id)
+
+    def _post_action(self, endpoint: str, resource_id: str, action: str, /, **kwargs):
+        url = self._action(endpoint, resource_id, action)
+        headers = {"PayPal-Request-Id": str(uuid4()), **kwargs.pop("headers", {})}
+        self._request("POST", url, headers=headers, **kwargs)
+        self._invalidate(endpoint, resource_id)
 
     def _list(
         self,
@@ -118,62 +559,133 @@ class Client:
         page: int | None = None,
         total_required: bool | None = None,
         convert: Type[R] = Resource,
+        mode: DecodeMode | None = None,
+        priority: Priority | None = None,
         **kwargs,
     ):
         url = self / endpoint
-        name = endpoint.split("/")[-1]
-
-        params = {
-            "page_size": page_size,
-            "page": page,
-            "total_required": total_required,
-            **kwargs,
-        }
-
-        response = self.session.get(url=url, params=params)
-        response.raise_for_status()
-
-        result = ResourceList[convert].model_validate_json(response.content)
-
-        # monkeypatch validation
-        setattr(
-            result,
-            name,
-            list(map(convert.model_validate, getattr(result, name))),
+        params = self._list_params(
+            page_size=page_size, page=page, total_required=total_required, **kwargs
         )
 
-        return result
+        def fetch():
+            response = self._request("GET", url, params=params, priority=priority)
+            return self._decode_list(endpoint, response.content, convert, mode)
+
+        if self.flight is None:
+            return fetch()
+        return self.flight.do(self._flight_key(url, params, convert, mode), fetch)
 
-    def _iter(
+    def _pages(
         self,
         endpoint: str,
         *,
         page_size: int = 10,
         start_page: int = 1,
         convert: Type[R] = Resource,
-    ) -> Generator[R, None, None]:
-        name = endpoint.split("/")[-1]
+        prefetch: int = 4,
+        max_in_flight: int = 4,
+        mode: DecodeMode | None = None,
+    ) -> Generator[tuple[int, ResourceList[R]], None, None]:
+        # scans yield to interactive calls when a throttle is set
         result = self._list(
             endpoint,
             page_size=page_size,
             page=start_page,
             total_required=True,
             convert=convert,
+            mode=mode,
+            priority="bulk",
         )
-        yield from getattr(result, name)
+        yield start_page, result
+
+        pages = iter(range(start_page + 1, (result.total_pages or start_page) + 1))
+
+        if prefetch < 1:
+            for page in pages:
+                result = self._list(
+                    endpoint,
+                    page_size=page_size,
+                    page=page,
+                    convert=convert,
+                    mode=mode,
+                    priority="bulk",
+                )
+                yield page, result
+            return
+
+        # keep up to `prefetch` pages requested ahead of the consumer,
+        # at most `max_in_flight` of them on the wire at once
+        pool = ThreadPoolExecutor(max_in_flight, thread_name_prefix="paypyl-iter")
+        window: deque[tuple[int, Future]] = deque()
+
+        def submit(page: int):
+            # pages run in worker threads, carry over the caller's context
+            future = pool.submit(
+                copy_context().run,
+                self._list,
+                endpoint,
+                page_size=page_size,
+                page=page,
+                convert=convert,
+                mode=mode,
+                priority="bulk",
+            )
+            window.append((page, future))
+
+        try:
+            for page in islice(pages, prefetch):
+                submit(page)
+
+            while window:
+                page, future = window.popleft()
+                try:
+                    result = future.result(timeout=remaining())
+                except FutureTimeout as e:
+                    raise DeadlineExceeded("Deadline exceeded.") from e
+                for next_page in islice(pages, 1):
+                    submit(next_page)
+                yield page, result
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _iter(self, endpoint: str, **kwargs) -> Generator[R, None, None]:
+        name = endpoint.split("/")[-1]
+        for _, result in self._pages(endpoint, **kwargs):
+            yield from getattr(result, name)
 
-        current_page, total_pages = start_page, result.total_pages
+    def iter_columns(
+        self,
+        collection: Literal["products", "plans"],
+        /,
+        fields: Sequence[str],
+        *,
+        batch_size: int | None = None,
+        page_size: int = 20,
+        start_page: int = 1,
+        prefetch: int = 4,
+        max_in_flight: int = 4,
+    ) -> Generator[Columns, None, None]:
+        endpoint, convert = COLLECTIONS[collection]
+        columns = Columns(convert, fields)
 
-        while current_page < total_pages:
-            result = self._list(page_size=page_size, page=current_page, convert=convert)
-            yield from getattr(result, name)
-            current_page += 1
+        for _, result in self._pages(
+            endpoint,
+            page_size=page_size,
+            start_page=start_page,
+            convert=convert,
+            prefetch=prefetch,
+            max_in_flight=max_in_flight,
+            mode="raw",
+        ):
+            columns.extend(getattr(result, collection))
 
-    def _resource(self, endpoint: str, resource_id: str, /):
-        return (self / endpoint) + "/" + resource_id
+            if batch_size is not None and len(columns) >= batch_size:
+                yield columns
+                columns = columns.new()
 
-    def _action(self, endpoint: str, resource_id: str, action: str, /):
-        return self._resource(endpoint, resource_id) + "/" + action
+        if len(columns) or batch_size is None:
+            yield columns
 
     def _details(
         self,
@@ -182,18 +694,63 @@ class Client:
         resource_id: str,
         *,
         convert: Type[R] = Resource,
+        mode: DecodeMode | None = None,
         **kwargs,
     ) -> R:
-        r = self.session.get(url=self._resource(endpoint, resource_id), **kwargs)
-        r.raise_for_status()
-        return convert.model_validate_json(r.content)
+        url = self._resource(endpoint, resource_id)
+        params = kwargs.get("params")
+
+        def fetch():
+            content = self._cached(endpoint, url, params)
+            if content is None:
+                generation = self._generation(url)
+                content = self._request("GET", url, **kwargs).content
+                self._store(endpoint, url, params, content, generation)
+
+            return self._decode(content, convert, mode)
+
+        if self.flight is None:
+            return fetch()
+        return self.flight.do(self._flight_key(url, params, convert, mode), fetch)
+
+    def _bulk_action(
+        self,
+        endpoint: str,
+        action: str,
+        items: BulkItems,
+        /,
+        *,
+        reason: str | None = None,
+        max_concurrency: int = 8,
+        dry_run: bool = False,
+        max_error_rate: float | None = None,
+    ) -> Generator[tuple[str, Exception | None], None, None]:
+        def run(item: tuple[str, str | None]):
+            resource_id, note = item
+            if not dry_run:
+                self._post_action(
+                    endpoint,
+                    resource_id,
+                    action,
+                    json={"reason": note} if note else None,
+                )
+
+        for (resource_id, _), result in bulk_map(
+            run,
+            with_reasons(items, reason),
+            max_concurrency=max_concurrency,
+            max_error_rate=max_error_rate,
+        ):
+            yield resource_id, result
 
     def _update(self, endpoint: str, /, resource_id: str, ops: List[Update]):
-        data = TypeAdapter(List[Update]).dump_json(ops, exclude_none=True)
-        response = self.session.patch(
-            url=self._resource(endpoint, resource_id), data=data
-        )
-        response.raise_for_status()
+        if not ops:
+            # nothing changed, skip the round trip
+            return
+
+        data = UPDATES.dump_json(ops, exclude_none=True)
+        self._request("PATCH", self._resource(endpoint, resource_id), data=data)
+        self._invalidate(endpoint, resource_id)
 
     def create_product(
         self,
@@ -212,24 +769,54 @@ class Client:
         page_size: int | None = None,
         page: int | None = None,
         total_required: bool | None = None,
+        mode: DecodeMode | None = None,
     ) -> ResourceList[Product]:
         return self._list(
             "v1/catalogs/products",
             page_size=page_size,
             page=page,
             total_required=total_required,
+            convert=Product,
+            mode=mode,
         )
 
-    def iter_products(self, *, page_size: int = 10, start_page: int = 1):
+    def iter_products(
+        self,
+        *,
+        page_size: int = 10,
+        start_page: int = 1,
+        prefetch: int = 4,
+        max_in_flight: int = 4,
+        mode: DecodeMode | None = None,
+    ):
         yield from self._iter(
             "v1/catalogs/products",
             page_size=page_size,
             start_page=start_page,
             convert=Product,
+            prefetch=prefetch,
+            max_in_flight=max_in_flight,
+            mode=mode,
         )
 
-    def product_details(self, product_id: str, /):
-        return self._details("v1/catalogs/products", product_id, convert=Product)
+    def product_details(self, product_id: str, /, *, mode: DecodeMode | None = None):
+        return self._details(
+            "v1/catalogs/products", product_id, convert=Product, mode=mode
+        )
+
+    def product_details_many(
+        self,
+        product_ids: Iterable[str],
+        /,
+        *,
+        max_concurrency: int = 8,
+        mode: DecodeMode | None = None,
+    ) -> Generator[tuple[str, Product | Exception], None, None]:
+        yield from bulk_map(
+            lambda id: self.product_details(id, mode=mode),
+            product_ids,
+            max_concurrency=max_concurrency,
+        )
 
     def update_product(self, product_id: str, /, ops: list[Update]):
         self._update("v1/catalogs/products", product_id, ops)
@@ -251,35 +838,97 @@ class Client:
         page_size: int | None = None,
         page: int | None = None,
         total_required: bool | None = None,
+        mode: DecodeMode | None = None,
     ) -> ResourceList[Plan]:
         return self._list(
             "v1/billing/plans",
             page_size=page_size,
             page=page,
             total_required=total_required,
+            convert=Plan,
+            mode=mode,
         )
 
-    def iter_plans(self, *, page_size: int = 10, start_page: int = 1):
+    def iter_plans(
+        self,
+        *,
+        page_size: int = 10,
+        start_page: int = 1,
+        prefetch: int = 4,
+        max_in_flight: int = 4,
+        mode: DecodeMode | None = None,
+    ):
         yield from self._iter(
             "v1/billing/plans",
             page_size=page_size,
             start_page=start_page,
             convert=Plan,
+            prefetch=prefetch,
+            max_in_flight=max_in_flight,
+            mode=mode,
         )
 
-    def plan_details(self, plan_id: str, /):
-        return self._details("v1/billing/plans", plan_id, convert=Plan)
+    def plan_details(self, plan_id: str, /, *, mode: DecodeMode | None = None):
+        return self._details("v1/billing/plans", plan_id, convert=Plan, mode=mode)
+
+    def plan_details_many(
+        self,
+        plan_ids: Iterable[str],
+        /,
+        *,
+        max_concurrency: int = 8,
+        mode: DecodeMode | None = None,
+    ) -> Generator[tuple[str, Plan | Exception], None, None]:
+        yield from bulk_map(
+            lambda id: self.plan_details(id, mode=mode),
+            plan_ids,
+            max_concurrency=max_concurrency,
+        )
 
     def update_plan(self, product_id: str, /, ops: list[Update]):
         self._update("v1/billing/plans", product_id, ops)
 
     def activate_plan(self, plan_id: str, /):
-        url = self._action("v1/billing/plans", plan_id, "activate")
-        self.session.post(url=url).raise_for_status()
+        self._post_action("v1/billing/plans", plan_id, "activate")
 
     def deactivate_plan(self, plan_id: str, /):
-        url = self._action("v1/billing/plans", plan_id, "deactivate")
-        self.session.post(url=url).raise_for_status()
+        self._post_action("v1/billing/plans", plan_id, "deactivate")
+
+    def activate_plans(
+        self,
+        plan_ids: Iterable[str],
+        /,
+        *,
+        max_concurrency: int = 8,
+        dry_run: bool = False,
+        max_error_rate: float | None = None,
+    ) -> Generator[tuple[str, Exception | None], None, None]:
+        yield from self._bulk_action(
+            "v1/billing/plans",
+            "activate",
+            plan_ids,
+            max_concurrency=max_concurrency,
+            dry_run=dry_run,
+            max_error_rate=max_error_rate,
+        )
+
+    def deactivate_plans(
+        self,
+        plan_ids: Iterable[str],
+        /,
+        *,
+        max_concurrency: int = 8,
+        dry_run: bool = False,
+        max_error_rate: float | None = None,
+    ) -> Generator[tuple[str, Exception | None], None, None]:
+        yield from self._bulk_action(
+            "v1/billing/plans",
+            "deactivate",
+            plan_ids,
+            max_concurrency=max_concurrency,
+            dry_run=dry_run,
+            max_error_rate=max_error_rate,
+        )
 
     def create_subscription(
         self,
@@ -300,6 +949,8 @@ class Client:
         subscription_id: str,
         /,
         fields: Optional[List[Literal["plan", "last_failed_payment"]]] = None,
+        *,
+        mode: DecodeMode | None = None,
     ):
         params = None
         if fields is not None:
@@ -309,28 +960,102 @@ class Client:
             "v1/billing/subscriptions",
             subscription_id,
             convert=Subscription,
+            mode=mode,
             params=params,
         )
 
-    def activate_subscription(self, subscription_id: str, /):
-        url = self._action("v1/billing/subscriptions", subscription_id, "activate")
-        self.session.post(url=url).raise_for_status()
+    def subscription_details_many(
+        self,
+        subscription_ids: Iterable[str],
+        /,
+        fields: Optional[List[Literal["plan", "last_failed_payment"]]] = None,
+        *,
+        max_concurrency: int = 8,
+        mode: DecodeMode | None = None,
+    ) -> Generator[tuple[str, Subscription | Exception], None, None]:
+        # lookups run on the shared session, keep max_concurrency
+        # within the connection pool size
+        yield from bulk_map(
+            lambda id: self.subscription_details(id, fields, mode=mode),
+            subscription_ids,
+            max_concurrency=max_concurrency,
+        )
+
+    def activate_subscription(self, subscription_id: str, /, reason: str | None = None):
+        self._post_action(
+            "v1/billing/subscriptions",
+            subscription_id,
+            "activate",
+            json={"reason": reason} if reason else None,
+        )
+
+    def suspend_subscription(self, subscription_id: str, /, reason: str | None = None):
+        self._post_action(
+            "v1/billing/subscriptions",
+            subscription_id,
+            "suspend",
+            json={"reason": reason} if reason else None,
+        )
 
-    def suspend_subscription(self, subscription_id: str, /):
-        url = self._action("v1/billing/subscriptions", subscription_id, "suspend")
-        self.session.post(url=url).raise_for_status()
+    def cancel_subscription(self, subscription_id: str, /, reason: str | None = None):
+        self._post_action(
+            "v1/billing/subscriptions",
+            subscription_id,
+            "cancel",
+            json={"reason": reason} if reason else None,
+        )
+
+    def suspend_subscriptions(
+        self,
+        subscriptions: BulkItems,
+        /,
+        reason: str | None = None,
+        *,
+        max_concurrency: int = 8,
+        dry_run: bool = False,
+        max_error_rate: float | None = None,
+    ) -> Generator[tuple[str, Exception | None], None, None]:
+        yield from self._bulk_action(
+            "v1/billing/subscriptions",
+            "suspend",
+            subscriptions,
+            reason=reason,
+            max_concurrency=max_concurrency,
+            dry_run=dry_run,
+            max_error_rate=max_error_rate,
+        )
 
-    def cancel_subscription(self, subscription_id: str, /):
-        url = self._action("v1/billing/subscriptions", subscription_id, "cancel")
-        self.session.post(url=url).raise_for_status()
+    def cancel_subscriptions(
+        self,
+        subscriptions: BulkItems,
+        /,
+        reason: str | None = None,
+        *,
+        max_concurrency: int = 8,
+        dry_run: bool = False,
+        max_error_rate: float | None = None,
+    ) -> Generator[tuple[str, Exception | None], None, None]:
+        yield from self._bulk_action(
+            "v1/billing/subscriptions",
+            "cancel",
+            subscriptions,
+            reason=reason,
+            max_concurrency=max_concurrency,
+            dry_run=dry_run,
+            max_error_rate=max_error_rate,
+        )
 
     def list_webhooks(
         self,
         *,
         anchor_type: Optional[Literal["APPLICATION", "ACCOUNT"]] = None,
+        mode: DecodeMode | None = None,
     ) -> list[Webhook]:
         result = self._list(
-            "v1/notifications/webhooks", convert=Webhook, anchor_type=anchor_type
+            "v1/notifications/webhooks",
+            convert=Webhook,
+            mode=mode,
+            anchor_type=anchor_type,
         )
         return result.webhooks
 
@@ -348,43 +1073,45 @@ class Client:
         event: Event | Mapping[str, Any],
         *,
         dry_run: bool = False,
+        body: bytes | None = None,
     ) -> Event:
-        if not isinstance(signature, WebhookSignature):
-            signature = WebhookSignature.model_validate(signature)
+        signature, event = self._verify_models(signature, event)
 
-        if not isinstance(event, Event):
-            event = Event.model_validate(event)
+        if dry_run:
+            return event
+
+        if body is not None:
+            # the raw body is available, check the signature locally
+            certificate = self.certificates.get(signature.cert_url)
+            verify_signature(body, webhook_id, signature, certificate)
+            return event
+
+        payload = self._verify_payload(webhook_id, signature, event)
+        url = self / "v1/notifications/verify-webhook-signature"
+        # verification has no side effects, it is safe to repeat
+        response = self._request("POST", url, json=payload, idempotent=True)
 
-        if not dry_run:
-            payload = {
-                "webhook_id": webhook_id,
-                "webhook_event": event.model_dump(
-                    mode="json",
-                    include=[
-                        "id",
-                        "create_time",
-                        "resource_type",
-                        "event_type",
-                        "summary",
-                        "resource",
-                    ],
-                ),
-                **signature.model_dump(mode="json", exclude_none=True),
-            }
-            from pprint import pprint
-
-            pprint(payload)
-
-            url = self / "v1/notifications/verify-webhook-signature"
-            response = self.session.post(url=url, json=payload)
-            response.raise_for_status()
-
-            result = WebhookSignatureResponse.model_validate_json(response.content)
-            status = result.verification_status
-
-            assert status == "SUCCESS", status
+        result = WebhookSignatureResponse.model_validate_json(response.content)
+        status = result.verification_status
+
+        if status != "SUCCESS":
+            raise InvalidSignature(status)
 
         return event
 
+    def _fetch_certificate(self, url: str) -> bytes:
+        # the certificate host must not receive our access token
+        return self._request("GET", url, auth=lambda r: r).content
+
+    def close(self):
+        # also runs from __del__ when __init__ failed halfway,
+        # e.g. on a token store directory that is not private
+        if (auth := getattr(self, "auth", None)) is not None:
+            auth.close()
+        if (hedges := getattr(self, "hedges", None)) is not None:
+            hedges.shutdown(wait=False)
+        if getattr(self, "owns_session", False):
+            self.session.close()
+
     def __del__(self):
-        self.session.close()
+        self.close()
@@ -0,0 +1,173 @@
+from typing import Any, Iterable, Literal, Mapping, Sequence, Type, Union
+from typing import get_args, get_origin
+from types import UnionType
+from array import array
+from datetime import datetime
+
+from pydantic import BaseModel
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+__all__ = ["Columns", "StringTable", "NULL"]
+
+
+# missing integers and timestamps, codes use -1
+NULL = -(2**63)
+
+ColumnKind = Literal["string", "code", "time", "int", "bool"]
+
+
+class StringTable:
+    values: list[str]
+    index: dict[str, int]
+
+    def __init__(self):
+        self.values = []
+        self.index = {}
+
+    def code(self, value: str | None) -> int:
+        if value is None:
+            return -1
+
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self):
+        return len(self.values)
+
+
+def _strip_optional(annotation: Any):
+    if get_origin(annotation) in (Union, UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _resolve(model: Type[BaseModel], path: str):
+    annotation = model
+    for name in path.split("."):
+        field = annotation.model_fields.get(name)
+        assert field is not None, f"{annotation.__name__} has no field {name!r}."
+        annotation = _strip_optional(field.annotation)
+    return annotation
+
+
+def _kind(annotation: Any) -> ColumnKind:
+    if get_origin(annotation) is Literal:
+        return "code"
+    if annotation is datetime:
+        return "time"
+    if annotation is bool:
+        return "bool"
+    if annotation is int:
+        return "int"
+    assert annotation is str, f"{annotation!r} can not be stored in a column."
+    return "string"
+
+
+def _get(item: Mapping[str, Any], path: tuple[str, ...]):
+    for name in path:
+        if item is None:
+            return None
+        item = item.get(name)
+    return item
+
+
+def _epoch(value: str | None) -> int:
+    if value is None:
+        return NULL
+    return int(datetime.fromisoformat(value).timestamp())
+
+
+class Columns:
+    model: Type[BaseModel]
+    fields: tuple[str, ...]
+    kinds: dict[str, ColumnKind]
+    labels: dict[str, tuple[str, ...]]
+    strings: dict[str, StringTable]
+    buffers: dict[str, array]
+
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        fields: Sequence[str],
+        *,
+        strings: dict[str, StringTable] | None = None,
+    ):
+        self.model = model
+        self.fields = tuple(fields)
+        self.kinds = {}
+        self.labels = {}
+        self.strings = strings if strings is not None else {}
+        self.buffers = {}
+
+        for field in self.fields:
+            annotation = _resolve(model, field)
+            kind = self.kinds[field] = _kind(annotation)
+
+            if kind == "code":
+                self.labels[field] = get_args(annotation)
+                self.buffers[field] = array("b")
+            elif kind == "string":
+                self.strings.setdefault(field, StringTable())
+                self.buffers[field] = array("i")
+            elif kind == "bool":
+                self.buffers[field] = array("b")
+            else:
+                self.buffers[field] = array("q")
+
+        self._paths = {field: tuple(field.split(".")) for field in self.fields}
+
+    def new(self) -> "Columns":
+        # an empty batch that keeps codes of string columns comparable
+        return Columns(self.model, self.fields, strings=self.strings)
+
+    def append(self, item: Mapping[str, Any]):
+        for field, kind in self.kinds.items():
+            value = _get(item, self._paths[field])
+            buffer = self.buffers[field]
+
+            if kind == "string":
+                buffer.append(self.strings[field].code(value))
+            elif kind == "time":
+                buffer.append(_epoch(value))
+            elif kind == "code":
+                labels = self.labels[field]
+                buffer.append(labels.index(value) if value in labels else -1)
+            elif kind == "bool":
+                buffer.append(-1 if value is None else int(value))
+            else:
+                buffer.append(NULL if value is None else value)
+
+    def extend(self, items: Iterable[Mapping[str, Any]]):
+        for item in items:
+            self.append(item)
+
+    def __len__(self):
+        return len(self.buffers[self.fields[0]]) if self.fields else 0
+
+    def __getitem__(self, field: str) -> array:
+        return self.buffers[field]
+
+    def decode(self, field: str, code: int) -> str | None:
+        if code < 0:
+            return None
+        if self.kinds[field] == "code":
+            return self.labels[field][code]
+        return self.strings[field].values[code]
+
+    def arrays(self) -> dict[str, Any]:
+        if numpy is None:
+            return dict(self.buffers)
+        return {
+            field: numpy.frombuffer(buffer, dtype=buffer.typecode).copy()
+            for field, buffer in self.buffers.items()
+        }
@@ -1,6 +1,7 @@
 MODE_KEY = "PAYPAL_MODE"
 CLIENT_ID_KEY = "PAYPAL_CLIENT_ID"
 CLIENT_SECRET_KEY = "PAYPAL_CLIENT_SECRET"
+TOKEN_STORE_KEY = "PAYPAL_TOKEN_STORE"
 
 DOMAIN = "paypal.com"
 
@@ -10,3 +11,6 @@ SANDBOX_SUBDOMAIN = "sandbox"
 
 LIVE_URL = f"https://{API_SUBDOMAIN}.{DOMAIN}"
 SANDBOX_URL = f"https://{API_SUBDOMAIN}.{SANDBOX_SUBDOMAIN}.{DOMAIN}"
+
+# seconds to connect and to wait for each read
+DEFAULT_TIMEOUT = (10.0, 60.0)
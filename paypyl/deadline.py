@@ -0,0 +1,82 @@
+from typing import Iterator, Tuple, Union
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import monotonic
+
+
+__all__ = [
+    "DeadlineExceeded",
+    "TimeoutValue",
+    "deadline",
+    "timeouts",
+    "remaining",
+    "check_deadline",
+    "expired",
+    "current_timeout",
+    "clip_timeout",
+]
+
+
+# seconds for both phases or (connect, read)
+TimeoutValue = Union[float, Tuple[float, float]]
+
+_deadline: ContextVar[float | None] = ContextVar("paypyl_deadline", default=None)
+_timeout: ContextVar[TimeoutValue | None] = ContextVar("paypyl_timeout", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+def remaining() -> float | None:
+    at = _deadline.get()
+    return None if at is None else at - monotonic()
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def check_deadline() -> float | None:
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded("Deadline exceeded.")
+    return left
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[float]:
+    # a nested deadline can only shorten the one around it
+    at = monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        at = min(at, outer)
+
+    token = _deadline.set(at)
+    try:
+        yield at
+    finally:
+        _deadline.reset(token)
+
+
+def current_timeout() -> TimeoutValue | None:
+    return _timeout.get()
+
+
+@contextmanager
+def timeouts(value: TimeoutValue) -> Iterator[TimeoutValue]:
+    token = _timeout.set(value)
+    try:
+        yield value
+    finally:
+        _timeout.reset(token)
+
+
+def clip_timeout(value: TimeoutValue) -> tuple[float, float]:
+    # the socket timeouts never outlive the current deadline
+    connect, read = value if isinstance(value, tuple) else (value, value)
+    left = check_deadline()
+    if left is None:
+        return connect, read
+    return min(connect, left), min(read, left)
@@ -0,0 +1,133 @@
+from collections import OrderedDict
+from datetime import timedelta
+from threading import Lock, local
+from time import time
+import sqlite3
+
+
+__all__ = ["DedupStore", "MemoryDedupStore", "SQLiteDedupStore", "webhook_keys"]
+
+
+def webhook_keys(event_id: str, transmission_id: str | None = None) -> tuple[str, ...]:
+    # redeliveries keep the event id, the transmission id catches replays
+    if transmission_id is None:
+        return (f"event:{event_id}",)
+    return (f"event:{event_id}", f"transmission:{transmission_id}")
+
+
+class DedupStore:
+    ttl: timedelta
+
+    def seen(self, *keys: str) -> bool:
+        raise NotImplementedError
+
+    def add(self, *keys: str) -> bool:
+        raise NotImplementedError
+
+    def discard(self, *keys: str):
+        raise NotImplementedError
+
+
+class MemoryDedupStore(DedupStore):
+    maxsize: int
+
+    def __init__(self, *, ttl: timedelta = timedelta(days=3), maxsize: int = 100_000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, float] = OrderedDict()
+        self._lock = Lock()
+
+    def _expire(self, now: float):
+        entries = self._entries
+        while entries and (
+            next(iter(entries.values())) < now or len(entries) > self.maxsize
+        ):
+            entries.popitem(last=False)
+
+    def seen(self, *keys: str) -> bool:
+        now = time()
+        with self._lock:
+            self._expire(now)
+            return any(key in self._entries for key in keys)
+
+    def add(self, *keys: str) -> bool:
+        now = time()
+        with self._lock:
+            self._expire(now)
+            if any(key in self._entries for key in keys):
+                return False
+
+            expire_at = now + self.ttl.total_seconds()
+            for key in keys:
+                self._entries[key] = expire_at
+            return True
+
+    def discard(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+
+class SQLiteDedupStore(DedupStore):
+    path: str
+
+    def __init__(self, path: str, *, ttl: timedelta = timedelta(days=3)):
+        self.path = path
+        self.ttl = ttl
+        self._local = local()
+
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY, expire_at REAL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS seen_expire_at ON seen (expire_at)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite connections may not cross threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def seen(self, *keys: str) -> bool:
+        marks = ",".join("?" * len(keys))
+        row = (
+            self._connection()
+            .execute(
+                f"SELECT 1 FROM seen WHERE key IN ({marks}) AND expire_at > ? LIMIT 1",
+                (*keys, time()),
+            )
+            .fetchone()
+        )
+        return row is not None
+
+    def add(self, *keys: str) -> bool:
+        now = time()
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute("DELETE FROM seen WHERE expire_at <= ?", (now,))
+            marks = ",".join("?" * len(keys))
+            present = connection.execute(
+                f"SELECT 1 FROM seen WHERE key IN ({marks}) LIMIT 1", keys
+            ).fetchone()
+
+            if present is None:
+                expire_at = now + self.ttl.total_seconds()
+                connection.executemany(
+                    "INSERT INTO seen VALUES (?, ?)", [(key, expire_at) for key in keys]
+                )
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        connection.execute("COMMIT")
+        return present is None
+
+    def discard(self, *keys: str):
+        marks = ",".join("?" * len(keys))
+        self._connection().execute(f"DELETE FROM seen WHERE key IN ({marks})", keys)
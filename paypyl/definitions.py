@@ -1,7 +1,8 @@
-from typing import Optional, TypeVar, Generic, List
+from typing import Any, Optional, TypeVar, Generic, List, Mapping
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict, Field, AliasChoices
+from pydantic import BaseModel, ConfigDict, Field, AliasChoices, PrivateAttr
+from pydantic import model_validator
 
 from .types import *
 
@@ -20,6 +21,22 @@ class WebhookSignature(BaseModel):
     transmission_time: datetime = Field(
         validation_alias=AliasChoices("transmission_time", "PAYPAL-TRANSMISSION-TIME")
     )
+    _raw_transmission_time: str | None = PrivateAttr(None)
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def _keep_transmission_time(cls, data: Any, handler):
+        # the signed message uses the header verbatim, not a reformatted datetime
+        signature = handler(data)
+        if isinstance(data, Mapping):
+            for key in ("transmission_time", "PAYPAL-TRANSMISSION-TIME"):
+                if isinstance(data.get(key), str):
+                    signature._raw_transmission_time = data[key]
+        return signature
+
+    @property
+    def raw_transmission_time(self) -> str | None:
+        return self._raw_transmission_time
 
 
 class Link(BaseModel):
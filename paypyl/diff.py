@@ -0,0 +1,99 @@
+from typing import Any, Collection
+
+from pydantic import BaseModel
+
+from .update import Update
+
+
+__all__ = ["diff", "escape", "READ_ONLY"]
+
+
+# server managed fields, status changes go through the lifecycle actions
+READ_ONLY = frozenset(
+    {
+        "id",
+        "links",
+        "create_time",
+        "update_time",
+        "status",
+        "status_change_note",
+        "status_update_time",
+        "billing_info",
+        "plan_overridden",
+    }
+)
+
+
+def escape(key: str | int) -> str:
+    # RFC 6901, "~" has to go first
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _dump(model: BaseModel, exclude: Collection[str]) -> Any:
+    return _strip(model.model_dump(mode="json", exclude_none=True), exclude)
+
+
+def _strip(value: Any, exclude: Collection[str]) -> Any:
+    if isinstance(value, dict):
+        return {k: _strip(v, exclude) for k, v in value.items() if k not in exclude}
+    if isinstance(value, list):
+        return [_strip(v, exclude) for v in value]
+    return value
+
+
+def _size(ops: list[Update]) -> int:
+    return sum(len(op.model_dump_json(exclude_none=True)) for op in ops)
+
+
+def _diff(old: Any, new: Any, path: str, ops: list[Update]):
+    if old == new:
+        return
+
+    if isinstance(old, type(new)) and isinstance(new, (dict, list)):
+        nested: list[Update] = []
+        _diff_items(old, new, path, nested)
+        # one replace of the parent beats many small ops on its children
+        replace = Update.replace(path, new)
+        if not path or len(nested) < 2 or _size(nested) < _size([replace]):
+            ops.extend(nested)
+        else:
+            ops.append(replace)
+        return
+
+    ops.append(Update.replace(path, new))
+
+
+def _diff_items(old: Any, new: Any, path: str, ops: list[Update]):
+    if isinstance(old, dict):
+        for key in old:
+            if key not in new:
+                ops.append(Update.remove(f"{path}/{escape(key)}"))
+        for key, value in new.items():
+            if key in old:
+                _diff(old[key], value, f"{path}/{escape(key)}", ops)
+            else:
+                ops.append(Update.add(f"{path}/{escape(key)}", value))
+        return
+
+    common = min(len(old), len(new))
+    for i in range(common):
+        _diff(old[i], new[i], f"{path}/{i}", ops)
+    for i in range(common, len(new)):
+        ops.append(Update.add(f"{path}/{i}", new[i]))
+    # remove from the end so earlier indexes stay valid
+    for i in reversed(range(common, len(old))):
+        ops.append(Update.remove(f"{path}/{i}"))
+
+
+def diff(
+    old: BaseModel,
+    new: BaseModel,
+    /,
+    *,
+    exclude: Collection[str] = READ_ONLY,
+) -> list[Update]:
+    # the smallest list of ops turning `old` into `new`, empty when equal;
+    # fields set to None are removed, `exclude` applies at every depth
+    ops: list[Update] = []
+    _diff(_dump(old, exclude), _dump(new, exclude), "", ops)
+    return ops
@@ -0,0 +1,96 @@
+from typing import Any, Callable, Mapping, Type
+from functools import cached_property
+
+from pydantic_core import from_json
+
+from .resources import *
+from .views import View
+
+
+__all__ = ["Dispatcher", "TypedEvent", "RESOURCES"]
+
+
+RESOURCES: dict[str, Type[Resource]] = {
+    "subscription": Subscription,
+    "plan": Plan,
+    "product": Product,
+}
+
+
+class TypedEvent:
+    # event fields are read straight from the payload,
+    # `resource` is decoded into its class on first access
+    def __init__(self, event: Event | Mapping[str, Any] | bytes):
+        if isinstance(event, bytes):
+            event = from_json(event)
+
+        if isinstance(event, Event):
+            self.event = event
+            self._resource = event.resource
+        else:
+            self.event = View(Event, event)
+            self._resource = event.get("resource") or {}
+
+    def __getattr__(self, name: str):
+        if name == "event":
+            raise AttributeError(name)
+        return getattr(self.event, name)
+
+    @cached_property
+    def resource(self) -> Resource:
+        convert = RESOURCES.get(self.event.resource_type, Resource)
+        resource = self._resource
+        if isinstance(resource, Resource):
+            resource = resource.model_dump(exclude_unset=True)
+        return convert.model_validate(resource)
+
+    def __repr__(self):
+        return f"TypedEvent(id={self.event.id!r}, event_type={self.event.event_type!r})"
+
+
+Handler = Callable[[TypedEvent], Any]
+
+
+class Dispatcher:
+    handlers: dict[str, list[Handler]]
+
+    def __init__(self):
+        self.handlers = {}
+        self._table: dict[str, tuple[Handler, ...]] = {}
+
+    def register(self, pattern: str, handler: Handler, /):
+        assert "*" not in pattern[:-1], "only a trailing * wildcard is supported."
+        self.handlers.setdefault(pattern, []).append(handler)
+        self._table.clear()
+
+    def on(self, *patterns: str):
+        def decorator(handler: Handler) -> Handler:
+            for pattern in patterns:
+                self.register(pattern, handler)
+            return handler
+
+        return decorator
+
+    def _resolve(self, event_type: str) -> tuple[Handler, ...]:
+        # exact handlers first, then wildcards from the most specific prefix
+        matches = [*self.handlers.get(event_type, ())]
+        prefixes = sorted(
+            (pattern for pattern in self.handlers if pattern.endswith("*")),
+            key=len,
+            reverse=True,
+        )
+        for pattern in prefixes:
+            if event_type.startswith(pattern[:-1]):
+                matches.extend(self.handlers[pattern])
+        return tuple(matches)
+
+    def lookup(self, event_type: str) -> tuple[Handler, ...]:
+        try:
+            return self._table[event_type]
+        except KeyError:
+            handlers = self._table[event_type] = self._resolve(event_type)
+            return handlers
+
+    def dispatch(self, event: Event | Mapping[str, Any] | bytes) -> list[Any]:
+        event = TypedEvent(event)
+        return [handler(event) for handler in self.lookup(event.event_type)]
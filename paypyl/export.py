@@ -0,0 +1,217 @@
+from typing import IO, TYPE_CHECKING, Any, Iterable, Iterator, Literal, Sequence
+from os import replace
+from os.path import exists
+from itertools import islice
+from gzip import GzipFile
+from io import TextIOWrapper
+import csv
+import json
+
+from .throttle import prioritized
+
+if TYPE_CHECKING:
+    from .client import Client
+
+
+__all__ = ["export", "export_subscriptions", "FIELDS"]
+
+
+ExportFormat = Literal["ndjson", "csv"]
+
+FIELDS = {
+    "products": ["id", "name", "type", "category", "create_time", "update_time"],
+    "plans": ["id", "product_id", "name", "status", "create_time", "update_time"],
+    "subscriptions": [
+        "id",
+        "status",
+        "plan_id",
+        "custom_id",
+        "start_time",
+        "create_time",
+        "update_time",
+    ],
+}
+
+
+def _load_checkpoint(path: str | None) -> dict[str, int] | None:
+    if path is None or not exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _save_checkpoint(path: str, page: int, records: int, offset: int):
+    with open(path + ".tmp", "w") as f:
+        json.dump({"page": page, "records": records, "offset": offset}, f)
+    replace(path + ".tmp", path)
+
+
+def _cell(item: dict[str, Any], field: str):
+    value = item
+    for name in field.split("."):
+        value = value.get(name) if isinstance(value, dict) else None
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return value
+
+
+def _write_page(
+    raw: IO[bytes],
+    items: Sequence[dict[str, Any]],
+    *,
+    format: ExportFormat,
+    fields: Sequence[str],
+    header: bool,
+    compress: bool,
+):
+    # every page is a complete gzip member, so a file cut at a checkpoint
+    # offset is still valid and later pages can simply be appended
+    binary = GzipFile(fileobj=raw, mode="wb") if compress else raw
+    text = TextIOWrapper(binary, encoding="utf-8", newline="")
+
+    try:
+        if format == "csv":
+            writer = csv.writer(text)
+            if header:
+                writer.writerow(fields)
+            for item in items:
+                writer.writerow([_cell(item, field) for field in fields])
+        else:
+            for item in items:
+                text.write(json.dumps(item, separators=(",", ":")))
+                text.write("\n")
+        text.flush()
+    finally:
+        text.detach()
+        if compress:
+            binary.close()
+
+
+def _export_pages(
+    pages: Iterable[tuple[int, Sequence[dict[str, Any]]]],
+    output: str,
+    *,
+    format: ExportFormat,
+    fields: Sequence[str],
+    compress: bool,
+    checkpoint: str | None,
+    resumed: dict[str, int] | None,
+) -> int:
+    records = resumed["records"] if resumed else 0
+
+    with open(output, "r+b" if resumed else "wb") as raw:
+        if resumed:
+            # drop whatever was written after the last checkpoint
+            raw.truncate(resumed["offset"])
+            raw.seek(resumed["offset"])
+
+        for page, items in pages:
+            _write_page(
+                raw,
+                items,
+                format=format,
+                fields=fields,
+                header=page == 1 and not resumed,
+                compress=compress,
+            )
+            raw.flush()
+            records += len(items)
+
+            if checkpoint is not None:
+                _save_checkpoint(checkpoint, page, records, raw.tell())
+
+    return records
+
+
+def _options(output: str, format: ExportFormat | None, compress: bool | None):
+    name = output[:-3] if output.endswith(".gz") else output
+    if format is None:
+        format = "csv" if name.endswith(".csv") else "ndjson"
+    if compress is None:
+        compress = output.endswith(".gz")
+    return format, compress
+
+
+def export(
+    client: "Client",
+    collection: Literal["products", "plans"],
+    /,
+    output: str,
+    *,
+    format: ExportFormat | None = None,
+    compress: bool | None = None,
+    fields: Sequence[str] | None = None,
+    checkpoint: str | None = None,
+    page_size: int = 20,
+    prefetch: int = 4,
+    max_in_flight: int = 4,
+) -> int:
+    from .client import COLLECTIONS
+
+    format, compress = _options(output, format, compress)
+    endpoint, convert = COLLECTIONS[collection]
+    resumed = _load_checkpoint(checkpoint)
+
+    pages = (
+        (page, getattr(result, collection))
+        for page, result in client._pages(
+            endpoint,
+            page_size=page_size,
+            start_page=resumed["page"] + 1 if resumed else 1,
+            convert=convert,
+            prefetch=prefetch,
+            max_in_flight=max_in_flight,
+            mode="raw",
+        )
+    )
+
+    return _export_pages(
+        pages,
+        output,
+        format=format,
+        fields=fields or FIELDS[collection],
+        compress=compress,
+        checkpoint=checkpoint,
+        resumed=resumed,
+    )
+
+
+def _chunks(ids: Iterable[str], size: int, start: int) -> Iterator[tuple[int, list]]:
+    ids = islice(ids, (start - 1) * size, None)
+    page = start
+    while chunk := list(islice(ids, size)):
+        yield page, chunk
+        page += 1
+
+
+def export_subscriptions(
+    client: "Client",
+    ids: Iterable[str],
+    /,
+    output: str,
+    *,
+    format: ExportFormat | None = None,
+    compress: bool | None = None,
+    fields: Sequence[str] | None = None,
+    checkpoint: str | None = None,
+    page_size: int = 20,
+) -> int:
+    format, compress = _options(output, format, compress)
+    resumed = _load_checkpoint(checkpoint)
+    start = resumed["page"] + 1 if resumed else 1
+
+    pages = (
+        (page, [client.subscription_details(id, mode="raw") for id in chunk])
+        for page, chunk in _chunks(ids, page_size, start)
+    )
+
+    with prioritized("bulk"):
+        return _export_pages(
+            pages,
+            output,
+            format=format,
+            fields=fields or FIELDS["subscriptions"],
+            compress=compress,
+            checkpoint=checkpoint,
+            resumed=resumed,
+        )
@@ -0,0 +1,82 @@
+from typing import Awaitable, Callable, Hashable, TypeVar
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from asyncio import Task, create_task, shield, wait_for
+from functools import partial
+from threading import Lock
+
+from .deadline import DeadlineExceeded, check_deadline
+
+
+__all__ = ["SingleFlight", "AsyncSingleFlight"]
+
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    # concurrent calls with the same key wait for the first one
+    # and share its result (or exception)
+    def __init__(self):
+        self._calls: dict[Hashable, Future] = {}
+        self._lock = Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+
+        if not leader:
+            # a follower waits no longer than its own deadline
+            try:
+                return future.result(timeout=check_deadline())
+            except FutureTimeout as e:
+                # the leader's own timeout is shared like any other error
+                if not future.done():
+                    raise DeadlineExceeded("Deadline exceeded.") from e
+                raise
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def __len__(self):
+        return len(self._calls)
+
+
+class AsyncSingleFlight:
+    def __init__(self):
+        self._calls: dict[Hashable, Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            # the call runs in a task no caller owns, so cancelling
+            # any caller, the first one included, leaves the rest waiting
+            task = self._calls[key] = create_task(fn())
+            task.add_done_callback(partial(self._done, key))
+        try:
+            return await wait_for(shield(task), check_deadline())
+        except TimeoutError as e:
+            if not task.done():
+                raise DeadlineExceeded("Deadline exceeded.") from e
+            raise
+
+    def _done(self, key: Hashable, task: Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # nobody may be left to see the error once every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def __len__(self):
+        return len(self._calls)
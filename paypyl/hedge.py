@@ -0,0 +1,73 @@
+from collections import deque
+from threading import Lock
+
+from .throttle import endpoint_group
+
+
+__all__ = ["Hedge"]
+
+
+class Hedge:
+    # a GET still running after `delay` seconds gets a second request and
+    # the first good response wins; without a fixed delay the `percentile`
+    # of recent latencies for the endpoint group is used once known
+    delay: float | None
+    percentile: float
+    min_delay: float
+    min_samples: int
+    sent: int
+    won: int
+
+    def __init__(
+        self,
+        delay: float | None = None,
+        *,
+        percentile: float = 0.95,
+        min_delay: float = 0.05,
+        min_samples: int = 20,
+        window: int = 256,
+    ):
+        assert 0 < percentile < 1, "percentile must be in (0, 1)."
+        self.delay = delay
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.window = window
+        self.sent = 0
+        self.won = 0
+        self._samples: dict[str, deque[float]] = {}
+        self._lock = Lock()
+
+    def record(self, url: str, latency: float):
+        group = endpoint_group(url)
+        if group is None or self.delay is not None:
+            return
+
+        with self._lock:
+            samples = self._samples.get(group)
+            if samples is None:
+                samples = self._samples[group] = deque(maxlen=self.window)
+            samples.append(latency)
+
+    def delay_for(self, url: str) -> float | None:
+        # None means do not hedge
+        if self.delay is not None:
+            return self.delay
+
+        group = endpoint_group(url)
+        with self._lock:
+            samples = self._samples.get(group) if group else None
+            if not samples or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+
+        value = ordered[int(self.percentile * (len(ordered) - 1))]
+        return max(value, self.min_delay)
+
+    def count(self, won: bool):
+        with self._lock:
+            self.sent += 1
+            self.won += won
+
+    def stats(self) -> dict[str, int]:
+        return {"sent": self.sent, "won": self.won}
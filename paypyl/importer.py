@@ -0,0 +1,137 @@
+from typing import IO, TYPE_CHECKING, Any, Iterator, Literal
+from dataclasses import dataclass, field
+from logging import getLogger
+from os.path import exists, getsize
+from uuid import NAMESPACE_URL, uuid5
+import json
+
+from .bulk import bulk_map
+
+if TYPE_CHECKING:
+    from .client import Client
+
+
+__all__ = ["ImportResult", "import_catalog", "request_id"]
+
+
+logger = getLogger(__name__)
+
+NAMESPACE = uuid5(NAMESPACE_URL, "https://github.com/rostyq/paypyl/import")
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    skipped: int = 0
+    failed: list[int] = field(default_factory=list)
+
+
+def request_id(collection: str, record: dict[str, Any], namespace: str = "") -> str:
+    # the same record always maps to the same PayPal-Request-Id,
+    # so a create replayed after a crash returns the original resource
+    canonical = json.dumps(record, sort_keys=True, separators=(",", ":"))
+    return str(uuid5(NAMESPACE, f"{namespace}:{collection}:{canonical}"))
+
+
+def _load_journal(path: str | None) -> set[str]:
+    done = set()
+    if path is None or not exists(path):
+        return done
+
+    with open(path) as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)["request_id"])
+            except (ValueError, KeyError):
+                # a line torn by a crash, that record is simply retried
+                continue
+    return done
+
+
+def _open_journal(path: str) -> IO[str]:
+    # start on a fresh line if the last write was cut short
+    torn = False
+    if exists(path) and getsize(path):
+        with open(path, "rb") as f:
+            f.seek(-1, 2)
+            torn = f.read(1) != b"\n"
+
+    journal = open(path, "a")
+    if torn:
+        journal.write("\n")
+    return journal
+
+
+def _records(
+    source: str,
+    collection: str,
+    namespace: str,
+    done: set[str],
+    result: ImportResult,
+) -> Iterator[tuple[int, str, dict[str, Any]]]:
+    with open(source) as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+
+            try:
+                record = json.loads(line)
+            except ValueError:
+                logger.warning("Line %d is not valid JSON.", number)
+                result.failed.append(number)
+                continue
+
+            key = request_id(collection, record, namespace)
+            if key in done:
+                result.skipped += 1
+                continue
+
+            yield number, key, record
+
+
+def import_catalog(
+    client: "Client",
+    collection: Literal["products", "plans"],
+    /,
+    source: str,
+    *,
+    journal: str | None = None,
+    namespace: str = "",
+    max_concurrency: int = 8,
+    max_error_rate: float | None = None,
+) -> ImportResult:
+    from .client import COLLECTIONS
+
+    endpoint, convert = COLLECTIONS[collection]
+    result = ImportResult()
+    records = _records(source, collection, namespace, _load_journal(journal), result)
+
+    def create(item: tuple[int, str, dict[str, Any]]):
+        _, key, record = item
+        resource = convert.model_validate(record)
+        return client._create(endpoint, resource, request_id=key)
+
+    output = _open_journal(journal) if journal is not None else None
+    try:
+        for (number, key, _), created in bulk_map(
+            create,
+            records,
+            max_concurrency=max_concurrency,
+            max_error_rate=max_error_rate,
+        ):
+            if isinstance(created, Exception):
+                logger.warning("Line %d failed: %s", number, created)
+                result.failed.append(number)
+                continue
+
+            result.created += 1
+            if output is not None:
+                line = {"request_id": key, "id": created.id, "line": number}
+                output.write(json.dumps(line) + "\n")
+                output.flush()
+    finally:
+        if output is not None:
+            output.close()
+
+    result.failed.sort()
+    return result
@@ -0,0 +1,285 @@
+from typing import TYPE_CHECKING, Any, Iterable, Literal, Mapping, Type
+from datetime import datetime
+from threading import local
+import json
+import sqlite3
+
+from pydantic import BaseModel
+from pydantic_core import from_json
+
+from .events import TypedEvent
+from .resources import Plan, Product, Subscription
+from .types import DecodeMode
+from .views import View
+
+if TYPE_CHECKING:
+    from .client import Client
+
+
+__all__ = ["Mirror", "TABLES"]
+
+
+Collection = Literal["products", "plans", "subscriptions"]
+
+# collection -> (model, indexed columns besides id)
+TABLES: dict[str, tuple[Type[BaseModel], tuple[str, ...]]] = {
+    "products": (Product, ()),
+    "plans": (Plan, ("status", "product_id")),
+    "subscriptions": (Subscription, ("status", "plan_id", "custom_id")),
+}
+
+# webhook resource_type -> collection
+_RESOURCE_TYPES = {
+    "product": "products",
+    "plan": "plans",
+    "subscription": "subscriptions",
+}
+
+
+def _timestamp(value: Any) -> float | None:
+    # API timestamps come with and without fractions, compare them as numbers
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return datetime.fromisoformat(value).timestamp()
+
+
+class Mirror:
+    path: str
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = local()
+
+        with self._connection() as connection:
+            for table, (_, columns) in TABLES.items():
+                connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} (id TEXT PRIMARY KEY, "
+                    + "".join(f"{column} TEXT, " for column in columns)
+                    + "update_time REAL, data TEXT)"
+                )
+                for column in columns:
+                    connection.execute(
+                        f"CREATE INDEX IF NOT EXISTS {table}_{column} "
+                        f"ON {table} ({column})"
+                    )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS watermarks "
+                "(collection TEXT PRIMARY KEY, update_time REAL, synced_at REAL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def upsert(self, collection: Collection, items: Iterable[Mapping[str, Any]]) -> int:
+        # rows only move forward in update_time, so a late webhook or
+        # a stale page never overwrites a newer copy
+        _, columns = TABLES[collection]
+        names = ("id", *columns, "update_time", "data")
+        assignments = ", ".join(f"{name} = excluded.{name}" for name in names[1:])
+        sql = (
+            f"INSERT INTO {collection} ({', '.join(names)}) "
+            f"VALUES ({', '.join('?' * len(names))}) "
+            f"ON CONFLICT (id) DO UPDATE SET {assignments} "
+            f"WHERE {collection}.update_time IS NULL "
+            f"OR excluded.update_time >= {collection}.update_time"
+        )
+
+        changed = 0
+        connection = self._connection()
+        connection.execute("BEGIN")
+        try:
+            for item in items:
+                row = (
+                    item["id"],
+                    *(item.get(column) for column in columns),
+                    _timestamp(item.get("update_time")),
+                    json.dumps(item, separators=(",", ":")),
+                )
+                changed += connection.execute(sql, row).rowcount
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        connection.execute("COMMIT")
+        return changed
+
+    def watermark(self, collection: Collection) -> float | None:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT update_time FROM watermarks WHERE collection = ?",
+                (collection,),
+            )
+            .fetchone()
+        )
+        return row and row[0]
+
+    def sync(
+        self,
+        client: "Client",
+        collection: Literal["products", "plans"],
+        /,
+        *,
+        details: bool = False,
+        page_size: int = 20,
+        max_concurrency: int = 8,
+        overlap: float = 300.0,
+    ) -> int:
+        # list pages carry update_time, rows at or below the watermark of the
+        # last sync are skipped, only newer ones are written (and, with
+        # `details`, fetched in full)
+        from .client import COLLECTIONS
+
+        endpoint, convert = COLLECTIONS[collection]
+        started = datetime.now().timestamp()
+        watermark = self.watermark(collection)
+        latest = watermark
+        changed = 0
+
+        for _, result in client._pages(
+            endpoint, page_size=page_size, convert=convert, mode="raw"
+        ):
+            items = []
+            for item in getattr(result, collection):
+                updated = _timestamp(item.get("update_time"))
+                if watermark is None or updated is None or updated > watermark:
+                    items.append(item)
+                if updated is not None:
+                    latest = max(latest or updated, updated)
+            if not items:
+                continue
+
+            if details:
+                fetch_many = getattr(client, f"{collection[:-1]}_details_many")
+                fetched = fetch_many(
+                    [item["id"] for item in items],
+                    max_concurrency=max_concurrency,
+                    mode="raw",
+                )
+                # keep the summary when a details lookup failed
+                full = {id: r for id, r in fetched if not isinstance(r, Exception)}
+                items = [full.get(item["id"], item) for item in items]
+
+            changed += self.upsert(collection, items)
+
+        # a row changed on an already listed page during this sync may be
+        # older than the newest one seen, never move past the start of the
+        # sync (less `overlap` for clock skew)
+        if latest is not None:
+            latest = min(latest, started - overlap)
+            watermark = max(watermark or latest, latest)
+
+        self._connection().execute(
+            "INSERT OR REPLACE INTO watermarks VALUES (?, ?, ?)",
+            (collection, watermark, started),
+        )
+        return changed
+
+    def sync_subscriptions(
+        self,
+        client: "Client",
+        ids: Iterable[str],
+        /,
+        *,
+        max_concurrency: int = 8,
+    ) -> int:
+        # there is no list endpoint for subscriptions, known ids are refreshed
+        items = (
+            result
+            for _, result in client.subscription_details_many(
+                ids, max_concurrency=max_concurrency, mode="raw"
+            )
+            if not isinstance(result, Exception)
+        )
+        return self.upsert("subscriptions", items)
+
+    def apply_event(self, event: Any) -> int:
+        # takes what Dispatcher handlers get, an Event or the raw payload;
+        # the resource is stored as delivered, without decoding it
+        if not isinstance(event, TypedEvent):
+            event = TypedEvent(event)
+
+        collection = _RESOURCE_TYPES.get(event.resource_type)
+        resource = event._resource
+        if isinstance(resource, BaseModel):
+            resource = resource.model_dump(mode="json", exclude_unset=True)
+        if collection is None or not resource or "id" not in resource:
+            return 0
+
+        return self.upsert(collection, [resource])
+
+    def _decode(self, collection: Collection, data: str, mode: DecodeMode):
+        convert, _ = TABLES[collection]
+        if mode == "model":
+            return convert.model_validate_json(data)
+
+        data = from_json(data)
+        return data if mode == "raw" else View(convert, data)
+
+    def get(
+        self,
+        collection: Collection,
+        id: str,
+        /,
+        *,
+        mode: DecodeMode = "model",
+    ):
+        row = (
+            self._connection()
+            .execute(f"SELECT data FROM {collection} WHERE id = ?", (id,))
+            .fetchone()
+        )
+        return row and self._decode(collection, row[0], mode)
+
+    def _where(self, collection: Collection, filters: Mapping[str, Any]):
+        _, columns = TABLES[collection]
+        clauses, values = [], []
+        for column, value in filters.items():
+            if value is None:
+                continue
+            if column == "updated_after":
+                clauses.append("update_time > ?")
+                values.append(_timestamp(value))
+                continue
+
+            assert column in columns, f"{collection} has no index on {column}."
+            if isinstance(value, (list, tuple, set, frozenset)):
+                clauses.append(f"{column} IN ({','.join('?' * len(value))})")
+                values.extend(value)
+            else:
+                clauses.append(f"{column} = ?")
+                values.append(value)
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, values
+
+    def query(
+        self,
+        collection: Collection,
+        /,
+        *,
+        limit: int | None = None,
+        mode: DecodeMode = "model",
+        **filters: Any,
+    ) -> list:
+        # filters on the indexed columns, a list value matches any of them,
+        # e.g. query("subscriptions", status="ACTIVE", plan_id="P-1")
+        where, values = self._where(collection, filters)
+        sql = f"SELECT data FROM {collection}{where} ORDER BY id"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+
+        rows = self._connection().execute(sql, values)
+        return [self._decode(collection, data, mode) for data, in rows]
+
+    def count(self, collection: Collection, /, **filters: Any) -> int:
+        where, values = self._where(collection, filters)
+        sql = f"SELECT COUNT(*) FROM {collection}{where}"
+        return self._connection().execute(sql, values).fetchone()[0]
@@ -0,0 +1,185 @@
+from typing import Any, Mapping
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectTimeout
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import EmptyPoolError
+
+from .client import Client
+from .store import TokenStore, FileTokenStore
+from .throttle import Throttle
+
+
+__all__ = ["ClientPool"]
+
+
+class _PoolTimeout:
+    # requests never passes pool_timeout, wait for a pooled connection
+    # no longer than for a new one, the connect timeout is already
+    # clipped to the deadline
+    def urlopen(self, method, url, *args, **kwargs):
+        timeout = kwargs.get("timeout")
+        if kwargs.get("pool_timeout") is None and hasattr(timeout, "connect_timeout"):
+            kwargs["pool_timeout"] = timeout.connect_timeout
+        return super().urlopen(method, url, *args, **kwargs)
+
+
+class _HTTPConnectionPool(_PoolTimeout, HTTPConnectionPool):
+    pass
+
+
+class _HTTPSConnectionPool(_PoolTimeout, HTTPSConnectionPool):
+    pass
+
+
+class _BlockingAdapter(HTTPAdapter):
+    def __init__(self, max_connections: int):
+        super().__init__(pool_maxsize=max_connections, pool_block=True)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _HTTPConnectionPool,
+            "https": _HTTPSConnectionPool,
+        }
+
+    def send(self, request, *args, **kwargs):
+        try:
+            return super().send(request, *args, **kwargs)
+        except EmptyPoolError as e:
+            raise ConnectTimeout(e, request=request)
+
+
+class _Tenant:
+    __slots__ = ("client", "used_at")
+
+    def __init__(self, client: Client, used_at: float):
+        self.client = client
+        self.used_at = used_at
+
+
+class ClientPool:
+    # tenant clients share one session with at most `max_connections`
+    # sockets per host, callers wait for a free one instead of opening more;
+    # each tenant keeps its own token and Throttle, the least recently used
+    # tenants are closed past `max_tenants` or after `idle_timeout` seconds
+    session: Session
+    token_store: TokenStore
+    max_tenants: int
+    idle_timeout: float | None
+
+    def __init__(
+        self,
+        *,
+        sandbox: bool | None = None,
+        max_connections: int = 10,
+        max_tenants: int = 256,
+        idle_timeout: float | None = None,
+        token_store: TokenStore | None = None,
+        rates: Mapping[str, float | tuple[float, float]] | None = None,
+        concurrency: int | None = 4,
+        **options: Any,
+    ):
+        assert max_tenants >= 1, "max_tenants must be at least 1."
+        assert (
+            concurrency is None or concurrency < max_connections
+        ), "concurrency must leave connections for other tenants."
+        self.sandbox = sandbox
+        self.max_tenants = max_tenants
+        self.idle_timeout = idle_timeout
+        # one store for every tenant, the default keeps tokens on disk
+        # so evicted tenants come back without a new token request
+        self.token_store = token_store or FileTokenStore()
+        self.rates = rates
+        self.concurrency = concurrency
+        self.options = options
+
+        self.session = Session()
+        self.session.headers.update({"Content-Type": "application/json"})
+        self.session.mount("https://", _BlockingAdapter(max_connections))
+
+        self._tenants: OrderedDict[str, _Tenant] = OrderedDict()
+        self._lock = Lock()
+
+    def _create(self, client_id: str, client_secret: str) -> Client:
+        throttle = None
+        if self.rates is not None or self.concurrency is not None:
+            # per tenant and across endpoint groups, so a busy merchant
+            # cannot hold every connection
+            throttle = Throttle(self.rates, max_in_flight=self.concurrency)
+
+        return Client(
+            client_id=client_id,
+            client_secret=client_secret,
+            sandbox=self.sandbox,
+            token_store=self.token_store,
+            throttle=throttle,
+            session=self.session,
+            **self.options,
+        )
+
+    def _expired(self, now: float) -> list[Client]:
+        # under the lock, oldest tenants first
+        evicted = []
+        tenants = self._tenants
+        while tenants:
+            tenant = next(iter(tenants.values()))
+            idle = (
+                self.idle_timeout is not None
+                and now - tenant.used_at > self.idle_timeout
+            )
+            if not idle and len(tenants) <= self.max_tenants:
+                break
+            evicted.append(tenants.popitem(last=False)[1].client)
+        return evicted
+
+    def client(self, client_id: str, client_secret: str) -> Client:
+        now = monotonic()
+        with self._lock:
+            tenant = self._tenants.get(client_id)
+            if tenant is not None and tenant.client.client_secret != client_secret:
+                # rotated credentials, the old token is no longer ours
+                evicted = [self._tenants.pop(client_id).client]
+                tenant = None
+            else:
+                evicted = []
+
+            if tenant is None:
+                client = self._create(client_id, client_secret)
+                tenant = self._tenants[client_id] = _Tenant(client, now)
+            else:
+                self._tenants.move_to_end(client_id)
+                tenant.used_at = now
+
+            evicted.extend(self._expired(now))
+
+        # closing stops token renewal, the shared session stays open
+        for client in evicted:
+            client.close()
+        return tenant.client
+
+    def evict(self, client_id: str) -> bool:
+        with self._lock:
+            tenant = self._tenants.pop(client_id, None)
+        if tenant is None:
+            return False
+        tenant.client.close()
+        return True
+
+    def __len__(self) -> int:
+        return len(self._tenants)
+
+    def __contains__(self, client_id: str) -> bool:
+        return client_id in self._tenants
+
+    def close(self):
+        with self._lock:
+            tenants = [*self._tenants.values()]
+            self._tenants.clear()
+        for tenant in tenants:
+            tenant.client.close()
+        self.session.close()
@@ -0,0 +1,156 @@
+from typing import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from threading import Lock
+from time import monotonic
+from random import uniform
+
+from .deadline import remaining
+
+
+__all__ = [
+    "Retry",
+    "RetryBudget",
+    "Attempts",
+    "current_retry",
+    "retrying",
+    "parse_retry_after",
+]
+
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+_policy: ContextVar["Retry | None"] = ContextVar("paypyl_retry", default=None)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    # either delay-seconds or an HTTP-date
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max((at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+@dataclass(frozen=True)
+class Retry:
+    total: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 30.0
+    max_elapsed: float | None = 60.0
+    statuses: frozenset[int] = RETRY_STATUSES
+    methods: frozenset[str] = IDEMPOTENT_METHODS
+    retry_after: bool = True
+
+    def delay(self, attempt: int, retry_after: str | None = None) -> float:
+        if self.retry_after:
+            seconds = parse_retry_after(retry_after)
+            if seconds is not None:
+                return seconds
+
+        # full jitter, clients that failed together do not retry together
+        return uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+
+class RetryBudget:
+    # every request earns `ratio` of a retry and every retry spends one,
+    # so an outage cannot multiply the load by more than about 1 + ratio
+    capacity: float
+    ratio: float
+
+    def __init__(self, *, capacity: float = 10, ratio: float = 0.1):
+        self.capacity = capacity
+        self.ratio = ratio
+        self.balance = capacity
+        self._lock = Lock()
+
+    def deposit(self):
+        with self._lock:
+            self.balance = min(self.capacity, self.balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self.balance < 1:
+                return False
+            self.balance -= 1
+            return True
+
+
+class Attempts:
+    policy: Retry
+    budget: RetryBudget | None
+    idempotent: bool
+    attempt: int
+
+    def __init__(
+        self,
+        policy: Retry,
+        budget: RetryBudget | None = None,
+        *,
+        idempotent: bool,
+    ):
+        self.policy = policy
+        self.budget = budget
+        self.idempotent = idempotent
+        self.attempt = 0
+        self.start = monotonic()
+
+        if budget is not None:
+            budget.deposit()
+
+    def retry_in(
+        self, status: int | None = None, headers: Mapping[str, str] | None = None
+    ) -> float | None:
+        # seconds to wait before the next attempt or None to give up,
+        # `status` is None when the request failed without a response
+        policy = self.policy
+        if status is not None and status not in policy.statuses:
+            return None
+
+        if not self.idempotent or self.attempt >= policy.total:
+            return None
+
+        delay = policy.delay(self.attempt, headers and headers.get("Retry-After"))
+        if (
+            policy.max_elapsed is not None
+            and monotonic() - self.start + delay > policy.max_elapsed
+        ):
+            return None
+
+        # no point in sleeping past the caller's deadline
+        left = remaining()
+        if left is not None and delay >= left:
+            return None
+
+        if self.budget is not None and not self.budget.withdraw():
+            return None
+
+        self.attempt += 1
+        return delay
+
+
+def current_retry() -> Retry | None:
+    return _policy.get()
+
+
+@contextmanager
+def retrying(policy: Retry) -> Iterator[Retry]:
+    # overrides the client policy for calls made inside the block
+    token = _policy.set(policy)
+    try:
+        yield policy
+    finally:
+        _policy.reset(token)
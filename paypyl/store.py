@@ -0,0 +1,133 @@
+from typing import Iterator, Optional
+from os import environ, makedirs, replace, open as os_open, close as os_close
+from os import O_CREAT, O_RDWR, chmod, lstat
+from os.path import join
+from tempfile import gettempdir, NamedTemporaryFile
+from contextlib import contextmanager
+from datetime import datetime
+from hashlib import sha256
+from threading import Lock
+import json
+import stat
+
+try:
+    from fcntl import flock, LOCK_EX, LOCK_UN
+except ImportError:  # pragma: no cover
+    flock = None
+
+try:
+    from os import getuid
+except ImportError:  # pragma: no cover
+    getuid = None
+
+from .auth import AuthToken
+from .constants import TOKEN_STORE_KEY
+
+
+__all__ = ["TokenStore", "MemoryTokenStore", "FileTokenStore", "token_key"]
+
+
+def token_key(url: str, client_id: str | None, client_secret: str | None) -> str:
+    return sha256(f"{url}\0{client_id}\0{client_secret}".encode()).hexdigest()
+
+
+class TokenStore:
+    def load(self, key: str, /) -> Optional[AuthToken]:
+        raise NotImplementedError
+
+    def save(self, key: str, /, token: AuthToken):
+        raise NotImplementedError
+
+    @contextmanager
+    def lock(self, key: str, /) -> Iterator[None]:
+        yield
+
+
+class MemoryTokenStore(TokenStore):
+    tokens: dict[str, AuthToken]
+
+    def __init__(self):
+        self.tokens = {}
+        self._lock = Lock()
+
+    def load(self, key: str, /) -> Optional[AuthToken]:
+        return self.tokens.get(key)
+
+    def save(self, key: str, /, token: AuthToken):
+        self.tokens[key] = token
+
+    @contextmanager
+    def lock(self, key: str, /) -> Iterator[None]:
+        with self._lock:
+            yield
+
+
+def _default_path() -> str:
+    if path := environ.get(TOKEN_STORE_KEY):
+        return path
+    # the temp directory is already per user where there are no uids
+    suffix = "" if getuid is None else f"-{getuid()}"
+    return join(gettempdir(), f"paypyl{suffix}")
+
+
+def _check_private(path: str):
+    # another user could create the directory first and plant tokens in it
+    if getuid is None:
+        return
+
+    info = lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != getuid():
+        raise PermissionError(f"{path} is not a directory owned by the current user.")
+    if info.st_mode & 0o077:
+        chmod(path, 0o700)
+
+
+class FileTokenStore(TokenStore):
+    path: str
+
+    def __init__(self, path: str | None = None):
+        self.path = path or _default_path()
+        makedirs(self.path, mode=0o700, exist_ok=True)
+        _check_private(self.path)
+
+    def _file(self, key: str, suffix: str) -> str:
+        return join(self.path, f"{key}.{suffix}")
+
+    def load(self, key: str, /) -> Optional[AuthToken]:
+        try:
+            with open(self._file(key, "json")) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        return AuthToken(
+            type=data["type"],
+            value=data["value"],
+            expire_at=datetime.fromisoformat(data["expire_at"]),
+            renew_at=data["renew_at"] and datetime.fromisoformat(data["renew_at"]),
+        )
+
+    def save(self, key: str, /, token: AuthToken):
+        data = {
+            "type": token.type,
+            "value": token.value,
+            "expire_at": token.expire_at.isoformat(),
+            "renew_at": token.renew_at and token.renew_at.isoformat(),
+        }
+
+        # write next to the target and swap it in so readers never see a partial file
+        with NamedTemporaryFile("w", dir=self.path, delete=False) as f:
+            json.dump(data, f)
+        replace(f.name, self._file(key, "json"))
+
+    @contextmanager
+    def lock(self, key: str, /) -> Iterator[None]:
+        fd = os_open(self._file(key, "lock"), O_CREAT | O_RDWR, 0o600)
+        try:
+            if flock is not None:
+                flock(fd, LOCK_EX)
+            yield
+        finally:
+            if flock is not None:
+                flock(fd, LOCK_UN)
+            os_close(fd)
@@ -0,0 +1,368 @@
+from typing import Iterator, Mapping
+from asyncio import CancelledError, get_running_loop, sleep as async_sleep, wait_for
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Event, Lock
+from time import monotonic, sleep
+from urllib.parse import urlsplit
+import heapq
+
+from .deadline import DeadlineExceeded, check_deadline
+from .types import Priority
+
+
+__all__ = [
+    "TokenBucket",
+    "ConcurrencyLimit",
+    "Permit",
+    "Throttle",
+    "endpoint_group",
+    "current_priority",
+    "prioritized",
+]
+
+
+RANKS: dict[str, int] = {"interactive": 0, "bulk": 1}
+
+_priority: ContextVar[Priority | None] = ContextVar("paypyl_priority", default=None)
+
+
+def endpoint_group(url: str) -> str | None:
+    # "https://api-m.paypal.com/v1/billing/plans/P-1" -> "billing"
+    parts = urlsplit(url).path.strip("/").split("/")
+    return parts[1] if len(parts) > 1 and parts[0][:1] == "v" else None
+
+
+def current_priority() -> Priority:
+    return _priority.get() or "interactive"
+
+
+@contextmanager
+def prioritized(priority: Priority) -> Iterator[Priority]:
+    token = _priority.set(priority)
+    try:
+        yield priority
+    finally:
+        _priority.reset(token)
+
+
+def _within_deadline(delay: float) -> float:
+    # fail now rather than sleep past the deadline
+    left = check_deadline()
+    if left is not None and delay > left:
+        raise DeadlineExceeded("Deadline exceeded waiting for the rate limit.")
+    return delay
+
+
+class TokenBucket:
+    rate: float
+    burst: float
+    reserve: float
+
+    def __init__(self, rate: float, *, burst: float | None = None, reserve: float = 0):
+        # `reserve` tokens are kept for interactive calls, bulk calls
+        # only run while the bucket holds more than that
+        assert rate > 0, "rate must be positive."
+        self.rate = rate
+        self.burst = burst or max(rate, 1)
+        self.reserve = min(reserve, self.burst - 1)
+        self.tokens = self.burst
+        self.updated_at = monotonic()
+        self._lock = Lock()
+
+    def take(self, priority: Priority = "interactive") -> float:
+        # takes a token and returns 0, or returns how long to wait
+        need = 1 + (self.reserve if priority == "bulk" else 0)
+        with self._lock:
+            now = monotonic()
+            self.tokens = min(
+                self.burst, self.tokens + (now - self.updated_at) * self.rate
+            )
+            self.updated_at = now
+
+            if self.tokens >= need:
+                self.tokens -= 1
+                return 0
+            return (need - self.tokens) / self.rate
+
+
+class _Waiter:
+    __slots__ = ("grant", "granted", "cancelled")
+
+    def __init__(self, grant):
+        self.grant = grant
+        self.granted = False
+        self.cancelled = False
+
+
+class ConcurrencyLimit:
+    # a semaphore that serves interactive waiters before bulk ones and,
+    # when adaptive, adjusts its size with AIMD: +1/limit per success,
+    # halved on 429 or when latency goes over the target
+    limit: float
+    min_limit: int
+    max_limit: int
+    adaptive: bool
+    latency_target: float | None
+    cooldown: float
+
+    def __init__(
+        self,
+        limit: int,
+        *,
+        adaptive: bool = False,
+        min_limit: int = 1,
+        max_limit: int | None = None,
+        latency_target: float | None = None,
+        cooldown: float = 1.0,
+    ):
+        assert limit >= 1, "limit must be at least 1."
+        self.limit = limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit or limit * 4
+        self.adaptive = adaptive
+        self.latency_target = latency_target
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._waiters: list[tuple[int, int, _Waiter]] = []
+        self._counter = 0
+        self._decreased_at = 0.0
+        self._lock = Lock()
+
+    def _available(self) -> bool:
+        return self.in_flight < max(int(self.limit), 1)
+
+    def _grant(self):
+        waiters = self._waiters
+        while waiters and self._available():
+            _, _, waiter = heapq.heappop(waiters)
+            if waiter.cancelled:
+                continue
+            waiter.granted = True
+            self.in_flight += 1
+            waiter.grant()
+
+    def _enqueue(self, priority: Priority, grant) -> _Waiter | None:
+        # under the lock, None means the slot was taken right away
+        if not self._waiters and self._available():
+            self.in_flight += 1
+            return None
+
+        waiter = _Waiter(grant)
+        self._counter += 1
+        heapq.heappush(self._waiters, (RANKS[priority], self._counter, waiter))
+        return waiter
+
+    def _abandon(self, waiter: _Waiter):
+        with self._lock:
+            waiter.cancelled = True
+            granted = waiter.granted
+        # the slot may have been granted while we gave up
+        if granted:
+            self.release()
+
+    def acquire(self, priority: Priority = "interactive"):
+        left = check_deadline()
+        event = Event()
+        with self._lock:
+            waiter = self._enqueue(priority, event.set)
+        if waiter is None or event.wait(left):
+            return
+
+        self._abandon(waiter)
+        raise DeadlineExceeded("Deadline exceeded waiting for a request slot.")
+
+    async def acquire_async(self, priority: Priority = "interactive"):
+        loop = get_running_loop()
+        future = loop.create_future()
+
+        def grant():
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+        left = check_deadline()
+        with self._lock:
+            waiter = self._enqueue(priority, grant)
+        if waiter is None:
+            return
+
+        try:
+            await wait_for(future, left)
+        except TimeoutError as e:
+            self._abandon(waiter)
+            raise DeadlineExceeded(
+                "Deadline exceeded waiting for a request slot."
+            ) from e
+        except CancelledError:
+            self._abandon(waiter)
+            raise
+
+    def release(self, status: int | None = None, latency: float | None = None):
+        with self._lock:
+            self.in_flight -= 1
+            if self.adaptive:
+                self._adjust(status, latency)
+            self._grant()
+
+    def _adjust(self, status: int | None, latency: float | None):
+        slow = (
+            self.latency_target is not None
+            and latency is not None
+            and latency > self.latency_target
+        )
+        if status == 429 or slow:
+            # one decrease per cooldown, a burst of 429s is a single signal
+            now = monotonic()
+            if now - self._decreased_at >= self.cooldown:
+                self.limit = max(self.min_limit, self.limit / 2)
+                self._decreased_at = now
+        elif status is not None and status < 500:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+
+class Permit:
+    __slots__ = ("limit", "total", "start")
+
+    def __init__(
+        self, limit: ConcurrencyLimit | None, total: ConcurrencyLimit | None = None
+    ):
+        self.limit = limit
+        self.total = total
+        self.start = monotonic()
+
+    def release(self, status: int | None = None):
+        latency = monotonic() - self.start
+        if self.limit is not None:
+            self.limit.release(status, latency)
+        if self.total is not None:
+            self.total.release(status, latency)
+
+
+class Throttle:
+    rates: dict[str, tuple[float, float | None]]
+    concurrency: int | None
+    max_in_flight: int | None
+    adaptive: bool
+    latency_target: float | None
+    bulk_reserve: float
+
+    def __init__(
+        self,
+        rates: Mapping[str, float | tuple[float, float]] | None = None,
+        *,
+        concurrency: int | None = None,
+        max_in_flight: int | None = None,
+        adaptive: bool = False,
+        latency_target: float | None = None,
+        bulk_reserve: float = 0.2,
+    ):
+        # rates are requests per second per endpoint group ("catalogs",
+        # "billing", "notifications", "oauth2"), optionally (rate, burst);
+        # `concurrency` applies per group, `max_in_flight` across all of them;
+        # `bulk_reserve` is the share of each burst kept for interactive calls
+        self.rates = {
+            group: rate if isinstance(rate, tuple) else (rate, None)
+            for group, rate in (rates or {}).items()
+        }
+        self.concurrency = concurrency
+        self.max_in_flight = max_in_flight
+        self.adaptive = adaptive
+        self.latency_target = latency_target
+        self.bulk_reserve = bulk_reserve
+        self._buckets: dict[str, TokenBucket | None] = {}
+        self._limits: dict[str, ConcurrencyLimit | None] = {}
+        self._total = None if max_in_flight is None else ConcurrencyLimit(max_in_flight)
+        self._lock = Lock()
+
+    def _bucket(self, group: str) -> TokenBucket | None:
+        try:
+            return self._buckets[group]
+        except KeyError:
+            pass
+
+        with self._lock:
+            if group not in self._buckets:
+                rate = self.rates.get(group, self.rates.get("*"))
+                bucket = None
+                if rate is not None:
+                    burst = rate[1] or max(rate[0], 1)
+                    bucket = TokenBucket(
+                        rate[0], burst=burst, reserve=burst * self.bulk_reserve
+                    )
+                self._buckets[group] = bucket
+            return self._buckets[group]
+
+    def _limit(self, group: str) -> ConcurrencyLimit | None:
+        try:
+            return self._limits[group]
+        except KeyError:
+            pass
+
+        with self._lock:
+            if group not in self._limits:
+                limit = None
+                if self.concurrency is not None:
+                    limit = ConcurrencyLimit(
+                        self.concurrency,
+                        adaptive=self.adaptive,
+                        latency_target=self.latency_target,
+                    )
+                self._limits[group] = limit
+            return self._limits[group]
+
+    def _total_for(self, group: str) -> ConcurrencyLimit | None:
+        # token requests run inside a caller's request that already holds
+        # a slot, counting them again could wait on that caller forever
+        return None if group == "oauth2" else self._total
+
+    def acquire(self, url: str, priority: Priority | None = None) -> Permit:
+        group = endpoint_group(url)
+        if group is None:
+            return Permit(None)
+
+        priority = priority or current_priority()
+        if (bucket := self._bucket(group)) is not None:
+            while delay := bucket.take(priority):
+                sleep(_within_deadline(delay))
+
+        if (limit := self._limit(group)) is not None:
+            limit.acquire(priority)
+        if (total := self._total_for(group)) is not None:
+            try:
+                total.acquire(priority)
+            except BaseException:
+                if limit is not None:
+                    limit.release()
+                raise
+        return Permit(limit, total)
+
+    async def acquire_async(self, url: str, priority: Priority | None = None) -> Permit:
+        group = endpoint_group(url)
+        if group is None:
+            return Permit(None)
+
+        priority = priority or current_priority()
+        if (bucket := self._bucket(group)) is not None:
+            while delay := bucket.take(priority):
+                await async_sleep(_within_deadline(delay))
+
+        if (limit := self._limit(group)) is not None:
+            await limit.acquire_async(priority)
+        if (total := self._total_for(group)) is not None:
+            try:
+                await total.acquire_async(priority)
+            except BaseException:
+                if limit is not None:
+                    limit.release()
+                raise
+        return Permit(limit, total)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        stats = {
+            group: {"limit": limit.limit, "in_flight": limit.in_flight}
+            for group, limit in self._limits.items()
+            if limit is not None
+        }
+        if self._total is not None:
+            total = self._total
+            stats["*"] = {"limit": total.limit, "in_flight": total.in_flight}
+        return stats
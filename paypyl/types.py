@@ -2,6 +2,8 @@ from typing import Literal
 
 ProductType = Literal["SERVICE", "DIGITAL", "PHYSICAL"]
 PreferType = Literal["minimal", "representation"]
+DecodeMode = Literal["model", "lazy", "raw"]
+Priority = Literal["interactive", "bulk"]
 UpdateOp = Literal["add", "replace", "remove", "move", "copy", "test"]
 PlanStatus = Literal["ACTIVE", "INACTIVE", "CREATED"]
 TenureType = Literal["REGULAR", "TRIAL"]
@@ -1,3 +1,5 @@
+from typing import Any
+
 from pydantic import BaseModel, Field
 from .types import UpdateOp
 
@@ -5,11 +7,11 @@ from .types import UpdateOp
 class Update(BaseModel):
     op: UpdateOp
     path: str
-    value: str | None = None
+    value: Any = None
     ref: str | None = Field(None, validation_alias="from", serialization_alias="from")
 
     @classmethod
-    def add(cls, path: str, /, value: str) -> "Update":
+    def add(cls, path: str, /, value: Any) -> "Update":
         return cls(op="add", path=path, value=value)
 
     @classmethod
@@ -17,5 +19,5 @@ class Update(BaseModel):
         return cls(op="remove", path=path)
 
     @classmethod
-    def replace(cls, path: str, /, value: str) -> "Update":
+    def replace(cls, path: str, /, value: Any) -> "Update":
         return cls(op="replace", path=path, value=value)
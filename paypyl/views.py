@@ -0,0 +1,60 @@
+from typing import Any, Generic, Type
+from functools import lru_cache
+
+from pydantic import BaseModel, TypeAdapter
+
+from .definitions import R
+
+
+__all__ = ["View"]
+
+
+@lru_cache(maxsize=None)
+def _field_adapter(model: Type[BaseModel], name: str) -> TypeAdapter:
+    return TypeAdapter(model.model_fields[name].annotation)
+
+
+class View(Generic[R]):
+    # fields of `model` are validated on first access and then cached
+    __slots__ = ("_model", "_data", "_cache")
+
+    def __init__(self, model: Type[R], data: dict[str, Any]):
+        self._model = model
+        self._data = data
+        self._cache = {}
+
+    def __getattr__(self, name: str):
+        cache = self._cache
+        if name in cache:
+            return cache[name]
+
+        field = self._model.model_fields.get(name)
+        if field is None:
+            if self._model.model_config.get("extra") == "allow" and name in self._data:
+                return self._data[name]
+            raise AttributeError(name)
+
+        key = (
+            field.validation_alias if isinstance(field.validation_alias, str) else name
+        )
+        if key in self._data:
+            value = _field_adapter(self._model, name).validate_python(self._data[key])
+        else:
+            value = field.get_default(call_default_factory=True)
+
+        cache[name] = value
+        return value
+
+    def raw(self) -> dict[str, Any]:
+        return self._data
+
+    def model(self) -> R:
+        return self._model.model_validate(self._data)
+
+    def __repr__(self):
+        fields = ", ".join(
+            f"{name}={self._data[name]!r}"
+            for name, field in self._model.model_fields.items()
+            if field.repr and name in self._data
+        )
+        return f"View[{self._model.__name__}]({fields})"
@@ -0,0 +1,154 @@
+from typing import TYPE_CHECKING, Callable, Optional, Sequence
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit
+from threading import Lock
+from base64 import b64decode
+from zlib import crc32
+
+try:
+    from cryptography.x509 import load_pem_x509_certificate
+    from cryptography.hazmat.primitives.hashes import SHA256
+    from cryptography.hazmat.primitives.asymmetric.padding import PKCS1v15
+    from cryptography.exceptions import InvalidSignature as _InvalidSignature
+except ImportError:  # pragma: no cover
+    load_pem_x509_certificate = None
+
+from .constants import DOMAIN
+from .definitions import WebhookSignature
+
+if TYPE_CHECKING:
+    from cryptography.x509 import Certificate
+
+
+__all__ = [
+    "InvalidSignature",
+    "CertificateCache",
+    "transmission",
+    "verify_signature",
+]
+
+
+class InvalidSignature(AssertionError):
+    pass
+
+
+def _require_cryptography():
+    if load_pem_x509_certificate is None:
+        raise ImportError("Local webhook verification requires `cryptography`.")
+
+
+class CertificateCache:
+    maxsize: int
+    ttl: timedelta
+    domains: tuple[str, ...]
+    fetch: Optional[Callable[[str], bytes]]
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = 16,
+        ttl: timedelta = timedelta(hours=24),
+        domains: Sequence[str] = (DOMAIN,),
+        fetch: Optional[Callable[[str], bytes]] = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.domains = tuple(domains)
+        self.fetch = fetch
+        self._entries: OrderedDict[str, tuple[datetime, "Certificate"]] = OrderedDict()
+        self._lock = Lock()
+
+    def check_url(self, url: str):
+        parts = urlsplit(url)
+        host = parts.hostname or ""
+        allowed = any(host == d or host.endswith("." + d) for d in self.domains)
+        if parts.scheme != "https" or not allowed:
+            raise InvalidSignature(f"Certificate URL is not trusted: {url}")
+
+    def lookup(self, url: str) -> Optional["Certificate"]:
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+
+            expire_at, certificate = entry
+            if now > expire_at:
+                del self._entries[url]
+                return None
+
+            self._entries.move_to_end(url)
+            return certificate
+
+    def put(self, url: str, pem: bytes) -> "Certificate":
+        _require_cryptography()
+        self.check_url(url)
+
+        certificate = load_pem_x509_certificate(pem)
+        now = datetime.now(timezone.utc)
+        if (
+            not certificate.not_valid_before_utc
+            <= now
+            <= certificate.not_valid_after_utc
+        ):
+            raise InvalidSignature(f"Certificate is not valid at {now}: {url}")
+
+        expire_at = min(now + self.ttl, certificate.not_valid_after_utc)
+        with self._lock:
+            self._entries[url] = (expire_at, certificate)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return certificate
+
+    def get(self, url: str) -> "Certificate":
+        certificate = self.lookup(url)
+        if certificate is None:
+            self.check_url(url)
+            assert self.fetch is not None, "CertificateCache has no fetch function."
+            certificate = self.put(url, self.fetch(url))
+        return certificate
+
+
+def _transmission_time(signature: WebhookSignature) -> str:
+    if signature.raw_transmission_time is not None:
+        return signature.raw_transmission_time
+
+    value = signature.transmission_time.isoformat()
+    return value.replace("+00:00", "Z")
+
+
+def transmission(signature: WebhookSignature, webhook_id: str, body: bytes) -> bytes:
+    return "|".join(
+        (
+            signature.transmission_id,
+            _transmission_time(signature),
+            webhook_id,
+            str(crc32(body)),
+        )
+    ).encode()
+
+
+def verify_signature(
+    body: bytes,
+    /,
+    webhook_id: str,
+    signature: WebhookSignature,
+    certificate: "Certificate",
+):
+    _require_cryptography()
+
+    if signature.auth_algo != "SHA256withRSA":
+        raise InvalidSignature(f"Unsupported auth_algo: {signature.auth_algo}")
+
+    try:
+        certificate.public_key().verify(
+            b64decode(signature.transmission_sig),
+            transmission(signature, webhook_id, body),
+            PKCS1v15(),
+            SHA256(),
+        )
+    except (_InvalidSignature, ValueError) as e:
+        raise InvalidSignature("FAILURE") from e
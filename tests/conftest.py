@@ -0,0 +1,61 @@
+from json import dumps
+
+from pytest import fixture
+from requests import Response
+from requests.adapters import BaseAdapter
+
+from paypyl import Client
+from paypyl.store import MemoryTokenStore
+from paypyl.retry import Retry
+
+
+TOKEN = {
+    "scope": "",
+    "access_token": "token",
+    "token_type": "Bearer",
+    "app_id": "app",
+    "expires_in": 32400,
+    "nonce": "nonce",
+}
+
+
+class FakeAdapter(BaseAdapter):
+    def __init__(self, handler):
+        super().__init__()
+        self.handler = handler
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+
+        if request.path_url.startswith("/v1/oauth2/token"):
+            status, body = 200, TOKEN
+        else:
+            status, body = self.handler(request)
+
+        response = Response()
+        response.status_code = status
+        response._content = dumps(body).encode() if body is not None else b""
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
+
+
+@fixture
+def fake():
+    def mount(handler) -> tuple[Client, FakeAdapter]:
+        client = Client(
+            client_id="test_client_id",
+            client_secret="test_client_secret",
+            sandbox=True,
+            token_store=MemoryTokenStore(),
+            retry=Retry(backoff=0),
+        )
+        adapter = FakeAdapter(handler)
+        client.session.mount("https://", adapter)
+        return client, adapter
+
+    return mount
@@ -0,0 +1,113 @@
+from asyncio import gather, run
+
+from httpx import MockTransport, Response
+from pytest import fixture
+
+from paypyl import AsyncClient
+from paypyl.store import MemoryTokenStore
+
+from .conftest import TOKEN
+
+
+@fixture
+def requests():
+    return []
+
+
+@fixture
+def client(requests):
+    def handler(request):
+        requests.append(request)
+        path = request.url.path
+
+        if path == "/v1/oauth2/token":
+            return Response(200, json=TOKEN)
+
+        if path == "/v1/billing/plans":
+            page = int(request.url.params["page"])
+            plans = [
+                {"id": f"P-{page}-{i}", "product_id": "PROD", "name": "plan"}
+                for i in range(2)
+            ]
+            return Response(200, json={"plans": plans, "total_pages": 3})
+
+        if path.startswith("/v1/billing/plans/"):
+            plan_id = path.rsplit("/", 1)[-1]
+            return Response(
+                200, json={"id": plan_id, "product_id": "PROD", "name": "plan"}
+            )
+
+        return Response(404)
+
+    return AsyncClient(
+        client_id="test_client_id",
+        client_secret="test_client_secret",
+        sandbox=True,
+        token_store=MemoryTokenStore(),
+        transport=MockTransport(handler),
+    )
+
+
+def test_concurrent_details_share_token(client, requests):
+    async def main():
+        async with client:
+            return await gather(*(client.plan_details(f"P-{i}") for i in range(10)))
+
+    plans = run(main())
+
+    assert [plan.id for plan in plans] == [f"P-{i}" for i in range(10)]
+    tokens = [r for r in requests if r.url.path == "/v1/oauth2/token"]
+    assert len(tokens) == 1
+    assert requests[-1].headers["Authorization"] == "Bearer token"
+
+
+def test_iter_plans(client):
+    async def main():
+        async with client:
+            return [plan.id async for plan in client.iter_plans(page_size=2)]
+
+    assert run(main()) == [f"P-{page}-{i}" for page in range(1, 4) for i in range(2)]
+
+
+def test_concurrent_details_are_coalesced(client, requests):
+    from paypyl.flight import AsyncSingleFlight
+
+    client.flight = AsyncSingleFlight()
+
+    async def main():
+        async with client:
+            return await gather(*(client.plan_details("P-1") for _ in range(10)))
+
+    plans = run(main())
+
+    assert {plan.id for plan in plans} == {"P-1"}
+    details = [r for r in requests if r.url.path == "/v1/billing/plans/P-1"]
+    assert len(details) == 1
+
+
+def test_cancelled_leader_keeps_followers():
+    from asyncio import CancelledError, create_task, sleep
+    from paypyl.flight import AsyncSingleFlight
+
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await sleep(0.01)
+        return "plan"
+
+    async def main():
+        leader = create_task(flight.do("P-1", fetch))
+        await sleep(0)
+        follower = create_task(flight.do("P-1", fetch))
+        await sleep(0)
+        leader.cancel()
+        try:
+            await leader
+        except CancelledError:
+            pass
+        return await follower
+
+    assert run(main()) == "plan"
+    assert len(calls) == 1
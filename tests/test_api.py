@@ -0,0 +1,160 @@
+from json import dumps
+from threading import Event
+from time import monotonic, sleep
+
+from fastapi.testclient import TestClient
+from pytest import fixture
+
+import api
+from api.worker import WebhookJob, WebhookQueue
+from paypyl.dedup import MemoryDedupStore
+from paypyl.events import Dispatcher
+from paypyl.resources import Event as WebhookEvent
+
+
+EVENT = {
+    "id": "WH-1",
+    "create_time": "2023-01-01T00:00:00Z",
+    "resource_type": "subscription",
+    "event_version": "1.0",
+    "event_type": "BILLING.SUBSCRIPTION.ACTIVATED",
+    "summary": "Subscription activated",
+    "resource_version": "2.0",
+    "resource": {"id": "I-1", "status": "ACTIVE"},
+}
+
+HEADERS = {
+    "paypal-auth-algo": "SHA256withRSA",
+    "paypal-cert-url": "https://api.sandbox.paypal.com/v1/notifications/certs/CERT-1",
+    "paypal-transmission-id": "T-1",
+    "paypal-transmission-sig": "c2ln",
+    "paypal-transmission-time": "2023-01-01T00:00:00Z",
+}
+
+
+class FakePayPyl:
+    def __init__(self):
+        self.verified = []
+
+    def verify_event(self, webhook_id, signature, event, *, body=None):
+        self.verified.append(body)
+        return event
+
+
+@fixture
+def app(monkeypatch):
+    monkeypatch.setattr(api, "dedup", MemoryDedupStore())
+    monkeypatch.setattr(api, "dispatcher", Dispatcher())
+    monkeypatch.setattr(api, "webhooks", None)
+    api.app.state.paypyl = FakePayPyl()
+    # without `with`, the lifespan and its real client do not run
+    return TestClient(api.app, raise_server_exceptions=False)
+
+
+def test_failed_delivery_is_redelivered(app):
+    handled = []
+
+    @api.dispatcher.on("BILLING.SUBSCRIPTION.*")
+    def handle(event):
+        handled.append(event.id)
+        if len(handled) == 1:
+            raise RuntimeError("handler failed")
+
+    body = dumps(EVENT)
+    assert app.post("/webhook", content=body, headers=HEADERS).status_code == 500
+    assert app.post("/webhook", content=body, headers=HEADERS).status_code == 200
+    assert app.post("/webhook", content=body, headers=HEADERS).status_code == 200
+    assert handled == ["WH-1", "WH-1"]
+
+
+def test_verifies_raw_body(app, monkeypatch):
+    body = dumps(EVENT)
+    app.post("/webhook", content=body, headers=HEADERS)
+
+    monkeypatch.setenv(api.WEBHOOK_VERIFY_KEY, "remote")
+    headers = {**HEADERS, "paypal-transmission-id": "T-2"}
+    app.post("/webhook", content=dumps({**EVENT, "id": "WH-2"}), headers=headers)
+
+    assert api.app.state.paypyl.verified == [body.encode(), None]
+
+
+def taken(queue: WebhookQueue):
+    # wait for the worker to pick up what is queued
+    while queue.queue.qsize():
+        sleep(0.001)
+
+
+def test_queued_webhooks(app, monkeypatch):
+    release, handled = Event(), []
+
+    def handle(job):
+        release.wait(5)
+        handled.append(job.event.id)
+
+    queue = WebhookQueue(handle, workers=1, maxsize=1)
+    monkeypatch.setattr(api, "webhooks", queue)
+    queue.start()
+
+    def post(i):
+        headers = {**HEADERS, "paypal-transmission-id": f"T-{i}"}
+        body = dumps({**EVENT, "id": f"WH-{i}"})
+        return app.post("/webhook", content=body, headers=headers)
+
+    # acknowledged before it is processed
+    assert post(0).status_code == 200
+    taken(queue)
+    assert post(1).status_code == 200
+
+    response = post(2)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
+    assert handled == []
+
+    release.set()
+    queue.stop(timeout=5)
+    assert handled == ["WH-0", "WH-1"]
+
+
+def test_queued_failures_retried(app, monkeypatch):
+    handled, dead = [], []
+
+    @api.dispatcher.on("BILLING.SUBSCRIPTION.*")
+    def handle(event):
+        handled.append(event.id)
+        if event.id == "WH-2" or len(handled) == 1:
+            raise RuntimeError("handler failed")
+
+    paypyl = api.app.state.paypyl
+    queue = WebhookQueue(
+        lambda job: api.process_webhook(paypyl, job),
+        workers=1,
+        max_attempts=2,
+        dead_letter=dead.append,
+    )
+    monkeypatch.setattr(api, "webhooks", queue)
+    queue.start()
+
+    for i in (1, 2):
+        headers = {**HEADERS, "paypal-transmission-id": f"T-{i}"}
+        body = dumps({**EVENT, "id": f"WH-{i}"})
+        assert app.post("/webhook", content=body, headers=headers).status_code == 200
+
+    queue.queue.join()
+    queue.stop(timeout=5)
+    assert sorted(handled) == ["WH-1", "WH-1", "WH-2", "WH-2"]
+    assert [(job.event.id, job.attempts) for job in dead] == [("WH-2", 2)]
+
+
+def test_stop_with_full_queue():
+    release = Event()
+    queue = WebhookQueue(lambda job: release.wait(5), workers=1, maxsize=1)
+    queue.start()
+    job = WebhookJob(body=b"", signature={}, event=WebhookEvent(**EVENT))
+    queue.submit(job)
+    taken(queue)
+    queue.submit(job)
+
+    start = monotonic()
+    queue.stop(timeout=0.1)
+    assert monotonic() - start < 1
+    release.set()
@@ -1,7 +1,8 @@
 from os import environ
-from pytest import fixture
+from pytest import fixture, raises
 
 from paypyl import Client
+from paypyl.store import MemoryTokenStore, FileTokenStore
 
 
 @fixture
@@ -16,4 +17,114 @@ def client_secret():
 
 @fixture
 def client():
-    return Client(sandbox=True)
+    return Client(sandbox=True, token_store=MemoryTokenStore())
+
+
+@fixture
+def token_result():
+    from datetime import timedelta
+
+    from paypyl.responses import TokenResult
+
+    return TokenResult(
+        scope="",
+        access_token="token",
+        token_type="Bearer",
+        app_id="app",
+        expires_in=timedelta(hours=9),
+        nonce="nonce",
+    )
+
+
+def test_refresh_single_flight(client, token_result, monkeypatch):
+    from time import sleep
+    from datetime import datetime
+    from concurrent.futures import ThreadPoolExecutor
+
+    calls = []
+
+    def request_access_token(**kwargs):
+        calls.append(kwargs)
+        sleep(0.05)
+        return token_result
+
+    monkeypatch.setattr(client, "request_access_token", request_access_token)
+
+    with ThreadPoolExecutor(8) as pool:
+        tokens = [
+            *pool.map(lambda _: client.auth.update_token(datetime.now()), range(8))
+        ]
+
+    assert tokens == ["token"] * 8
+    assert len(calls) == 1
+
+
+def test_renew_before_expiry(client, token_result, monkeypatch):
+    from datetime import datetime, timedelta
+
+    monkeypatch.setattr(client, "request_access_token", lambda **_: token_result)
+    client.auth.renew = 0.5
+    client.auth.update_token(datetime.now())
+
+    token = client.auth.token
+    assert token.renew_at - datetime.now() < timedelta(hours=5)
+    assert client.auth.renewer.is_alive()
+
+    client.close()
+    assert client.auth.renewer is None
+
+
+def test_file_store_shared(tmp_path, token_result, monkeypatch):
+    from datetime import datetime
+
+    calls = []
+
+    def request_access_token(**kwargs):
+        calls.append(kwargs)
+        return token_result
+
+    clients = [
+        Client(sandbox=True, token_store=FileTokenStore(str(tmp_path)))
+        for _ in range(3)
+    ]
+    for client in clients:
+        monkeypatch.setattr(client, "request_access_token", request_access_token)
+        assert client.auth.update_token(datetime.now()) == "token"
+
+    assert len(calls) == 1
+
+
+def test_file_store_private(tmp_path):
+    import os
+
+    shared = tmp_path / "shared"
+    shared.mkdir(mode=0o777)
+    shared.chmod(0o777)
+    FileTokenStore(str(shared))
+    assert shared.stat().st_mode & 0o777 == 0o700
+
+    # a link planted in place of the directory is refused
+    link = tmp_path / "link"
+    os.symlink(shared, link)
+    with raises(PermissionError):
+        FileTokenStore(str(link))
+
+
+def test_failed_init_closes_cleanly(monkeypatch):
+    import gc
+    import sys
+
+    import paypyl.client
+
+    def refuse():
+        raise PermissionError("not private")
+
+    unraisable = []
+    monkeypatch.setattr(paypyl.client, "FileTokenStore", refuse)
+    monkeypatch.setattr(sys, "unraisablehook", unraisable.append)
+
+    with raises(PermissionError):
+        Client(sandbox=True)
+    gc.collect()
+
+    assert unraisable == []
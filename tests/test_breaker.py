@@ -0,0 +1,96 @@
+from time import sleep
+
+from pytest import raises
+from requests.exceptions import ConnectionError
+
+from paypyl.breaker import CircuitBreaker, CircuitOpen
+from paypyl.deadline import DeadlineExceeded
+
+URL = "https://api-m.sandbox.paypal.com/v1/billing/plans/P-1"
+
+
+def test_opens_and_recovers():
+    breaker = CircuitBreaker(min_calls=4, open_for=0.05, probes=2)
+
+    for status in (200, 503, None, 503):
+        breaker.before(URL)
+        breaker.after(URL, status)
+    assert breaker.state("billing") == "open"
+
+    with raises(CircuitOpen):
+        breaker.before(URL)
+
+    sleep(0.06)
+    breaker.before(URL)
+    breaker.before(URL)
+    with raises(CircuitOpen):
+        breaker.before(URL)
+    assert breaker.state("billing") == "half_open"
+
+    breaker.after(URL, 200)
+    breaker.after(URL, 200)
+    assert breaker.state("billing") == "closed"
+    assert breaker.state("catalogs") == "closed"
+
+
+def test_failed_probe_reopens():
+    breaker = CircuitBreaker(min_calls=1, open_for=0.01, probes=1)
+    breaker.before(URL)
+    breaker.after(URL, 500)
+
+    sleep(0.02)
+    breaker.before(URL)
+    breaker.after(URL, 502)
+
+    assert breaker.state("billing") == "open"
+
+
+def test_client_fails_fast(fake):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return 503, {"name": "SERVICE_UNAVAILABLE"}
+
+    client, _ = fake(handler)
+    client.breaker = CircuitBreaker(min_calls=2)
+
+    with raises(CircuitOpen):
+        client.plan_details("P-1")
+
+    assert len(calls) == 2
+
+
+def test_cancel_frees_probe():
+    breaker = CircuitBreaker(min_calls=2, open_for=0, probes=1)
+    for _ in range(2):
+        breaker.before(URL)
+        breaker.after(URL, 503)
+
+    breaker.before(URL)
+    breaker.cancel(URL)
+    breaker.before(URL)
+    assert breaker.state("billing") == "half_open"
+    breaker.after(URL, 200)
+    assert breaker.state("billing") == "closed"
+
+
+def test_only_network_errors_count(fake):
+    error = DeadlineExceeded
+
+    def handler(request):
+        raise error("no response")
+
+    client, _ = fake(handler)
+    client.breaker = CircuitBreaker(min_calls=2)
+
+    # a local error says nothing about the service
+    for _ in range(3):
+        with raises(DeadlineExceeded):
+            client.plan_details("P-1")
+    assert client.breaker.state("billing") == "closed"
+
+    error = ConnectionError
+    with raises((ConnectionError, CircuitOpen)):
+        client.plan_details("P-1")
+    assert client.breaker.state("billing") == "open"
@@ -0,0 +1,103 @@
+from asyncio import run
+from threading import Lock
+from time import sleep
+
+from paypyl.bulk import bulk_map, async_bulk_map
+from paypyl.throttle import current_priority
+
+
+def test_bulk_map_bounds_concurrency_and_reports_errors():
+    lock = Lock()
+    running = [0, 0]
+
+    def work(n):
+        assert current_priority() == "bulk"
+        with lock:
+            running[0] += 1
+            running[1] = max(running)
+        sleep(0.01)
+        with lock:
+            running[0] -= 1
+        if n % 5 == 0:
+            raise ValueError(n)
+        return n * 2
+
+    results = dict(bulk_map(work, range(20), max_concurrency=3))
+
+    assert running[1] <= 3
+    assert sorted(results) == list(range(20))
+    assert isinstance(results[5], ValueError)
+    assert results[3] == 6
+
+
+def test_async_bulk_map():
+    async def work(n):
+        if n == 2:
+            raise KeyError(n)
+        return n
+
+    async def main():
+        return [item async for item in async_bulk_map(work, range(5))]
+
+    results = dict(run(main()))
+
+    assert isinstance(results.pop(2), KeyError)
+    assert results == {0: 0, 1: 1, 3: 3, 4: 4}
+
+
+def test_subscription_details_many(fake):
+    def handler(request):
+        id = request.path_url.split("?")[0].rsplit("/", 1)[-1]
+        if id == "I-404":
+            return 404, {"name": "RESOURCE_NOT_FOUND"}
+        return 200, {"id": id, "status": "ACTIVE", "plan_id": "P-1"}
+
+    client, _ = fake(handler)
+    ids = ["I-1", "I-2", "I-404", "I-3"]
+
+    results = dict(client.subscription_details_many(ids, ["plan"], max_concurrency=2))
+
+    assert sorted(results) == sorted(ids)
+    assert results["I-2"].status == "ACTIVE"
+    assert results["I-404"].response.status_code == 404
+
+
+def test_bulk_map_stops_on_error_rate():
+    from pytest import raises
+    from paypyl.bulk import BulkAborted
+
+    def work(n):
+        raise ValueError(n)
+
+    results = []
+    with raises(BulkAborted):
+        for item in bulk_map(
+            work, range(1000), max_concurrency=2, max_error_rate=0.5, min_items=4
+        ):
+            results.append(item)
+
+    assert 4 <= len(results) <= 6
+
+
+def test_cancel_subscriptions(fake):
+    from json import loads
+
+    posts = []
+
+    def handler(request):
+        posts.append(request)
+        return 204, None
+
+    client, _ = fake(handler)
+    items = {"I-1": "moved", "I-2": None}
+
+    dry = dict(client.cancel_subscriptions(items, dry_run=True))
+    assert dry == {"I-1": None, "I-2": None}
+    assert not posts
+
+    results = dict(client.cancel_subscriptions(items, "default"))
+
+    assert results == {"I-1": None, "I-2": None}
+    reasons = {r.path_url.split("/")[-2]: loads(r.body)["reason"] for r in posts}
+    assert reasons == {"I-1": "moved", "I-2": "default"}
+    assert len({r.headers["PayPal-Request-Id"] for r in posts}) == 2
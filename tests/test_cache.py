@@ -0,0 +1,62 @@
+from pytest import fixture
+
+from paypyl.cache import DetailsCache, MemoryBackend, SQLiteBackend
+
+
+@fixture(params=["memory", "sqlite"])
+def cache(request, tmp_path):
+    if request.param == "memory":
+        backend = MemoryBackend(maxsize=2)
+    else:
+        backend = SQLiteBackend(str(tmp_path / "cache.sqlite"))
+    return DetailsCache(ttl={"plans": 60, "subscriptions": 0}, backend=backend)
+
+
+def plan(request):
+    plan_id = request.path_url.split("/")[4]
+    return 200, {"id": plan_id, "product_id": "PROD", "name": "plan"}
+
+
+def test_details_cached_until_invalidated(fake, cache):
+    client, adapter = fake(plan)
+    client.cache = cache
+
+    assert client.plan_details("P-1").id == "P-1"
+    assert client.plan_details("P-1", mode="raw")["id"] == "P-1"
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+    client.activate_plan("P-1")
+    client.plan_details("P-1")
+
+    gets = [r for r in adapter.requests if r.method == "GET"]
+    assert len(gets) == 2
+    assert cache.stats() == {"hits": 1, "misses": 2}
+
+
+def test_memory_backend_lru():
+    backend = MemoryBackend(maxsize=2)
+    for key in "abc":
+        backend.set(key, "", b"value", expire_at=float("inf"))
+
+    assert backend.get("a", "") is None
+    assert backend.get("c", "") == b"value"
+    assert len(backend) == 2
+
+
+def test_fill_dropped_after_invalidation(fake, cache):
+    def racing(request):
+        # the plan is updated while its details are on the wire
+        if request.method == "GET" and not cache.generation(request.url):
+            cache.invalidate(request.url)
+        return plan(request)
+
+    client, adapter = fake(racing)
+    client.cache = cache
+
+    client.plan_details("P-1")
+    client.plan_details("P-1")
+    client.plan_details("P-1")
+
+    gets = [r for r in adapter.requests if r.method == "GET"]
+    assert len(gets) == 2
+    assert cache.stats() == {"hits": 1, "misses": 2}
@@ -0,0 +1,166 @@
+from json import dumps
+from time import sleep
+from urllib.parse import urlsplit, parse_qs
+
+from .conftest import TOKEN
+
+
+def plans_page(request, total_pages=5, page_size=3):
+    page = int(parse_qs(urlsplit(request.url).query)["page"][0])
+    plans = [
+        {"id": f"P-{page}-{i}", "product_id": "PROD", "name": "plan"}
+        for i in range(page_size)
+    ]
+    # later pages answer first to make sure order is kept
+    sleep(0.01 * (total_pages - page))
+    return 200, {
+        "plans": plans,
+        "total_items": total_pages * page_size,
+        "total_pages": total_pages,
+    }
+
+
+def test_iter_plans_walks_every_page(fake):
+    client, adapter = fake(plans_page)
+
+    ids = [plan.id for plan in client.iter_plans(page_size=3, max_in_flight=3)]
+
+    assert ids == [f"P-{page}-{i}" for page in range(1, 6) for i in range(3)]
+    pages = [r for r in adapter.requests if "/v1/billing/plans" in r.url]
+    assert len(pages) == 5
+
+
+def test_iter_plans_sequential(fake):
+    client, adapter = fake(plans_page)
+
+    ids = [plan.id for plan in client.iter_plans(page_size=3, prefetch=0)]
+
+    assert ids == [f"P-{page}-{i}" for page in range(1, 6) for i in range(3)]
+
+
+def subscription(request):
+    return 200, {
+        "id": "I-1",
+        "status": "ACTIVE",
+        "plan_id": "P-1",
+        "billing_info": {
+            "failed_payments_count": 0,
+            "outstanding_balance": {"currency_code": "USD", "value": "0.00"},
+        },
+    }
+
+
+def test_subscription_details_modes(fake):
+    from paypyl.views import View
+    from paypyl.definitions import BillingInfo
+
+    client, _ = fake(subscription)
+
+    raw = client.subscription_details("I-1", mode="raw")
+    assert raw["plan_id"] == "P-1"
+
+    view = client.subscription_details("I-1", mode="lazy")
+    assert isinstance(view, View)
+    assert view.status == "ACTIVE"
+    assert view.shipping_amount is None
+    assert isinstance(view.billing_info, BillingInfo)
+    assert view.billing_info is view.billing_info
+    assert view.model() == client.subscription_details("I-1")
+
+
+def test_list_plans_raw(fake):
+    client, _ = fake(plans_page)
+
+    result = client.list_plans(page=2, mode="raw")
+
+    assert result.total_pages == 5
+    assert result.plans[0]["id"] == "P-2-0"
+
+
+def test_iter_columns(fake):
+    def handler(request):
+        status, body = plans_page(request, total_pages=3, page_size=2)
+        for plan in body["plans"]:
+            plan.update(status="ACTIVE", create_time="2023-01-01T00:00:00Z")
+        body["plans"][-1]["status"] = None
+        return status, body
+
+    client, _ = fake(handler)
+
+    batches = [
+        *client.iter_columns(
+            "plans", ["id", "product_id", "status", "create_time"], batch_size=4
+        )
+    ]
+
+    assert [len(batch) for batch in batches] == [4, 2]
+    first, last = batches
+    assert list(first["product_id"]) == [0] * 4
+    assert last.strings is first.strings
+    assert list(first["status"]) == [0, -1, 0, -1]
+    assert first.decode("status", 0) == "ACTIVE"
+    assert list(last["create_time"]) == [1672531200] * 2
+    assert last.decode("id", last["id"][1]) == "P-3-1"
+
+
+def test_warm(fake):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from threading import Thread
+
+    ports = set()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def reply(self, body: bytes):
+            ports.add(self.client_address[1])
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            return body
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            self.wfile.write(self.reply(dumps(TOKEN).encode()))
+
+        def do_HEAD(self):
+            self.reply(b"")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+
+    client, _ = fake(lambda request: (404, None))
+    client.url = f"http://127.0.0.1:{server.server_port}/"
+    assert client.readiness() == {"token": False, "pool": False}
+
+    try:
+        client.warm(connections=3)
+    finally:
+        server.shutdown()
+
+    assert client.readiness() == {"token": True, "pool": True}
+    # the token connection counts as one of them
+    assert len(ports) == 3
+
+
+def test_concurrent_details_are_coalesced(fake):
+    from concurrent.futures import ThreadPoolExecutor
+    from paypyl.flight import SingleFlight
+
+    def plan(request):
+        sleep(0.05)
+        return 200, {"id": "P-1", "product_id": "PROD", "name": "plan"}
+
+    client, adapter = fake(plan)
+    client.flight = SingleFlight()
+
+    with ThreadPoolExecutor(8) as pool:
+        plans = list(pool.map(lambda _: client.plan_details("P-1"), range(8)))
+
+    assert {plan.id for plan in plans} == {"P-1"}
+    details = [r for r in adapter.requests if "/v1/billing/plans/" in r.url]
+    assert len(details) < 8
+    assert len(client.flight) == 0
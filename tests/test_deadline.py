@@ -0,0 +1,92 @@
+from time import sleep
+
+from pytest import raises
+
+from paypyl.deadline import DeadlineExceeded, deadline, remaining, timeouts
+from paypyl.retry import Attempts, Retry
+
+
+def plan(request):
+    return 200, {"id": "P-1", "product_id": "PROD", "name": "plan"}
+
+
+def test_nested_deadline_only_shortens():
+    assert remaining() is None
+
+    with deadline(1):
+        with deadline(10):
+            assert remaining() <= 1
+        with deadline(0.5):
+            assert remaining() <= 0.5
+
+    assert remaining() is None
+
+
+def test_timeouts_are_clipped_to_deadline(fake):
+    client, adapter = fake(plan)
+    seen = []
+    send = adapter.send
+    adapter.send = lambda request, **kwargs: seen.append(kwargs["timeout"]) or send(
+        request, **kwargs
+    )
+
+    client.plan_details("P-1")
+    with timeouts((1, 2)):
+        client.plan_details("P-1")
+    with deadline(0.5):
+        client.plan_details("P-1")
+
+    assert seen[0] == client.timeout
+    assert seen[-2] == (1, 2)
+    assert all(0 < value <= 0.5 for value in seen[-1])
+
+
+def test_expired_deadline_fails_fast(fake):
+    client, adapter = fake(plan)
+
+    with deadline(0.01), raises(DeadlineExceeded):
+        sleep(0.02)
+        client.plan_details("P-1")
+
+    assert not [r for r in adapter.requests if "/billing/" in r.url]
+
+
+def test_retries_stop_at_deadline():
+    with deadline(1):
+        attempts = Attempts(Retry(), idempotent=True)
+        assert attempts.retry_in(503, {"Retry-After": "5"}) is None
+        assert attempts.retry_in(503, {"Retry-After": "0"}) == 0
+
+
+def test_throttle_waits_stop_at_deadline():
+    from asyncio import run
+    from concurrent.futures import Future
+    from time import monotonic
+
+    from paypyl.flight import SingleFlight
+    from paypyl.throttle import ConcurrencyLimit, Throttle
+
+    url = "https://api-m.sandbox.paypal.com/v1/billing/plans"
+    limit = ConcurrencyLimit(1)
+    limit.acquire()
+    throttle = Throttle({"billing": (0.5, 1)})
+    throttle.acquire(url)
+    flight = SingleFlight()
+    flight._calls["P-1"] = Future()
+
+    waits = [
+        limit.acquire,
+        lambda: run(limit.acquire_async()),
+        lambda: throttle.acquire(url),
+        lambda: run(throttle.acquire_async(url)),
+        lambda: flight.do("P-1", lambda: None),
+    ]
+    for wait in waits:
+        start = monotonic()
+        with deadline(0.05), raises(DeadlineExceeded):
+            wait()
+        assert monotonic() - start < 0.5
+
+    # the abandoned waiters did not take the slot
+    limit.release()
+    assert limit.in_flight == 0
@@ -0,0 +1,49 @@
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from pytest import fixture
+
+from paypyl.dedup import MemoryDedupStore, SQLiteDedupStore, webhook_keys
+
+
+@fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryDedupStore(maxsize=3)
+    return SQLiteDedupStore(str(tmp_path / "dedup.sqlite"))
+
+
+def test_add_once(store):
+    keys = webhook_keys("WH-1", "T-1")
+
+    assert not store.seen(*keys)
+    assert store.add(*keys)
+    assert store.seen(*keys)
+    assert store.seen(*webhook_keys("WH-1", "T-2"))
+    assert not store.add(*webhook_keys("WH-2", "T-1"))
+
+
+def test_concurrent_add(store):
+    with ThreadPoolExecutor(8) as pool:
+        added = [*pool.map(lambda _: store.add(*webhook_keys("WH-1")), range(16))]
+
+    assert added.count(True) == 1
+
+
+def test_expire(tmp_path):
+    store = MemoryDedupStore(ttl=timedelta(seconds=-1))
+    store.add("event:WH-1")
+    assert not store.seen("event:WH-1")
+
+    store = SQLiteDedupStore(str(tmp_path / "dedup.sqlite"), ttl=timedelta(seconds=-1))
+    store.add("event:WH-1")
+    assert not store.seen("event:WH-1")
+
+
+def test_discard(store):
+    keys = webhook_keys("WH-1", "T-1")
+    store.add(*keys)
+    store.discard(*keys)
+
+    assert not store.seen(*keys)
+    assert store.add(*keys)
@@ -0,0 +1,94 @@
+from paypyl.diff import diff, escape
+from paypyl.definitions import BillingCycle, Frequency, Money, PaymentPreferences
+from paypyl.resources import Plan, Product
+
+
+def plan(**kwargs):
+    data = dict(
+        id="P-1",
+        product_id="PROD-1",
+        name="plan",
+        status="ACTIVE",
+        billing_cycles=[
+            BillingCycle(
+                tenure_type="REGULAR",
+                sequence=1,
+                frequency=Frequency.month(),
+                pricing_scheme={"fixed_price": {"currency_code": "USD", "value": "10"}},
+            )
+        ],
+        payment_preferences=PaymentPreferences(
+            auto_bill_outstanding=True, payment_failure_threshold=3
+        ),
+    )
+    data.update(kwargs)
+    return Plan(**data)
+
+
+def ops(updates):
+    return [u.model_dump(exclude_none=True, by_alias=True) for u in updates]
+
+
+def test_equal_models_have_no_ops():
+    assert diff(plan(), plan()) == []
+    # read-only fields are ignored
+    assert (
+        diff(plan(), plan(status="INACTIVE", update_time="2024-01-01T00:00:00Z")) == []
+    )
+
+
+def test_nested_changes():
+    old = plan()
+    new = plan(description="monthly")
+    new.payment_preferences.payment_failure_threshold = 5
+    new.billing_cycles[0].pricing_scheme.fixed_price = Money(
+        currency_code="USD", value="12"
+    )
+
+    assert ops(diff(old, new)) == [
+        {"op": "add", "path": "/description", "value": "monthly"},
+        {
+            "op": "replace",
+            "path": "/billing_cycles/0/pricing_scheme/fixed_price/value",
+            "value": "12",
+        },
+        {
+            "op": "replace",
+            "path": "/payment_preferences/payment_failure_threshold",
+            "value": 5,
+        },
+    ]
+
+
+def test_removed_and_collapsed():
+    old = Product(id="PROD-1", name="a", description="x", category="SOFTWARE")
+    new = Product(id="PROD-1", name="a")
+
+    assert ops(diff(old, new)) == [
+        {"op": "remove", "path": "/description"},
+        {"op": "remove", "path": "/category"},
+    ]
+
+    old = plan()
+    new = plan(
+        payment_preferences=PaymentPreferences(setup_fee_failure_action="CANCEL")
+    )
+    assert ops(diff(old, new)) == [
+        {
+            "op": "replace",
+            "path": "/payment_preferences",
+            "value": {"setup_fee_failure_action": "CANCEL"},
+        }
+    ]
+
+
+def test_escape():
+    assert escape("a/b~c") == "a~1b~0c"
+
+
+def test_update_skips_empty_patch(fake):
+    client, adapter = fake(lambda request: (204, None))
+
+    client.update_plan("P-1", diff(plan(), plan()))
+
+    assert not [r for r in adapter.requests if r.method == "PATCH"]
@@ -0,0 +1,54 @@
+from json import dumps
+
+from paypyl.events import Dispatcher, TypedEvent
+from paypyl.resources import Event, Subscription
+
+
+def payload(event_type="BILLING.SUBSCRIPTION.ACTIVATED"):
+    return {
+        "id": "WH-1",
+        "create_time": "2023-01-01T00:00:00Z",
+        "resource_type": "subscription",
+        "event_version": "1.0",
+        "event_type": event_type,
+        "summary": "Subscription activated",
+        "resource_version": "2.0",
+        "resource": {"id": "I-1", "status": "ACTIVE", "plan_id": "P-1"},
+    }
+
+
+def test_dispatch_order_and_wildcards():
+    dispatcher = Dispatcher()
+    calls = []
+
+    dispatcher.register("*", lambda event: calls.append("*"))
+    dispatcher.register("BILLING.*", lambda event: calls.append("BILLING.*"))
+    dispatcher.register(
+        "BILLING.SUBSCRIPTION.*", lambda event: calls.append("BILLING.SUBSCRIPTION.*")
+    )
+
+    @dispatcher.on("BILLING.SUBSCRIPTION.ACTIVATED")
+    def activated(event):
+        calls.append("exact")
+
+    dispatcher.dispatch(payload())
+    assert calls == ["exact", "BILLING.SUBSCRIPTION.*", "BILLING.*", "*"]
+
+    calls.clear()
+    dispatcher.dispatch(payload("CATALOG.PRODUCT.CREATED"))
+    assert calls == ["*"]
+
+
+def test_resource_decoded_lazily():
+    for source in (
+        payload(),
+        dumps(payload()).encode(),
+        Event.model_validate(payload()),
+    ):
+        event = TypedEvent(source)
+        assert event.event_type == "BILLING.SUBSCRIPTION.ACTIVATED"
+        assert "resource" not in event.__dict__
+
+        assert isinstance(event.resource, Subscription)
+        assert event.resource.plan_id == "P-1"
+        assert event.resource is event.resource
@@ -0,0 +1,58 @@
+from gzip import open as gzip_open
+from json import loads, load
+
+from pytest import raises
+
+from paypyl.cli import main
+from paypyl.export import export
+
+from .test_client import plans_page
+
+
+def test_export_resumes_from_checkpoint(fake, tmp_path):
+    fail_at = [3]
+
+    def handler(request):
+        status, body = plans_page(request, total_pages=4, page_size=2)
+        if body["plans"][0]["id"].startswith(f"P-{fail_at[0]}-"):
+            return 503, {"name": "SERVICE_UNAVAILABLE"}
+        return status, body
+
+    client, _ = fake(handler)
+    output = str(tmp_path / "plans.ndjson.gz")
+    checkpoint = str(tmp_path / "plans.checkpoint")
+
+    try:
+        export(client, "plans", output, checkpoint=checkpoint, page_size=2, prefetch=0)
+    except Exception:
+        pass
+
+    with open(checkpoint) as f:
+        assert load(f)["page"] == 2
+
+    fail_at[0] = None
+    count = export(client, "plans", output, checkpoint=checkpoint, page_size=2)
+
+    with gzip_open(output, "rt") as f:
+        ids = [loads(line)["id"] for line in f]
+
+    assert count == 8
+    assert ids == [f"P-{page}-{i}" for page in range(1, 5) for i in range(2)]
+
+
+def test_export_csv(fake, tmp_path):
+    client, _ = fake(plans_page)
+    output = tmp_path / "plans.csv"
+
+    export(client, "plans", str(output), fields=["id", "name"], page_size=3)
+
+    lines = output.read_text().splitlines()
+    assert lines[0] == "id,name"
+    assert lines[1] == "P-1-0,plan"
+    assert len(lines) == 16
+
+
+def test_export_subscriptions_requires_ids(capsys):
+    with raises(SystemExit):
+        main(["export", "subscriptions", "subscriptions.ndjson"])
+    assert "--ids is required" in capsys.readouterr().err
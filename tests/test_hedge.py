@@ -0,0 +1,102 @@
+from asyncio import run, sleep as async_sleep
+from time import sleep
+
+from httpx import MockTransport, Response
+
+from paypyl import AsyncClient
+from paypyl.breaker import CircuitBreaker
+from paypyl.hedge import Hedge
+from paypyl.store import MemoryTokenStore
+
+from .conftest import TOKEN
+
+URL = "https://api-m.sandbox.paypal.com/v1/billing/plans/P-1"
+
+
+def test_delay_from_percentile():
+    hedge = Hedge(min_samples=10, min_delay=0.01)
+    assert hedge.delay_for(URL) is None
+
+    for i in range(100):
+        hedge.record(URL, i / 100)
+
+    assert hedge.delay_for(URL) == 0.94
+    assert hedge.delay_for("https://api-m.paypal.com/v1/catalogs/products") is None
+    assert Hedge(0.2).delay_for(URL) == 0.2
+
+
+def test_slow_request_is_hedged(fake):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            sleep(0.5)
+        return 200, {"id": "P-1", "product_id": "PROD", "name": "plan"}
+
+    client, _ = fake(handler)
+    client.hedge = Hedge(0.05)
+
+    assert client.plan_details("P-1").id == "P-1"
+    assert len(calls) == 2
+    assert client.hedge.stats() == {"sent": 1, "won": 1}
+
+
+def test_async_hedge():
+    calls = []
+
+    async def handler(request):
+        if request.url.path == "/v1/oauth2/token":
+            return Response(200, json=TOKEN)
+        calls.append(request)
+        if len(calls) == 1:
+            await async_sleep(0.5)
+        return Response(200, json={"id": "P-1", "product_id": "PROD", "name": "plan"})
+
+    client = AsyncClient(
+        client_id="test_client_id",
+        client_secret="test_client_secret",
+        sandbox=True,
+        token_store=MemoryTokenStore(),
+        transport=MockTransport(handler),
+        hedge=Hedge(0.05),
+    )
+
+    async def main():
+        async with client:
+            return await client.plan_details("P-1")
+
+    assert run(main()).id == "P-1"
+    assert client.hedge.stats() == {"sent": 1, "won": 1}
+
+
+def test_async_hedge_loser_is_not_a_failure():
+    calls = []
+
+    async def handler(request):
+        if request.url.path == "/v1/oauth2/token":
+            return Response(200, json=TOKEN)
+        calls.append(request)
+        # every primary is slow, every hedge wins
+        if len(calls) % 2:
+            await async_sleep(0.5)
+        return Response(200, json={"id": "P-1", "product_id": "PROD", "name": "plan"})
+
+    client = AsyncClient(
+        client_id="test_client_id",
+        client_secret="test_client_secret",
+        sandbox=True,
+        token_store=MemoryTokenStore(),
+        transport=MockTransport(handler),
+        hedge=Hedge(0.02),
+        breaker=CircuitBreaker(min_calls=4),
+    )
+
+    async def main():
+        async with client:
+            for _ in range(4):
+                await client.plan_details("P-1")
+
+    run(main())
+    assert client.hedge.stats() == {"sent": 4, "won": 4}
+    assert client.breaker.state("billing") == "closed"
@@ -0,0 +1,48 @@
+from json import dumps, loads
+
+from paypyl.cli import parser
+from paypyl.importer import import_catalog, request_id
+
+
+def test_import_resumes_from_journal(fake, tmp_path):
+    failing = {"product-3"}
+    created = {}
+
+    def handler(request):
+        body = loads(request.body)
+        if body["name"] in failing:
+            return 503, {"name": "SERVICE_UNAVAILABLE"}
+        key = request.headers["PayPal-Request-Id"]
+        created.setdefault(key, f"PROD-{len(created)}")
+        return 201, {"id": created[key], **body}
+
+    client, adapter = fake(handler)
+    source = tmp_path / "products.ndjson"
+    journal = str(tmp_path / "products.journal")
+    records = [{"name": f"product-{i}", "type": "SERVICE"} for i in range(5)]
+    source.write_text("\n".join(map(dumps, records)) + "\n\nnot json\n")
+
+    result = import_catalog(client, "products", str(source), journal=journal)
+
+    assert result.created == 4
+    assert result.failed == [4, 7]
+
+    # a crash in the middle of a journal write
+    with open(journal, "a") as f:
+        f.write('{"request_id": "tor')
+
+    failing.clear()
+    posts = len(adapter.requests)
+    result = import_catalog(client, "products", str(source), journal=journal)
+
+    assert (result.created, result.skipped, result.failed) == (1, 4, [7])
+    retried = [r for r in adapter.requests[posts:] if r.method == "POST"]
+    assert [loads(r.body)["name"] for r in retried] == ["product-3"]
+    assert retried[0].headers["PayPal-Request-Id"] == request_id("products", records[3])
+    with open(journal) as f:
+        assert loads(f.read().splitlines()[-1])["id"] == "PROD-4"
+
+
+def test_import_command():
+    args = parser().parse_args(["import", "plans", "plans.ndjson", "--journal", "j"])
+    assert (args.collection, args.input, args.journal) == ("plans", "plans.ndjson", "j")
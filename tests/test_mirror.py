@@ -0,0 +1,91 @@
+from datetime import datetime, timezone
+from json import dumps
+
+from paypyl.events import Dispatcher
+from paypyl.mirror import Mirror
+
+
+def plan(id, status="ACTIVE", updated="2024-01-01T00:00:00Z", **fields):
+    return {
+        "id": id,
+        "product_id": "PROD-1",
+        "status": status,
+        "update_time": updated,
+        **fields,
+    }
+
+
+def test_sync_plans(fake, tmp_path):
+    plans = {
+        f"P-{i}": plan(f"P-{i}", "ACTIVE" if i % 2 else "INACTIVE") for i in range(3)
+    }
+
+    def handler(request):
+        if request.path_url.startswith("/v1/billing/plans?"):
+            summaries = [{**p, "name": "summary"} for p in plans.values()]
+            return 200, {"plans": summaries, "total_items": 3, "total_pages": 1}
+        id = request.path_url.split("/")[-1]
+        return 200, {**plans[id], "name": "details"}
+
+    client, adapter = fake(handler)
+    mirror = Mirror(str(tmp_path / "mirror.sqlite"))
+
+    assert mirror.sync(client, "plans", details=True) == 3
+    assert mirror.get("plans", "P-1", mode="raw")["name"] == "details"
+    assert [p.id for p in mirror.query("plans", status="ACTIVE")] == ["P-1"]
+    assert (
+        mirror.count("plans", product_id="PROD-1", status=["ACTIVE", "INACTIVE"]) == 3
+    )
+
+    # fractional seconds must still compare as later
+    plans["P-2"] = plan("P-2", "ACTIVE", "2024-01-01T00:00:00.5Z")
+    details = len(adapter.requests)
+
+    assert mirror.sync(client, "plans", details=True) == 1
+    fetched = [r.path_url for r in adapter.requests[details:] if "?" not in r.path_url]
+    assert fetched == ["/v1/billing/plans/P-2"]
+    assert mirror.count("plans", status="ACTIVE") == 2
+    assert mirror.watermark("plans") == 1704067200.5
+
+    # a change seen now does not move the watermark past the sync start,
+    # so rows changed on earlier pages meanwhile are not skipped next time
+    now = datetime.now(timezone.utc)
+    plans["P-0"] = plan("P-0", "ACTIVE", now.isoformat())
+    assert mirror.sync(client, "plans") == 1
+    assert mirror.watermark("plans") < now.timestamp() - 299
+
+
+def test_apply_event(tmp_path):
+    mirror = Mirror(str(tmp_path / "mirror.sqlite"))
+    dispatcher = Dispatcher()
+    dispatcher.on("BILLING.SUBSCRIPTION.*")(mirror.apply_event)
+
+    def event(action, status, updated):
+        resource = {
+            "id": "I-1",
+            "plan_id": "P-1",
+            "custom_id": "user-1",
+            "status": status,
+            "update_time": updated,
+        }
+        return dumps(
+            {
+                "id": f"WH-{action}",
+                "event_type": f"BILLING.SUBSCRIPTION.{action}",
+                "resource_type": "subscription",
+                "resource": resource,
+            }
+        ).encode()
+
+    assert dispatcher.dispatch(
+        event("ACTIVATED", "ACTIVE", "2024-01-02T00:00:00Z")
+    ) == [1]
+    # a late redelivery of an older state is ignored
+    assert dispatcher.dispatch(
+        event("CREATED", "APPROVAL_PENDING", "2024-01-01T00:00:00Z")
+    ) == [0]
+
+    active = mirror.query("subscriptions", status="ACTIVE", plan_id="P-1")
+    assert [s.custom_id for s in active] == ["user-1"]
+    assert mirror.query("subscriptions", custom_id="user-2") == []
+    assert mirror.get("subscriptions", "I-2") is None
@@ -0,0 +1,128 @@
+from base64 import b64decode
+
+from paypyl.pool import ClientPool
+from paypyl.store import MemoryTokenStore
+
+from .conftest import FakeAdapter
+
+
+def test_tenants_share_session():
+    store = MemoryTokenStore()
+    pool = ClientPool(sandbox=True, max_tenants=2, token_store=store)
+    adapter = FakeAdapter(lambda request: (200, {"id": "PROD-1", "name": "Product"}))
+    pool.session.mount("https://", adapter)
+
+    a = pool.client("a", "secret-a")
+    b = pool.client("b", "secret-b")
+    assert pool.client("a", "secret-a") is a
+    assert a.session is b.session is pool.session
+
+    a.product_details("PROD-1")
+    b.product_details("PROD-1")
+
+    tokens = [r for r in adapter.requests if "oauth2" in r.url]
+    users = [b64decode(r.headers["Authorization"][6:]) for r in tokens]
+    assert users == [b"a:secret-a", b"b:secret-b"]
+    assert len(store.tokens) == 2
+    assert all(
+        r.headers["Authorization"] == "Bearer token"
+        for r in adapter.requests
+        if "oauth2" not in r.url
+    )
+
+    # "b" is the least recently used tenant
+    pool.client("c", "secret-c")
+    assert "b" not in pool and "a" in pool and len(pool) == 2
+
+    # rotated credentials get a fresh client
+    assert pool.client("a", "rotated") is not a
+
+    pool.close()
+    assert len(pool) == 0
+
+
+def test_idle_timeout():
+    pool = ClientPool(sandbox=True, idle_timeout=0, token_store=MemoryTokenStore())
+    pool.client("a", "secret-a")
+    pool.client("b", "secret-b")
+    assert [*pool._tenants] == ["b"]
+    assert pool.evict("b") and not pool.evict("b")
+
+
+def test_pool_wait_is_bounded():
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from threading import Thread
+    from time import monotonic
+
+    from pytest import raises
+    from requests.exceptions import ConnectTimeout
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/"
+
+    pool = ClientPool(
+        max_connections=1, concurrency=None, token_store=MemoryTokenStore()
+    )
+    pool.session.mount("http://", pool.session.get_adapter("https://"))
+    try:
+        # an unread streamed response keeps the only connection
+        held = pool.session.get(url, stream=True, timeout=(1, 1))
+        start = monotonic()
+        with raises(ConnectTimeout):
+            pool.session.get(url, timeout=(0.05, 1))
+        assert monotonic() - start < 1
+
+        held.close()
+        assert pool.session.get(url, timeout=(0.05, 1)).status_code == 200
+    finally:
+        server.shutdown()
+        pool.close()
+
+
+def test_cold_calls_do_not_deadlock():
+    from concurrent.futures import ThreadPoolExecutor
+    from threading import Barrier
+
+    from paypyl.deadline import deadline
+    from paypyl.throttle import Throttle
+
+    concurrency = 2
+    holding = Barrier(concurrency, timeout=5)
+
+    class Holding(Throttle):
+        def acquire(self, url, priority=None):
+            permit = super().acquire(url, priority)
+            # every caller holds a slot before any of them needs the token
+            if "/oauth2/" not in url:
+                holding.wait()
+            return permit
+
+    pool = ClientPool(
+        sandbox=True, concurrency=concurrency, token_store=MemoryTokenStore()
+    )
+    pool.session.mount(
+        "https://", FakeAdapter(lambda request: (200, {"id": "P", "name": "P"}))
+    )
+    client = pool.client("a", "secret-a")
+    client.throttle = Holding(max_in_flight=concurrency)
+
+    def call(_):
+        with deadline(5):
+            return client.product_details("P").id
+
+    with ThreadPoolExecutor(concurrency) as threads:
+        assert [*threads.map(call, range(concurrency))] == ["P"] * concurrency
+    pool.close()
@@ -0,0 +1,75 @@
+from requests import HTTPError
+from pytest import raises
+
+from paypyl.resources import Product
+from paypyl.retry import Retry, RetryBudget, Attempts, retrying, parse_retry_after
+
+
+def flaky(failures, status=503, headers=None):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) <= failures:
+            return status, {"name": "SERVICE_UNAVAILABLE"}
+        return 201, {"id": "PROD-1", "name": "product", "type": "SERVICE"}
+
+    return handler, calls
+
+
+def test_create_retries_with_stable_request_id(fake):
+    handler, calls = flaky(2)
+    client, _ = fake(handler)
+
+    product = client.create_product(Product(name="product", type="SERVICE"))
+
+    assert product.id == "PROD-1"
+    assert len(calls) == 3
+    ids = {r.headers["PayPal-Request-Id"] for r in calls}
+    assert len(ids) == 1 and None not in ids
+
+
+def test_client_errors_are_not_retried(fake):
+    handler, calls = flaky(5, status=400)
+    client, _ = fake(handler)
+
+    with raises(HTTPError):
+        client.create_product(Product(name="product", type="SERVICE"))
+
+    assert len(calls) == 1
+
+
+def test_per_call_policy(fake):
+    handler, calls = flaky(5)
+    client, _ = fake(handler)
+
+    with retrying(Retry(total=1, backoff=0)), raises(HTTPError):
+        client.create_product(Product(name="product", type="SERVICE"))
+
+    assert len(calls) == 2
+
+
+def test_patch_is_not_retried_by_default():
+    attempts = Attempts(Retry(backoff=0), idempotent=False)
+    assert attempts.retry_in(503) is None
+
+
+def test_budget_limits_retries():
+    budget = RetryBudget(capacity=2, ratio=0.5)
+    attempts = Attempts(Retry(total=10, backoff=0), budget, idempotent=True)
+
+    assert attempts.retry_in(503) == 0
+    assert attempts.retry_in(503) == 0
+    assert attempts.retry_in(503) is None
+
+
+def test_retry_after():
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert parse_retry_after("soon") is None
+
+    attempts = Attempts(Retry(backoff=0), idempotent=True)
+    assert attempts.retry_in(429, {"Retry-After": "2"}) == 2
+
+    attempts = Attempts(Retry(max_elapsed=1), idempotent=True)
+    assert attempts.retry_in(429, {"Retry-After": "120"}) is None
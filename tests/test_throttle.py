@@ -0,0 +1,127 @@
+from asyncio import gather, run, sleep as async_sleep
+from threading import Thread
+from time import sleep
+
+from paypyl.throttle import (
+    ConcurrencyLimit,
+    Throttle,
+    TokenBucket,
+    endpoint_group,
+)
+
+
+def test_endpoint_group():
+    assert endpoint_group("https://api-m.paypal.com/v1/billing/plans/P-1") == "billing"
+    assert endpoint_group("https://api-m.paypal.com/v1/oauth2/token") == "oauth2"
+    assert endpoint_group("https://api.paypal.com/certs/CERT-1") is None
+
+
+def test_bucket_keeps_reserve_for_interactive():
+    bucket = TokenBucket(1, burst=5, reserve=2)
+
+    assert [bucket.take("bulk") for _ in range(3)] == [0, 0, 0]
+    assert bucket.take("bulk") > 0
+    assert bucket.take("interactive") == 0
+    assert bucket.take("interactive") == 0
+    assert bucket.take("interactive") > 0
+
+
+def test_interactive_waiters_go_first():
+    limit = ConcurrencyLimit(1)
+    limit.acquire()
+    order = []
+
+    def wait(priority):
+        limit.acquire(priority)
+        order.append(priority)
+        limit.release()
+
+    bulk = Thread(target=wait, args=("bulk",))
+    bulk.start()
+    sleep(0.02)
+    interactive = Thread(target=wait, args=("interactive",))
+    interactive.start()
+    sleep(0.02)
+
+    limit.release()
+    bulk.join()
+    interactive.join()
+
+    assert order == ["interactive", "bulk"]
+
+
+def test_aimd():
+    limit = ConcurrencyLimit(8, adaptive=True, cooldown=0)
+
+    limit.acquire()
+    limit.release(429)
+    assert limit.limit == 4
+
+    for _ in range(8):
+        limit.acquire()
+        limit.release(200)
+    assert 5 < limit.limit < 6
+
+
+def test_async_concurrency():
+    throttle = Throttle(concurrency=2)
+    url = "https://api-m.sandbox.paypal.com/v1/billing/plans"
+    peak = [0, 0]
+
+    async def call(priority):
+        permit = await throttle.acquire_async(url, priority)
+        peak[0] += 1
+        peak[1] = max(peak)
+        await async_sleep(0.01)
+        peak[0] -= 1
+        permit.release(200)
+
+    async def main():
+        await gather(*(call("bulk") for _ in range(10)))
+
+    run(main())
+
+    assert peak[1] == 2
+    assert throttle.stats()["billing"]["in_flight"] == 0
+
+
+def test_max_in_flight_spans_groups():
+    throttle = Throttle(concurrency=2, max_in_flight=3)
+    base = "https://api-m.sandbox.paypal.com/v1"
+    urls = [f"{base}/billing/plans", f"{base}/catalogs/products"] * 4
+    peak = [0, 0]
+
+    async def call(url):
+        permit = await throttle.acquire_async(url)
+        peak[0] += 1
+        peak[1] = max(peak)
+        await async_sleep(0.01)
+        peak[0] -= 1
+        permit.release(200)
+
+    async def main():
+        await gather(*map(call, urls))
+
+    run(main())
+
+    assert peak[1] == 3
+    assert throttle.stats()["*"] == {"limit": 3, "in_flight": 0}
+
+
+def test_client_scans_are_bulk(fake):
+    from .test_client import plans_page
+
+    class Recorder(Throttle):
+        def acquire(self, url, priority=None):
+            if "/billing/" in url:
+                seen.append(priority)
+            return super().acquire(url, priority)
+
+    seen = []
+    client, _ = fake(lambda request: plans_page(request, total_pages=2))
+    client.throttle = Recorder({"billing": 1000}, concurrency=2)
+
+    list(client.iter_plans(page_size=3))
+    client.list_plans(page_size=3, page=1)
+
+    assert seen == ["bulk", "bulk", None]
@@ -0,0 +1,108 @@
+from base64 import b64encode
+from datetime import datetime, timedelta, timezone
+from json import dumps, loads
+
+from pytest import fixture, raises
+from cryptography import x509
+from cryptography.x509.oid import NameOID
+from cryptography.hazmat.primitives.hashes import SHA256
+from cryptography.hazmat.primitives.serialization import Encoding
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.asymmetric.padding import PKCS1v15
+
+from paypyl.definitions import WebhookSignature
+from paypyl.webhooks import CertificateCache, InvalidSignature, transmission
+
+
+CERT_URL = "https://api.sandbox.paypal.com/v1/notifications/certs/CERT-360caa42"
+WEBHOOK_ID = "1SV15366HH1953807"
+
+
+@fixture
+def key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@fixture
+def pem(key):
+    name = x509.Name(
+        [x509.NameAttribute(NameOID.COMMON_NAME, "messageverificationcerts")]
+    )
+    now = datetime.now(timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=1))
+        .sign(key, SHA256())
+    )
+    return certificate.public_bytes(Encoding.PEM)
+
+
+@fixture
+def body():
+    event = {
+        "id": "WH-1",
+        "create_time": "2023-01-01T00:00:00Z",
+        "resource_type": "subscription",
+        "event_version": "1.0",
+        "event_type": "BILLING.SUBSCRIPTION.ACTIVATED",
+        "summary": "Subscription activated",
+        "resource_version": "2.0",
+        "resource": {"id": "I-1", "status": "ACTIVE"},
+    }
+    return dumps(event).encode()
+
+
+@fixture
+def headers(key, body):
+    headers = {
+        "PAYPAL-AUTH-ALGO": "SHA256withRSA",
+        "PAYPAL-CERT-URL": CERT_URL,
+        "PAYPAL-TRANSMISSION-ID": "69cd13f0-d67a-11e5-baa3-778b53f4ae55",
+        "PAYPAL-TRANSMISSION-SIG": "",
+        "PAYPAL-TRANSMISSION-TIME": "2023-01-01T00:00:01Z",
+    }
+    message = transmission(WebhookSignature.model_validate(headers), WEBHOOK_ID, body)
+    headers["PAYPAL-TRANSMISSION-SIG"] = b64encode(
+        key.sign(message, PKCS1v15(), SHA256())
+    ).decode()
+    return headers
+
+
+def test_verify_event_locally(fake, pem, body, headers):
+    client, adapter = fake(lambda request: (500, None))
+    client.certificates.put(CERT_URL, pem)
+
+    event = client.verify_event(WEBHOOK_ID, headers, loads(body), body=body)
+
+    assert event.id == "WH-1"
+    assert adapter.requests == []
+
+    with raises(InvalidSignature):
+        client.verify_event(WEBHOOK_ID, headers, loads(body), body=body + b" ")
+
+
+def test_certificate_fetched_once(fake, pem, body, headers):
+    client, adapter = fake(lambda request: (500, None))
+    fetched = []
+    client.certificates.fetch = lambda url: fetched.append(url) or pem
+
+    for _ in range(3):
+        client.verify_event(WEBHOOK_ID, headers, loads(body), body=body)
+
+    assert fetched == [CERT_URL]
+
+
+def test_untrusted_certificate_url(pem):
+    cache = CertificateCache()
+
+    with raises(InvalidSignature):
+        cache.put("https://paypal.com.example.org/cert", pem)
+
+    with raises(InvalidSignature):
+        cache.put("http://api.paypal.com/cert", pem)
+